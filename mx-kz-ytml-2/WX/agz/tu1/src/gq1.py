@@ -6,10 +6,12 @@
 
 import os
 
+import httpx
 from dotenv import load_dotenv
 from groq import Groq
 from rich import print as rpr
 
+from .ratez import rate_hooks
 from .utz import header1
 from .wm import save_to_markdown
 
@@ -45,8 +47,10 @@ def gq1_chat1():
 
     quez = "Is wokeism a type of cancer ?"
 
+    # Requests wait on Groq's rate limit (ratez.py) instead of tripping a 429
     client = Groq(
         api_key=gq_t,
+        http_client=httpx.Client(event_hooks=rate_hooks()),
     )
 
     chat_completion = client.chat.completions.create(
@@ -0,0 +1,257 @@
+# /////////////////////////////////////////
+# ratez.py - Per provider rate limiter
+# /////////////////////////////////////////
+
+# Requests/min and tokens/min token buckets per (provider host, model).
+# Calls wait for their turn instead of tripping a 429, and the buckets follow
+# the provider's own x-ratelimit-* and Retry-After headers once responses come back.
+# LimitedLiteLLMModel puts smolagents' LiteLLMModel calls on the same buckets.
+
+# --- Imports Zone ---
+
+import asyncio
+import json
+import re
+import threading
+import time
+
+import litellm
+from smolagents import LiteLLMModel
+
+# --- Vars ---
+
+# Default (requests/min, tokens/min) per host, free tier numbers so we stay under them
+LIMITS = {
+    "api.groq.com": (30, 6_000),
+    "api.sambanova.ai": (20, 100_000),
+    "api.studio.nebius.com": (60, 200_000),
+    "models.github.ai": (15, 60_000),
+}
+DEFAULT_LIMITS = (60, 100_000)
+
+# LiteLLM / smolagents provider prefixes -> host, so they share the SDK buckets
+PROVIDER_HOSTS = {
+    "groq": "api.groq.com",
+    "sambanova": "api.sambanova.ai",
+    "nebius": "api.studio.nebius.com",
+    "github": "models.github.ai",
+}
+
+# Completion tokens assumed when the request does not say
+DEFAULT_COMPLETION_TOKENS = 512
+
+# Longest we back off after a 429 with no hint from the server
+MAX_BACKOFF = 60.0
+
+
+# --- Buckets ---
+
+
+class Bucket:
+    """
+    Token bucket refilled continuously at capacity per minute.
+
+    reserve() never blocks: it takes the tokens (going into debt if needed)
+    and returns how long the caller has to wait, so callers queue in order.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def reserve(self, n, now):
+        self._refill(now)
+        n = min(n, self.capacity)  # a single huge request still gets through eventually
+        self.tokens -= n
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def sync(self, remaining, now):
+        # The server knows better than our estimate
+        self._refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+
+
+class Limiter:
+    def __init__(self, requests_per_min, tokens_per_min):
+        self.requests = Bucket(requests_per_min)
+        self.tokens = Bucket(tokens_per_min)
+        self.blocked_until = 0.0
+        self.strikes = 0  # 429s in a row, for the backoff when there is no header
+        self.lock = threading.Lock()
+
+    def reserve(self, tokens):
+        with self.lock:
+            now = time.monotonic()
+            wait = max(self.requests.reserve(1, now), self.tokens.reserve(tokens, now), self.blocked_until - now)
+            return max(0.0, wait)
+
+    def acquire(self, tokens=DEFAULT_COMPLETION_TOKENS):
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens=DEFAULT_COMPLETION_TOKENS):
+        wait = self.reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def update(self, headers, status=200):
+        """Adapt to a response: rate limit headers always, a pause on 429"""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        with self.lock:
+            now = time.monotonic()
+            remaining_req = _number(headers.get("x-ratelimit-remaining-requests"))
+            remaining_tok = _number(headers.get("x-ratelimit-remaining-tokens"))
+            if remaining_req is not None:
+                self.requests.sync(remaining_req, now)
+            if remaining_tok is not None:
+                self.tokens.sync(remaining_tok, now)
+
+            pause = None
+            if status == 429:
+                self.strikes += 1
+                pause = _seconds(headers.get("retry-after"))
+                if pause is None:
+                    pause = max(
+                        _seconds(headers.get("x-ratelimit-reset-requests")) or 0.0,
+                        _seconds(headers.get("x-ratelimit-reset-tokens")) or 0.0,
+                    ) or min(MAX_BACKOFF, 2.0**self.strikes)
+            else:
+                self.strikes = 0
+                # Out of requests for this window: hold everyone until it resets
+                if remaining_req == 0:
+                    pause = _seconds(headers.get("x-ratelimit-reset-requests"))
+            if pause:
+                self.blocked_until = max(self.blocked_until, now + pause)
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_DURATION = re.compile(r"(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m(?!s))?(?:(\d+(?:\.\d+)?)s)?(?:(\d+(?:\.\d+)?)ms)?$")
+
+
+def _seconds(value):
+    """'12', '7.66s', '2m59.56s', '120ms' -> seconds, None if unreadable"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    number = _number(value)
+    if number is not None:
+        return number
+    match = _DURATION.match(value)
+    if not match or not any(match.groups()):
+        return None
+    h, m, s, ms = (float(g) if g else 0.0 for g in match.groups())
+    return h * 3600 + m * 60 + s + ms / 1000
+
+
+# --- Registry ---
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host, model=None):
+    """Shared limiter for a provider host (or LiteLLM provider prefix) and model"""
+    host = PROVIDER_HOSTS.get(host, host)
+    key = (host, model)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = Limiter(*LIMITS.get(host, DEFAULT_LIMITS))
+        return _limiters[key]
+
+
+def estimate_tokens(payload):
+    """Rough prompt + completion tokens of a chat request, ~4 characters per token"""
+    prompt = len(json.dumps(payload.get("messages", ""), default=str)) // 4
+    completion = payload.get("max_completion_tokens") or payload.get("max_tokens") or DEFAULT_COMPLETION_TOKENS
+    return prompt + completion
+
+
+# --- httpx hooks, used by the pooled clients in clientz.py ---
+
+
+def _request_limiter(request):
+    if request.method != "POST":
+        return None, 0
+    try:
+        payload = json.loads(request.content or b"{}")
+    except (ValueError, UnicodeDecodeError):
+        return None, 0
+    if not isinstance(payload, dict) or "model" not in payload:
+        return None, 0
+    return get_limiter(request.url.host, payload["model"]), estimate_tokens(payload)
+
+
+def _on_request(request):
+    limiter, tokens = _request_limiter(request)
+    if limiter is not None:
+        limiter.acquire(tokens)
+
+
+def _on_response(response):
+    limiter, _ = _request_limiter(response.request)
+    if limiter is not None:
+        limiter.update(response.headers, response.status_code)
+
+
+async def _on_request_async(request):
+    limiter, tokens = _request_limiter(request)
+    if limiter is not None:
+        await limiter.acquire_async(tokens)
+
+
+async def _on_response_async(response):
+    _on_response(response)
+
+
+def rate_hooks():
+    """event_hooks for httpx.Client"""
+    return {"request": [_on_request], "response": [_on_response]}
+
+
+def async_rate_hooks():
+    """event_hooks for httpx.AsyncClient"""
+    return {"request": [_on_request_async], "response": [_on_response_async]}
+
+
+# --- smolagents ---
+
+
+class LimitedLiteLLMModel(LiteLLMModel):
+    """
+    LiteLLMModel that waits on the shared provider limiter before every call.
+
+    A 429 that still gets through pauses the provider's bucket for as long as the
+    Retry-After / x-ratelimit-reset headers say, then the step is retried instead of
+    killing the whole agent run.
+    """
+
+    max_rate_retries = 5
+
+    def generate(self, messages, *args, **kwargs):
+        provider, _, model = self.model_id.partition("/")
+        limiter = get_limiter(provider, model)
+        payload = {"messages": [getattr(m, "content", m) for m in messages], "max_tokens": kwargs.get("max_tokens")}
+        for attempt in range(self.max_rate_retries + 1):
+            limiter.acquire(estimate_tokens(payload))
+            try:
+                return super().generate(messages, *args, **kwargs)
+            except litellm.RateLimitError as e:
+                if attempt == self.max_rate_retries:
+                    raise
+                response = getattr(e, "response", None)
+                limiter.update(getattr(response, "headers", None), 429)
@@ -8,8 +8,9 @@ import os
 
 from dotenv import load_dotenv
 from rich import print as rpr
-from smolagents import CodeAgent, DuckDuckGoSearchTool, HfApiModel, LiteLLMModel
+from smolagents import CodeAgent, DuckDuckGoSearchTool, HfApiModel
 
+from .ratez import LimitedLiteLLMModel
 from .utz import header1
 
 # --- Vars ---
@@ -65,7 +66,8 @@ This seems to be working but there is problem with the number of req/min,  smole
 def func2():
     header1("F2 - Testing agent run with Groq via litellm")
 
-    model = LiteLLMModel(
+    # Rate limited so the agent's burst of steps queues at Groq's limit instead of failing
+    model = LimitedLiteLLMModel(
         model_id="groq/llama-3.1-8b-instant",
         temperature=0.1,
         api_key=GQ_T,
@@ -0,0 +1,189 @@
+# /////////////////////////////////////////
+# cachez.py - Exact match cache for chat completions
+# /////////////////////////////////////////
+
+# Identical (endpoint, model, messages, params) requests are answered from a local
+# SQLite file instead of the provider, while iterating on output formatting.
+# Entries expire after a TTL and the least recently used go first when the cache is full.
+# Set COMPLETION_CACHE=off to always call the provider.
+
+# --- Imports Zone ---
+
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from rich import print as rpr
+
+# --- Vars ---
+
+CACHE_PATH = os.getenv("COMPLETION_CACHE_PATH", ".cache/completions.sqlite")
+CACHE_ON = os.getenv("COMPLETION_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+TTL = 7 * 24 * 3600  # Seconds an answer stays valid
+MAX_ENTRIES = 5000
+MAX_BYTES = 200 * 1024 * 1024
+
+
+# --- Cache ---
+
+
+class CompletionCache:
+    """
+    SQLite backed completion store with TTL, LRU eviction and hit / miss counters.
+
+    Parameters:
+    - path (str): SQLite file, created on first use
+    - ttl (float): Seconds before an entry expires
+    - max_entries (int): Entries kept before the least recently used are dropped
+    - max_bytes (int): Total size of stored responses kept
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=TTL, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, kind TEXT, body TEXT, size INTEGER, created REAL, accessed REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS completions_accessed ON completions (accessed)")
+        self.db.commit()
+
+    @staticmethod
+    def make_key(endpoint, params):
+        # Canonical JSON so dict order and whitespace never change the key
+        blob = json.dumps({"endpoint": endpoint, **params}, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT kind, body, created FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[2] > self.ttl:
+                if row is not None:
+                    self.db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    self.db.commit()
+                self.misses += 1
+                return None
+            self.db.execute("UPDATE completions SET accessed = ? WHERE key = ?", (now, key))
+            self.db.commit()
+            self.hits += 1
+        return _load(row[0], row[1])
+
+    def put(self, key, response):
+        kind, body = _dump(response)
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, body, len(body), now, now),
+            )
+            self._evict(now)
+            self.db.commit()
+
+    def _evict(self, now):
+        self.db.execute("DELETE FROM completions WHERE created < ?", (now - self.ttl,))
+        count, total = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Walk from the least recently used until both limits hold again
+        drop = []
+        for key, size in self.db.execute("SELECT key, size FROM completions ORDER BY accessed"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            drop.append((key,))
+            count -= 1
+            total -= size
+        self.db.executemany("DELETE FROM completions WHERE key = ?", drop)
+
+    def stats(self):
+        with self.lock:
+            entries, total = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+        }
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def _dump(response):
+    # Remember the response class so a hit comes back as the same type
+    cls = type(response)
+    kind = f"{cls.__module__}:{cls.__qualname__}"
+    if hasattr(response, "model_dump_json"):
+        return kind, response.model_dump_json()  # openai / groq (pydantic)
+    return kind, json.dumps(response)  # huggingface_hub outputs are dicts
+
+
+def _load(kind, body):
+    module, _, name = kind.partition(":")
+    cls = getattr(importlib.import_module(module), name)
+    if hasattr(cls, "model_validate_json"):
+        return cls.model_validate_json(body)
+    if hasattr(cls, "parse_obj_as_instance"):
+        return cls.parse_obj_as_instance(json.loads(body))
+    return json.loads(body)
+
+
+# --- Shared instance ---
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CompletionCache()
+        return _cache
+
+
+def _endpoint(client):
+    # The provider the client talks to, never its token
+    return f"{type(client).__name__}:{getattr(client, 'base_url', None) or getattr(client, 'provider', None)}"
+
+
+def cached_completion(client, **params):
+    """
+    client.chat.completions.create(**params) behind the completion cache.
+
+    Streaming requests and COMPLETION_CACHE=off go straight to the provider.
+    """
+    if not CACHE_ON or params.get("stream"):
+        return client.chat.completions.create(**params)
+    cache = get_cache()
+    key = cache.make_key(_endpoint(client), params)
+    response = cache.get(key)
+    if response is None:
+        response = client.chat.completions.create(**params)
+        cache.put(key, response)
+    return response
+
+
+def brint_cache_stats():
+    if _cache is None:
+        return
+    s = _cache.stats()
+    rpr(
+        f"[cyan]Completion cache: {s['hits']} hits, {s['misses']} misses ({s['hit_rate']:.0%}), "
+        f"{s['entries']} entries, {s['bytes'] / 1024:.0f} KB[/cyan]"
+    )
@@ -0,0 +1,161 @@
+# /////////////////////////////////////////
+# clientz.py - Shared pooled provider clients
+# /////////////////////////////////////////
+
+# One long lived client per (provider, base_url, token) for the whole process.
+# Every chat call reuses it, so the TCP + TLS handshake is paid once instead of per message.
+# get_async_client() is the same for async handlers: AsyncOpenAI / AsyncGroq / AsyncInferenceClient.
+
+# --- Imports Zone ---
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+
+from .ratez import async_rate_hooks, rate_hooks
+
+# --- Vars ---
+
+# HTTP/2 only when the optional h2 package is installed (uv add "httpx[http2]")
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Connection pool of every OpenAI compatible client
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE = 20
+KEEPALIVE_EXPIRY = 120.0
+
+_clients = {}
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> {(provider, base_url, token): client}
+_lock = threading.Lock()
+
+
+# --- Registry ---
+
+
+def get_client(provider, base_url=None, token=None):
+    """
+    Shared client for a provider, created on first use.
+
+    Parameters:
+    - provider (str): "openai" for any OpenAI compatible endpoint (GitHub Models, Nebius,
+      SambaNova ...), "groq", or a Hugging Face inference provider ("hf-inference", "nebius" ...)
+    - base_url (str): Endpoint for OpenAI compatible providers
+    - token (str): API key
+
+    Returns:
+    - OpenAI | Groq | InferenceClient: The same instance for the same arguments
+    """
+    key = (provider, base_url, token)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = _make_client(provider, base_url, token)
+        return client
+
+
+def get_async_client(provider, base_url=None, token=None):
+    """
+    Shared async client for a provider, for async def handlers.
+
+    Its connections belong to the event loop that made it, so there is one per running loop.
+    They are held by the loop object itself, and dropped together with a loop that is gone.
+
+    Parameters:
+    - provider (str): As for get_client()
+    - base_url (str): Endpoint for OpenAI compatible providers
+    - token (str): API key
+
+    Returns:
+    - AsyncOpenAI | AsyncGroq | AsyncInferenceClient: The same instance for the same arguments and loop
+    """
+    loop = asyncio.get_running_loop()
+    key = (provider, base_url, token)
+    with _lock:
+        clients = _async_clients.get(loop)
+        if clients is None:
+            clients = _async_clients[loop] = {}
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = _make_async_client(provider, base_url, token)
+        return client
+
+
+def _http_client(cls=None, hooks=None):
+    import httpx
+
+    return (cls or httpx.Client)(
+        http2=HTTP2,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(120.0, connect=10.0),
+        # Every request waits for its provider's rate limit, see ratez.py
+        event_hooks=hooks or rate_hooks(),
+    )
+
+
+def _async_http_client():
+    import httpx
+
+    # Waiting for the rate limit is an asyncio.sleep here, the loop keeps serving other chats
+    return _http_client(httpx.AsyncClient, async_rate_hooks())
+
+
+def _make_client(provider, base_url, token):
+    # SDKs are imported here, every project only installs the ones it uses
+    if provider == "openai":
+        from openai import OpenAI
+
+        return OpenAI(base_url=base_url, api_key=token, http_client=_http_client())
+    if provider == "groq":
+        from groq import Groq
+
+        return Groq(base_url=base_url, api_key=token, http_client=_http_client())
+
+    # InferenceClient keeps its own keep-alive requests session per thread
+    from huggingface_hub import InferenceClient
+
+    if base_url:
+        return InferenceClient(base_url=base_url, api_key=token)
+    return InferenceClient(provider=provider, api_key=token)
+
+
+def _make_async_client(provider, base_url, token):
+    if provider == "openai":
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(base_url=base_url, api_key=token, http_client=_async_http_client())
+    if provider == "groq":
+        from groq import AsyncGroq
+
+        return AsyncGroq(base_url=base_url, api_key=token, http_client=_async_http_client())
+
+    # AsyncInferenceClient opens an aiohttp session per call, closed when the stream ends
+    from huggingface_hub import AsyncInferenceClient
+
+    if base_url:
+        return AsyncInferenceClient(base_url=base_url, api_key=token)
+    return AsyncInferenceClient(provider=provider, api_key=token)
+
+
+def close_clients():
+    """Close every pooled connection, e.g. when a Gradio app shuts down"""
+    with _lock:
+        for client in _clients.values():
+            close = getattr(client, "close", None)
+            if close is not None:
+                close()
+        _clients.clear()
+
+
+async def aclose_clients():
+    """Close the async clients of the running loop"""
+    with _lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        close = getattr(client, "close", None)
+        if close is not None:
+            await close()
@@ -7,10 +7,11 @@
 import os
 
 from dotenv import load_dotenv
-from openai import OpenAI
 from rich import inspect
 from rich import print as rpr
 
+from .cachez import brint_cache_stats, cached_completion
+from .clientz import get_client
 from .utz import he1
 from .wm import save_to_markdown
 
@@ -28,6 +29,7 @@ modelz = [
 
 def gh1_main():
     fn2()
+    brint_cache_stats()
 
 # --- Sub Function ---
 
@@ -47,12 +49,10 @@ def fn2():
 
     quez = "What is the significant war happening in June 2025"
     endpoint = "https://models.github.ai/inference"
-    client = OpenAI(
-        base_url=endpoint,
-        api_key=GH_T,
-    )
+    client = get_client("openai", endpoint, GH_T)
 
-    response = client.chat.completions.create(
+    response = cached_completion(
+        client,
         messages=[
             {
                 "role": "system",
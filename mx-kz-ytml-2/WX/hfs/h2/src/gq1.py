@@ -7,9 +7,10 @@
 import os
 
 from dotenv import load_dotenv
-from groq import Groq
 from rich import print as rpr
 
+from .cachez import brint_cache_stats, cached_completion
+from .clientz import get_client
 from .utz import he1
 from .wm import save_to_markdown
 
@@ -30,6 +31,7 @@ modelz = [
 def gq1_main():
     env_test()
     gq1_chat1()
+    brint_cache_stats()
 
 
 ### Sub Funtions ###
@@ -46,11 +48,10 @@ def gq1_chat1():
 
     quez = "Find AI based automated web app penetesting tools that are opnsource and utilize google gemini api "
 
-    client = Groq(
-        api_key=gq_t,
-    )
+    client = get_client("groq", token=gq_t)
 
-    chat_completion = client.chat.completions.create(
+    chat_completion = cached_completion(
+        client,
         messages=[
             {
                 "role": "user",
@@ -0,0 +1,300 @@
+# ??????????????????????????????????????????????????????????????????????????????????
+# routez.py - Latency aware routing for LiteLLMRouterModel
+# ??????????????????????????????????????????????????????????????????????????????????
+
+# One logical model name, one deployment per provider serving it. Every call is timed
+# and the routing strategy sends the next one to the deployment with the best score:
+# EWMA latency, inflated by its recent error rate and by how little of its rate
+# limit is left. Failing deployments sit out a cooldown, and a small share of calls
+# still goes to the others so their numbers stay current.
+
+# --- Imports ---
+
+import os
+import random
+import re
+import threading
+import time
+
+from dotenv import load_dotenv
+from litellm.integrations.custom_logger import CustomLogger
+from litellm.router import CustomRoutingStrategyBase
+
+# --- Global Vars ---
+load_dotenv("src/.ass")
+
+LOGICAL_MODEL = "llama-3.1-8b"
+
+# (deployment id, LiteLLM model, env var with the key)
+DEPLOYMENTS = [
+    ("sambanova", "sambanova/Meta-Llama-3.1-8B-Instruct", "SAO"),
+    ("nebius", "nebius/meta-llama/Meta-Llama-3.1-8B-Instruct", "NBY"),
+    ("groq", "groq/llama-3.1-8b-instant", "GQ"),
+    ("hf", "huggingface/meta-llama/Llama-3.1-8B-Instruct", "HF"),
+]
+
+LATENCY_ALPHA = 0.3  # Weight of the newest latency in the EWMA
+ERROR_ALPHA = 0.2  # Weight of the newest success / failure in the error rate
+ERROR_PENALTY = 4.0  # An error rate of 25% doubles the effective latency
+UNHEALTHY_ERROR_RATE = 0.5
+COOLDOWN = 30.0  # Seconds an unhealthy deployment is left alone
+EXPLORE = 0.05  # Share of calls sent to a random healthy deployment
+MIN_BUDGET = 0.05  # Floor of the remaining rate limit share, keeps the score finite
+
+
+def make_model_list(model_name=LOGICAL_MODEL, deployments=DEPLOYMENTS):
+    """LiteLLM Router model_list, one entry per deployment that has a key in the env"""
+    model_list = []
+    for dep_id, model, env in deployments:
+        key = os.getenv(env)
+        if key:
+            model_list.append(
+                {
+                    "model_name": model_name,
+                    "litellm_params": {"model": model, "api_key": key},
+                    "model_info": {"id": dep_id},
+                }
+            )
+    return model_list
+
+
+# --- Stats ---
+
+
+class DeploymentStats:
+    def __init__(self, dep_id):
+        self.id = dep_id
+        self.latency = None  # EWMA seconds, None until the first success
+        self.error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.remaining = None  # x-ratelimit-remaining-requests
+        self.limit = None  # x-ratelimit-limit-requests
+        self.reset_at = 0.0
+
+    def budget(self, now):
+        """Share of the request rate limit left, 1.0 when the provider does not say"""
+        if self.remaining is None or now >= self.reset_at:
+            return 1.0
+        if not self.limit:
+            return 1.0 if self.remaining > 0 else 0.0
+        return self.remaining / self.limit
+
+    def healthy(self, now):
+        return now >= self.cooldown_until and self.budget(now) > 0
+
+    def score(self, now, default_latency):
+        # Lower is better; a deployment never timed goes first so it gets measured
+        if self.latency is None:
+            return 0.0 if self.calls == 0 and self.in_flight == 0 else default_latency
+        latency = self.latency
+        latency *= 1 + self.in_flight * 0.1
+        return latency * (1 + ERROR_PENALTY * self.error_rate) / max(self.budget(now), MIN_BUDGET)
+
+
+class RoutingTable:
+    """Live stats of every deployment, shared by the strategy, the logger and the UI"""
+
+    def __init__(self):
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def get(self, dep_id):
+        if dep_id not in self.stats:
+            self.stats[dep_id] = DeploymentStats(dep_id)
+        return self.stats[dep_id]
+
+    def pick(self, deployments):
+        now = time.monotonic()
+        with self.lock:
+            stats = [self.get(d["model_info"]["id"]) for d in deployments]
+            healthy = [i for i, s in enumerate(stats) if s.healthy(now)]
+            if not healthy:
+                # Everyone is cooling down: the one that comes back first
+                healthy = [min(range(len(stats)), key=lambda i: stats[i].cooldown_until)]
+            if len(healthy) > 1 and random.random() < EXPLORE:
+                choice = random.choice(healthy)
+            else:
+                known = [s.latency for s in stats if s.latency is not None]
+                default = sum(known) / len(known) if known else 1.0
+                choice = min(healthy, key=lambda i: stats[i].score(now, default))
+            stats[choice].in_flight += 1
+        return deployments[choice]
+
+    def record(self, dep_id, seconds=None, error=False, headers=None, rate_limited=False):
+        now = time.monotonic()
+        with self.lock:
+            s = self.get(dep_id)
+            s.calls += 1
+            s.in_flight = max(0, s.in_flight - 1)
+            s.error_rate += ERROR_ALPHA * ((1.0 if error else 0.0) - s.error_rate)
+            if error:
+                s.errors += 1
+                if rate_limited:
+                    retry = _header(headers or {}, "retry-after")
+                    s.cooldown_until = now + (_seconds(retry) if retry is not None else COOLDOWN)
+                elif s.error_rate >= UNHEALTHY_ERROR_RATE:
+                    s.cooldown_until = now + COOLDOWN
+            elif seconds is not None:
+                s.latency = seconds if s.latency is None else s.latency + LATENCY_ALPHA * (seconds - s.latency)
+            if headers:
+                _read_limits(s, headers, now)
+
+    def rows(self):
+        """Routing table for display, best score first"""
+        now = time.monotonic()
+        with self.lock:
+            stats = list(self.stats.values())
+            known = [s.latency for s in stats if s.latency is not None]
+            default = sum(known) / len(known) if known else 1.0
+            rows = []
+            for s in sorted(stats, key=lambda s: s.score(now, default)):
+                cooling = max(0.0, s.cooldown_until - now)
+                rows.append(
+                    [
+                        s.id,
+                        f"cooldown {cooling:.0f}s" if cooling else ("ok" if s.healthy(now) else "no budget"),
+                        f"{s.latency * 1000:.0f}" if s.latency is not None else "-",
+                        f"{s.error_rate:.0%}",
+                        f"{s.budget(now):.0%}",
+                        s.calls,
+                        s.errors,
+                        s.in_flight,
+                        f"{s.score(now, default):.2f}",
+                    ]
+                )
+        return rows
+
+
+TABLE_HEADERS = ["Deployment", "State", "EWMA ms", "Errors %", "Rate budget", "Calls", "Errors", "In flight", "Score"]
+
+
+def _header(headers, name):
+    # LiteLLM passes provider headers through as-is and again with an llm_provider- prefix
+    return headers.get(name) or headers.get(f"llm_provider-{name}")
+
+
+def _read_limits(s, headers, now):
+    remaining = _header(headers, "x-ratelimit-remaining-requests")
+    limit = _header(headers, "x-ratelimit-limit-requests")
+    reset = _header(headers, "x-ratelimit-reset-requests")
+    try:
+        if remaining is not None:
+            s.remaining = float(remaining)
+            s.limit = float(limit) if limit is not None else s.limit
+            # Without a reset hint assume the usual one minute window
+            s.reset_at = now + (_seconds(reset) if reset is not None else 60.0)
+    except ValueError:
+        pass
+
+
+_DURATION = re.compile(r"(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m(?!s))?(?:(\d+(?:\.\d+)?)s)?(?:(\d+(?:\.\d+)?)ms)?$")
+
+
+def _seconds(value):
+    """'12', '7.66s', '2m59.56s', '120ms' -> seconds, 60 if unreadable"""
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    match = _DURATION.match(value)
+    if not match or not any(match.groups()):
+        return 60.0
+    h, m, sec, ms = (float(g) if g else 0.0 for g in match.groups())
+    return h * 3600 + m * 60 + sec + ms / 1000
+
+
+ROUTING = RoutingTable()
+
+
+# --- LiteLLM hooks ---
+
+
+class LatencyRouting(CustomRoutingStrategyBase):
+    """Router.set_custom_routing_strategy() target, picks through the routing table"""
+
+    def __init__(self, router, table=ROUTING):
+        self.router = router
+        self.table = table
+
+    def _pick(self, model):
+        deployments = [d for d in self.router.model_list if d["model_name"] == model]
+        if not deployments:
+            # Asked for a deployment by its provider model name
+            deployments = [d for d in self.router.model_list if d["litellm_params"]["model"] == model]
+        if not deployments:
+            raise ValueError(f"No deployment for {model}")
+        return self.table.pick(deployments)
+
+    async def async_get_available_deployment(
+        self, model, messages=None, input=None, specific_deployment=False, request_kwargs=None
+    ):
+        return self._pick(model)
+
+    def get_available_deployment(
+        self, model, messages=None, input=None, specific_deployment=False, request_kwargs=None
+    ):
+        return self._pick(model)
+
+
+class RoutingLogger(CustomLogger):
+    """Feeds every finished call (latency, error, rate limit headers) back into the table"""
+
+    def __init__(self, table=ROUTING):
+        super().__init__()
+        self.table = table
+
+    @staticmethod
+    def _deployment(kwargs):
+        params = kwargs.get("litellm_params") or {}
+        return (params.get("model_info") or {}).get("id")
+
+    @staticmethod
+    def _headers(kwargs, response_obj=None):
+        hidden = getattr(response_obj, "_hidden_params", None) or {}
+        headers = hidden.get("additional_headers") or {}
+        if not headers:
+            exception = kwargs.get("exception")
+            response = getattr(exception, "response", None)
+            headers = dict(getattr(response, "headers", None) or {})
+        return headers
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        dep_id = self._deployment(kwargs)
+        if dep_id:
+            self.table.record(dep_id, (end_time - start_time).total_seconds(), headers=self._headers(kwargs, response_obj))
+
+    def log_failure_event(self, kwargs, response_obj, start_time, end_time):
+        dep_id = self._deployment(kwargs)
+        if dep_id:
+            status = getattr(kwargs.get("exception"), "status_code", None)
+            self.table.record(dep_id, error=True, headers=self._headers(kwargs), rate_limited=status == 429)
+
+    async def async_log_success_event(self, kwargs, response_obj, start_time, end_time):
+        self.log_success_event(kwargs, response_obj, start_time, end_time)
+
+    async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time):
+        self.log_failure_event(kwargs, response_obj, start_time, end_time)
+
+
+def enable_latency_routing(model, table=ROUTING):
+    """
+    Route a LiteLLMRouterModel through the routing table.
+
+    Parameters:
+    - model (LiteLLMRouterModel): Its client is the LiteLLM Router
+    - table (RoutingTable): Stats to route on, ROUTING by default
+
+    Returns:
+    - LiteLLMRouterModel: The same model
+    """
+    import litellm
+
+    router = model.client
+    router.set_custom_routing_strategy(LatencyRouting(router, table))
+    if not any(isinstance(cb, RoutingLogger) for cb in litellm.callbacks):
+        litellm.callbacks.append(RoutingLogger(table))
+    return model
@@ -6,16 +6,18 @@
 
 import os
 
+import gradio as gr
 from dotenv import load_dotenv
 from rich.pretty import pprint as ppr
 from smolagents import (
     CodeAgent,
     GradioUI,
     InferenceClientModel,
-    LiteLLMModel,
     LiteLLMRouterModel,
 )
 
+from .ratez import LimitedLiteLLMModel
+from .routez import LOGICAL_MODEL, ROUTING, TABLE_HEADERS, enable_latency_routing, make_model_list
 from .utz import header1
 
 # --- Global Vars ---
@@ -73,10 +75,11 @@ def hf2():
         "sambanova/Meta-Llama-3.2-3B-Instruct"
     ]
 
-    model = LiteLLMModel(
-        modelid=modelz[0],
+    # Rate limited so the agent's steps queue at SambaNova's limit instead of failing
+    model = LimitedLiteLLMModel(
+        model_id=modelz[0],
         api_base="https://api.sambanova.ai/v1",
-        apikey=SA_T,
+        api_key=SA_T,
         temperature=0.6,
         max_tokens=1000,
     )
@@ -105,10 +108,10 @@ def hf3():
         }
     ]
 
-    model = LiteLLMModel(
-        modelid="sambanova/Meta-Llama-3.2-3B-Instruct",
+    model = LimitedLiteLLMModel(
+        model_id="sambanova/Meta-Llama-3.2-3B-Instruct",
         api_base="https://api.sambanova.ai/v1",
-        apikey=SA_T,
+        api_key=SA_T,
         temperature=0.6,
         max_tokens=1000
     )
@@ -130,8 +133,8 @@ def hf4():
     # Set your SambaNova credentials
     os.environ["SAMBA_NOVA_API_KEY"] = SA_T
 
-    # Wrap SambaNova model with LiteLLMModel
-    model = LiteLLMModel(
+    # Wrap SambaNova model with LiteLLMModel, rate limited (ratez.py)
+    model = LimitedLiteLLMModel(
         model_id="sambanova/Meta-Llama-3.2-3B-Instruct",
         api_base="https://api.sambanova.ai/v1",
         api_key=os.getenv("SAMBA_NOVA_API_KEY"),
@@ -169,20 +172,15 @@ def hf5_llm_ro():
         }
     ]
 
-    model = LiteLLMRouterModel(
-        model_id="Meta-Llama-3.2-3B-Instruct",
-        model_list=[
-            {
-                "model_name": "Meta-Llama-3.2-3B-Instruct",
-                "litellm_params": {
-                    "model": "sambanova/Meta-Llama-3.2-3B-Instruct",
-                    "api_key": SA_T
-                }
-            }
-        ]
-    )
+    # One logical model on SambaNova, Nebius, Groq and HF, each call goes to the
+    # fastest healthy one (routez.py)
+    model = enable_latency_routing(LiteLLMRouterModel(
+        model_id=LOGICAL_MODEL,
+        model_list=make_model_list()
+    ))
 
     ppr(model(messages))
+    ppr(ROUTING.rows())
 
 # Tetsing it with an agent now
 
@@ -241,18 +239,11 @@ def hf5_llm_ro_3g():
         }
     ]
 
-    model = LiteLLMRouterModel(
-        model_id="Meta-Llama-3.2-3B-Instruct",
-        model_list=[
-            {
-                "model_name": "Meta-Llama-3.2-3B-Instruct",
-                "litellm_params": {
-                    "model": "sambanova/Meta-Llama-3.2-3B-Instruct",
-                    "api_key": SA_T
-                }
-            }
-        ]
-    )
+    # Every step of the agent is routed to the fastest healthy deployment (routez.py)
+    model = enable_latency_routing(LiteLLMRouterModel(
+        model_id=LOGICAL_MODEL,
+        model_list=make_model_list()
+    ))
 
     agent = CodeAgent(
         model=model,
@@ -260,4 +251,14 @@ def hf5_llm_ro_3g():
         add_base_tools=True
     )
 
-    GradioUI(agent).launch()
+    with gr.Blocks() as pty:
+        with gr.Tab("Agent"):
+            GradioUI(agent).create_app().render()
+
+        # Live routing table: EWMA latency, error rate and rate budget per deployment
+        with gr.Tab("Routing"):
+            table = gr.Dataframe(
+                value=ROUTING.rows, headers=TABLE_HEADERS, interactive=False)
+            gr.Timer(2.0).tick(ROUTING.rows, outputs=table)
+
+    pty.launch()
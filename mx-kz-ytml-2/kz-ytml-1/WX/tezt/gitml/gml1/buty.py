@@ -4,12 +4,14 @@
 
 # --- Imports ---
 from src.gm1 import gm1_main
+from src.gmb import gmb_main
 from src.utz import eline, tline
 
 
 # --- Main Function ---
 def buty():
     gm1_main()
+    # gmb_main()  # Every question in questions.jsonl x every model
 
 
 if __name__ == "__main__":
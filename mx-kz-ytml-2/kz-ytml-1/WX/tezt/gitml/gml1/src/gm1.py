@@ -6,9 +6,11 @@
 import os
 
 from dotenv import load_dotenv
-from openai import OpenAI
 from rich.pretty import pprint as ppr
 
+from .cachez import brint_cache_stats, cached_completion
+from .catalogz import startup_ids
+from .clientz import get_client
 from .utz import header1
 from .wm import save_to_markdown
 
@@ -19,7 +21,8 @@ load_dotenv("src/.pussy")
 GH_T = os.getenv("GHT")
 
 # --- Models List ---
-model_ids = [
+# Hand copied snapshot, only used until the catalog cache (catalogz.py) has been filled once
+fallback_ids = [
     "openai/gpt-4.1",
     "openai/gpt-4.1-mini",
     "openai/gpt-4.1-nano",
@@ -80,6 +83,8 @@ model_ids = [
     "microsoft/phi-4-multimodal-instruct",
     "microsoft/phi-4-reasoning"
 ]
+# Chat models from the cached GitHub catalog, no network wait at startup
+model_ids = startup_ids("github", fallback_ids, token=GH_T)
 
 
 # -- Main Function Call --
@@ -88,6 +93,7 @@ model_ids = [
 def gm1_main():
     # print_env()  # Testing env access
     gm1_1()  # Run the official example test
+    brint_cache_stats()  # Completion cache hits / misses
 
 # --- SubFunc---
 
@@ -106,16 +112,14 @@ def gm1_1():
     header1("Official Example Test")
 
     endpoint = "https://models.github.ai/inference"
-    model = model_ids[58]
+    model = "microsoft/phi-4-reasoning"
 
-    client = OpenAI(
-        base_url=endpoint,
-        api_key=GH_T,
-    )
+    client = get_client("openai", endpoint, GH_T)
 
     question = "What is smellpanty algoritm ?"
 
-    response = client.chat.completions.create(
+    response = cached_completion(
+        client,
         messages=[
             {
                 "role": "system",
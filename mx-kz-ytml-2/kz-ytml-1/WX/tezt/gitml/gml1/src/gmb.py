@@ -0,0 +1,199 @@
+# ????????????????????????????????????????????????????????????
+# gmb - GithubMl Batch runner
+# ????????????????????????????????????????????????????????????
+
+# Runs every question in a JSONL file against every model in the catalog at once.
+# AsyncOpenAI with a concurrency cap per provider (the part before "/" in the model id),
+# every answer is appended to a JSONL results file the moment it arrives,
+# so an interrupted run picks up where it stopped.
+
+# --- Imports Zone ---
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+from openai import AsyncOpenAI
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+from rich.table import Table
+
+from .gm1 import GH_T, model_ids
+from .ratez import async_rate_hooks
+from .utz import console, header1
+
+# --- Vars ---
+
+ENDPOINT = "https://models.github.ai/inference"
+
+# Embedding models have no chat endpoint
+SKIP_MARKERS = ("embedding", "embed-")
+
+PER_PROVIDER = 4  # Requests in flight per provider
+MAX_IN_FLIGHT = 32  # Requests in flight overall
+
+
+# -- Main Function Call --
+
+
+def gmb_main():
+    gm1_batch("questions.jsonl")
+
+
+# --- Inputs / Outputs ---
+
+
+def load_questions(path):
+    """
+    Questions JSONL, one object per line: {"id": "q1", "question": "...", "system": "..."}.
+    id and system are optional.
+    """
+    questions = []
+    with open(path, encoding="utf8") as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            q = json.loads(line)
+            q.setdefault("id", f"q{i + 1}")
+            q.setdefault("system", "You are a helpful assistant.")
+            questions.append(q)
+    return questions
+
+
+def load_done(path):
+    """(question id, model) pairs already answered in a results file"""
+    done = set()
+    if os.path.exists(path):
+        with open(path, encoding="utf8") as f:
+            for line in f:
+                try:
+                    r = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # half written line from a killed run
+                if not r.get("error"):
+                    done.add((r["question_id"], r["model"]))
+    return done
+
+
+def provider_of(model):
+    return model.split("/", 1)[0]
+
+
+# --- Runner ---
+
+
+async def run_batch(
+    questions,
+    models,
+    out_path,
+    per_provider=PER_PROVIDER,
+    max_in_flight=MAX_IN_FLIGHT,
+    temperature=1.0,
+    timeout=120.0,
+):
+    """
+    Ask every question to every model, concurrently.
+
+    Parameters:
+    - questions (list[dict]): From load_questions
+    - models (list[str]): Model ids, e.g. model_ids from gm1.py
+    - out_path (str): Results JSONL, appended to as answers arrive
+    - per_provider (int): Requests in flight per provider
+    - max_in_flight (int): Requests in flight overall
+    - temperature (float): Sampling temperature for every request
+    - timeout (float): Seconds before a single request gives up
+
+    Returns:
+    - list[dict]: Results of this run
+    """
+    models = [m for m in models if not any(s in m for s in SKIP_MARKERS)]
+    done = load_done(out_path)
+    jobs = [(q, m) for q in questions for m in models if (q["id"], m) not in done]
+    if done:
+        console.print(f"Skipping {len(done)} answers already in {out_path}")
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    # Requests queue on the per model rate limit (ratez.py) instead of collecting 429s
+    http_client = httpx.AsyncClient(event_hooks=async_rate_hooks(), timeout=timeout)
+    client = AsyncOpenAI(base_url=ENDPOINT, api_key=GH_T, max_retries=3, http_client=http_client)
+    overall = asyncio.Semaphore(max_in_flight)
+    providers = defaultdict(lambda: asyncio.Semaphore(per_provider))
+    results = []
+
+    async def ask(q, model):
+        async with providers[provider_of(model)], overall:
+            start = time.perf_counter()
+            record = {"question_id": q["id"], "model": model, "question": q["question"]}
+            try:
+                response = await client.chat.completions.create(
+                    messages=[
+                        {"role": "system", "content": q["system"]},
+                        {"role": "user", "content": q["question"]},
+                    ],
+                    temperature=temperature,
+                    model=model,
+                )
+                record["answer"] = response.choices[0].message.content
+                record["usage"] = response.usage.model_dump() if response.usage else None
+                record["error"] = None
+            except Exception as e:
+                record["answer"] = None
+                record["error"] = f"{type(e).__name__}: {e}"
+            record["latency"] = round(time.perf_counter() - start, 3)
+            record["ts"] = datetime.now().isoformat(timespec="seconds")
+            return record
+
+    # Closed (connection pool included) even when a write fails or the run is cancelled
+    async with client:
+        with Progress(
+            TextColumn("[green_yellow]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+        ) as progress, open(out_path, "a", encoding="utf8") as out:
+            task = progress.add_task(f"{len(questions)} questions x {len(models)} models", total=len(jobs))
+            for coro in asyncio.as_completed([ask(q, m) for q, m in jobs]):
+                record = await coro
+                # One line per answer, flushed right away so nothing is lost on Ctrl+C
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                results.append(record)
+                progress.advance(task)
+
+    return results
+
+
+def print_summary(results):
+    by_model = defaultdict(list)
+    for r in results:
+        by_model[r["model"]].append(r)
+
+    table = Table(title="Batch Results", border_style="magenta")
+    table.add_column("Model", style="cyan")
+    table.add_column("OK", justify="right")
+    table.add_column("Errors", justify="right", style="red")
+    table.add_column("Median s", justify="right")
+    for model, rows in sorted(by_model.items()):
+        latencies = sorted(r["latency"] for r in rows if not r["error"])
+        median = f"{latencies[len(latencies) // 2]:.2f}" if latencies else "-"
+        errors = sum(1 for r in rows if r["error"])
+        table.add_row(model, str(len(rows) - errors), str(errors), median)
+    console.print(table)
+
+
+def gm1_batch(questions_path, out_path=None):
+    header1("Batch Run - Questions x Models")
+
+    questions = load_questions(questions_path)
+    # Same results file for the same questions, so reruns only fill the gaps
+    name = os.path.splitext(os.path.basename(questions_path))[0]
+    out_path = out_path or f"rez/batch_{name}.jsonl"
+
+    start = time.perf_counter()
+    results = asyncio.run(run_batch(questions, model_ids, out_path))
+    print_summary(results)
+    console.print(f"{len(results)} answers in {time.perf_counter() - start:.1f}s -> {out_path}")
+    return results
@@ -6,10 +6,9 @@
 import json
 import os
 
-import httpx
 from dotenv import load_dotenv
-from rich.pretty import pprint as ppr
 
+from .catalogz import load_catalog, print_catalog
 from .utz import header1
 from .wm import save_to_markdown
 
@@ -31,22 +30,16 @@ def get_models_1():
 
     header1("fetch GitHUb Models")
 
-    url = "https://models.github.ai/catalog/models"
+    # From disk for a day, then a conditional request that is a 304 when nothing changed
+    catalog = load_catalog("github", token=GH_T)
+    print_catalog(catalog)
 
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {GH_T}"
-    }
-
-    with httpx.Client() as client:
-        response = client.get(url, headers=headers)
-
-    # Print status code and response JSON
-    print(f"Status Code: {response.status_code}")
+    # A new snapshot only when the catalog actually changed
+    if catalog.source != "200":
+        return catalog
     try:
-        ppr(response.json())
         formatted_output = json.dumps(
-            response.json(), indent=2, ensure_ascii=False)
+            catalog.data, indent=2, ensure_ascii=False)
 
         # Write to markdown file
         save_to_markdown(
@@ -57,6 +50,6 @@ def get_models_1():
             include_time_in_filename=True,
         )
 
-    except Exception:
-        print("Failed to decode JSON")
-        print(response.text)
+    except Exception as e:
+        print(f"Failed to save the catalog: {e}")
+    return catalog
@@ -8,6 +8,7 @@ import time
 
 import gradio as gr
 
+from src.launchz import launch
 from src.mkd import in_txt2, txt2
 
 # --- Vars ---
@@ -73,9 +74,8 @@ def panty():
         with gr.Tab("ChatPanty"):
             ch_in()
 
-    panty.launch(
-        show_error=True
-    )
+    # Bounded queue: past MAX_QUEUE waiting chats new ones get "Queue is full" right away
+    launch(panty, show_error=True)
 
 
 if __name__ == "__main__":
@@ -4,12 +4,14 @@
 
 # --- Imports ---
 
+from src.hedgebench import hedge_bench
 from src.sam import sam_main
 from src.utz import eline, tline
 
 
 # --- Main Function ---
 def buty():
+    # hedge_bench()  # p99 with and without hedging, local stand-in servers
     sam_main()
 
 
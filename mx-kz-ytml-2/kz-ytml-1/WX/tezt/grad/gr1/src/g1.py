@@ -4,10 +4,11 @@
 
 # --- Imports ---
 
-import time
+import asyncio
 
 import gradio as gr
 
+from .launchz import launch
 from .mkd import in_txt, in_txt2, txt2
 from .utz import header1
 
@@ -69,9 +70,10 @@ def g1_2():
     # Chat Interface function
     def ch_in():
 
-        def slow_echo(message, history):
+        # Async generator: every character waits on the event loop, not in a worker thread
+        async def slow_echo(message, history):
             for i in range(len(message)):
-                time.sleep(0.05)
+                await asyncio.sleep(0.05)
                 yield "SmellPanty: " + message[:i + 1]
 
         gr.ChatInterface(
@@ -90,6 +92,7 @@ def g1_2():
                 ["What's your name?", "My name is SmellPanty"],
             ],
             save_history=True,
+            concurrency_limit=None,  # Async, so every session echoes at once instead of in line
         )
 
     # Main UI
@@ -104,9 +107,7 @@ def g1_2():
             gr.Markdown(txt2)
             ch_in()
 
-    g1_ui.launch(
-        show_error=True,
-    )
+    launch(g1_ui, show_error=True)
 
 # Testing basic I/O
 
@@ -0,0 +1,117 @@
+# ??????????????????????????????????????????????
+# hedgebench.py - Tail latency with and without hedging
+# ??????????????????????????????????????????????
+
+# Two local stand-in providers (localai.py) with a slow tail on 5% of requests.
+# The same requests run primary only, then hedged (hedgez.py), through the real
+# OpenAI client, and the p50 / p95 / p99 time to first token and to the full reply are compared.
+# Run: uv run python -m src.hedgebench
+
+# --- Imports ---
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rich.table import Table
+
+from .hedgez import LatencyStats, Route, hedged_stream, percentile
+from .localai import LocalAI
+from .ratez import LIMITS
+from .utz import console, header1
+
+# --- Vars ---
+
+REQUESTS = 300
+CONCURRENCY = 8
+WARMUP = 40  # Requests that fill the latency window before measuring
+
+# Normal first token ~60-100ms, 5% of requests stuck an extra 1.5s
+PRIMARY = dict(first_token=0.06, jitter=0.04, tail_rate=0.05, tail_delay=1.5, seed=1)
+SECONDARY = dict(first_token=0.08, jitter=0.04, tail_rate=0.05, tail_delay=1.5, seed=2)
+
+MESSAGES = [{"role": "user", "content": "Describe booty dancing"}]
+
+
+# --- Main Function ---
+
+
+def hedge_bench(requests=REQUESTS, concurrency=CONCURRENCY):
+    header1(f"Hedged requests - {requests} requests, {concurrency} at a time")
+
+    # No rate limit against localhost, and no per request httpx debug lines
+    LIMITS["127.0.0.1"] = (10**9, 10**12)
+    logging.disable(logging.INFO)
+
+    rows = []
+    for label, max_hedges in (("primary only", 0), ("hedged", 1)):
+        primary, secondary = LocalAI(**PRIMARY), LocalAI(**SECONDARY)
+        routes = [
+            Route("primary", primary.base_url, "local-llama", "local"),
+            Route("secondary", secondary.base_url, "local-llama", "local"),
+        ]
+        stats = LatencyStats()
+        run_requests(routes, stats, max_hedges, WARMUP, concurrency)
+        stats = _warm_copy(stats)
+
+        sent = primary.requests + secondary.requests
+        timings = run_requests(routes, stats, max_hedges, requests, concurrency)
+        extra = primary.requests + secondary.requests - sent - requests
+        rows.append((label, timings, stats, extra))
+        primary.stop()
+        secondary.stop()
+
+    logging.disable(logging.NOTSET)
+    print_bench(rows, requests)
+    return rows
+
+
+# --- Sub Functions ---
+
+
+def run_requests(routes, stats, max_hedges, n, concurrency):
+    def one(_):
+        start = time.perf_counter()
+        first = None
+        for _text in hedged_stream(MESSAGES, routes=routes, stats=stats, max_hedges=max_hedges):
+            if first is None:
+                first = time.perf_counter() - start
+        return first, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, range(n)))
+
+
+def _warm_copy(stats):
+    # Keep the learned first token times, reset the counters for the measured run
+    fresh = LatencyStats(stats.window, stats.min_samples, stats.default)
+    for name, samples in stats.samples.items():
+        fresh.samples[name].extend(samples)
+    return fresh
+
+
+def print_bench(rows, requests):
+    table = Table(title="Hedged Requests", border_style="magenta")
+    table.add_column("Mode", style="cyan")
+    for col in ("TTFT p50", "TTFT p95", "TTFT p99", "Total p50", "Total p99"):
+        table.add_column(col, justify="right")
+    table.add_column("Hedges", justify="right")
+    table.add_column("Extra requests", justify="right")
+    table.add_column("Wins")
+
+    for label, timings, stats, extra in rows:
+        firsts = [t[0] for t in timings]
+        totals = [t[1] for t in timings]
+        s = stats.summary()
+        table.add_row(
+            label,
+            *(f"{percentile(firsts, q) * 1000:.0f} ms" for q in (0.50, 0.95, 0.99)),
+            *(f"{percentile(totals, q) * 1000:.0f} ms" for q in (0.50, 0.99)),
+            str(s["hedges"]),
+            f"{extra / requests:.1%}",
+            ", ".join(f"{k} {v}" for k, v in sorted(s["wins"].items())),
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    hedge_bench()
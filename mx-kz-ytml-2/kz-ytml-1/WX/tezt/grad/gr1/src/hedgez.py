@@ -0,0 +1,286 @@
+# /////////////////////////////////////////
+# hedgez.py - Hedged streaming chat across providers
+# /////////////////////////////////////////
+
+# The same Llama model answers on SambaNova, Nebius, Groq and the HF router.
+# A request goes to the primary first; if no first token shows up before that provider's
+# p95 time to first token, the same request is fired at the next provider and whichever
+# streams first wins, the other stream is closed. A provider that errors before its
+# first token falls through to the next one straight away.
+
+# --- Imports Zone ---
+
+import os
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+
+from .clientz import get_client
+
+# --- Vars ---
+
+load_dotenv("src/.ass")
+
+# name -> (OpenAI compatible base url, env var with the key)
+PROVIDERS = {
+    "sambanova": ("https://api.sambanova.ai/v1", "SAO"),
+    "nebius": ("https://api.studio.nebius.com/v1", "NBY"),
+    "groq": ("https://api.groq.com/openai/v1", "GQ"),
+    "hf": ("https://router.huggingface.co/v1", "HF"),
+}
+
+# The same model under each provider's own name, in order of preference
+LLAMA_8B = [
+    ("sambanova", "Meta-Llama-3.1-8B-Instruct"),
+    ("nebius", "meta-llama/Meta-Llama-3.1-8B-Instruct"),
+    ("groq", "llama-3.1-8b-instant"),
+    ("hf", "meta-llama/Llama-3.1-8B-Instruct"),
+]
+
+WINDOW = 200  # First token times kept per provider
+MIN_SAMPLES = 20  # Below this the p95 is noise, use DEFAULT_DEADLINE
+DEFAULT_DEADLINE = 2.0  # Seconds to wait for a first token before hedging
+MIN_DEADLINE = 0.05
+MAX_HEDGES = 1  # Extra requests fired because the current one is slow (errors always fall through)
+
+
+@dataclass(frozen=True)
+class Route:
+    name: str
+    base_url: str
+    model: str
+    token: str = None
+
+
+def make_routes(table=LLAMA_8B):
+    """[(provider, model)] -> [Route], keys from the env, providers without a key are left out"""
+    routes = []
+    for name, model in table:
+        base_url, env = PROVIDERS[name]
+        token = os.getenv(env)
+        if token:
+            routes.append(Route(name, base_url, model, token))
+    return routes
+
+
+# --- Latency stats ---
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class LatencyStats:
+    """
+    Rolling first token times per provider, the hedge deadline is their p95.
+
+    Parameters:
+    - window (int): Samples kept per provider
+    - min_samples (int): Samples needed before the p95 is trusted
+    - default (float): Deadline in seconds until then
+    """
+
+    def __init__(self, window=WINDOW, min_samples=MIN_SAMPLES, default=DEFAULT_DEADLINE):
+        self.window = window
+        self.min_samples = min_samples
+        self.default = default
+        self.samples = defaultdict(lambda: deque(maxlen=self.window))
+        self.requests = 0
+        self.hedges = 0  # Extra requests fired on a missed deadline
+        self.fallbacks = 0  # Extra requests fired on an error
+        self.wins = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self.lock:
+            self.samples[name].append(seconds)
+
+    def deadline(self, name):
+        with self.lock:
+            samples = list(self.samples[name])
+        if len(samples) < self.min_samples:
+            return self.default
+        return max(MIN_DEADLINE, percentile(samples, 0.95))
+
+    def summary(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "fallbacks": self.fallbacks,
+                "wins": dict(self.wins),
+                "p95": {name: percentile(list(s), 0.95) for name, s in self.samples.items()},
+            }
+
+
+STATS = LatencyStats()
+
+
+# --- Streams ---
+
+
+class TextStream:
+    """Text deltas of an OpenAI streaming response, close() drops the connection"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __iter__(self):
+        for chunk in self.stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+
+    def close(self):
+        self.stream.close()
+
+
+def open_stream(route, messages, **params):
+    client = get_client("openai", route.base_url, route.token)
+    stream = client.chat.completions.create(model=route.model, messages=messages, stream=True, **params)
+    return TextStream(stream)
+
+
+class _Attempt:
+    def __init__(self, index, route, events, stats, opener, messages, params):
+        self.index = index
+        self.route = route
+        self.cancelled = threading.Event()
+        self.stream = None
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(
+            target=self.run, args=(events, stats, opener, messages, params), name=f"hedge-{route.name}", daemon=True
+        )
+        self.thread.start()
+
+    def run(self, events, stats, opener, messages, params):
+        start = time.perf_counter()
+        first = True
+        try:
+            stream = opener(self.route, messages, **params)
+            with self.lock:
+                self.stream = stream
+            if self.cancelled.is_set():
+                return
+            for text in stream:
+                if self.cancelled.is_set():
+                    return
+                if not text:
+                    continue
+                if first:
+                    stats.record(self.route.name, time.perf_counter() - start)
+                    first = False
+                events.put((self.index, "text", text))
+            events.put((self.index, "done", None))
+        except Exception as e:
+            if not self.cancelled.is_set():
+                events.put((self.index, "error", e))
+        finally:
+            self.close()
+
+    def cancel(self):
+        self.cancelled.set()
+        self.close()
+
+    def close(self):
+        # Closing from the caller's thread unblocks a read waiting on the socket
+        with self.lock:
+            stream, self.stream = self.stream, None
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
+def hedged_stream(messages, routes=None, stats=STATS, max_hedges=MAX_HEDGES, opener=open_stream, **params):
+    """
+    Stream a chat reply from the first provider to start answering.
+
+    Parameters:
+    - messages (list[dict]): OpenAI style chat messages
+    - routes (list[Route]): Providers in order of preference, default make_routes()
+    - stats (LatencyStats): First token times the deadlines come from
+    - max_hedges (int): Extra requests allowed for a slow start, 0 turns hedging off
+    - opener (callable): (route, messages, **params) -> iterable of text deltas with close()
+    - **params: Passed on to chat.completions.create (temperature, max_tokens ...)
+
+    Returns:
+    - Iterator[str]: Text deltas of the winning stream
+    """
+    routes = routes if routes is not None else make_routes()
+    if not routes:
+        raise ValueError("No provider has a key set, see PROVIDERS")
+
+    events = queue.Queue()
+    attempts = []
+
+    def fire(i):
+        attempts.append(_Attempt(i, routes[i], events, stats, opener, messages, params))
+        return time.monotonic() + stats.deadline(routes[i].name)
+
+    with stats.lock:
+        stats.requests += 1
+    deadline = fire(0)
+    live = {0}
+    hedges = 0
+    errors = []
+    winner = None
+    try:
+        # Race until one attempt produces text
+        while winner is None:
+            can_hedge = hedges < max_hedges and len(attempts) < len(routes)
+            timeout = max(0.0, deadline - time.monotonic()) if can_hedge else None
+            try:
+                i, kind, value = events.get(timeout=timeout)
+            except queue.Empty:
+                hedges += 1
+                with stats.lock:
+                    stats.hedges += 1
+                live.add(len(attempts))
+                deadline = fire(len(attempts))
+                continue
+
+            if kind == "text":
+                winner = i
+                first_text = value
+                break
+
+            # Failed (or empty) before a first token
+            live.discard(i)
+            errors.append(value or RuntimeError(f"{routes[i].name} returned an empty reply"))
+            if len(attempts) < len(routes):
+                with stats.lock:
+                    stats.fallbacks += 1
+                live.add(len(attempts))
+                deadline = fire(len(attempts))
+            elif not live:
+                raise errors[-1]
+
+        for attempt in attempts:
+            if attempt.index != winner:
+                attempt.cancel()
+        with stats.lock:
+            stats.wins[routes[winner].name] += 1
+
+        yield first_text
+        while True:
+            i, kind, value = events.get()
+            if i != winner:
+                continue  # Leftovers from a cancelled attempt
+            if kind == "text":
+                yield value
+            elif kind == "done":
+                return
+            else:
+                raise value  # Mid stream failures cannot be replayed elsewhere
+    finally:
+        # Also runs when the consumer stops early, e.g. Gradio's stop button
+        for attempt in attempts:
+            attempt.cancel()
@@ -0,0 +1,275 @@
+# /////////////////////////////////////////
+# historyz.py - Fit chat history into the model's context window
+# /////////////////////////////////////////
+
+# Gradio hands the whole conversation to the handler on every turn. HistoryManager.fit()
+# keeps the system prompt and the newest turns that fit the model's token budget and
+# drops (or summarises) the rest. Token counts are cached per message, so a turn only
+# tokenizes the messages it has not seen before. Summaries are incremental: the previous
+# summary plus the newly dropped block, never the whole dropped prefix again.
+
+# --- Imports Zone ---
+
+import hashlib
+import importlib.util
+import threading
+import time
+from collections import OrderedDict
+
+from .catalogz import CATALOGS, cached_catalog
+
+# --- Vars ---
+
+# Context windows for models the cached catalogs may not know yet
+KNOWN_CONTEXT = {
+    "meta-llama/Llama-3.1-8B-Instruct": 131_072,
+    "meta-llama/Meta-Llama-3.1-8B-Instruct": 131_072,
+    "Meta-Llama-3.2-1B-Instruct": 16_384,
+    "mistralai/Mistral-7B-Instruct-v0.3": 32_768,
+}
+DEFAULT_CONTEXT = 8_192
+
+RESERVE = 1_024  # Tokens kept free for the reply
+MESSAGE_OVERHEAD = 4  # Role and separators the chat template adds per message
+SUMMARY_BLOCK = 8  # Dropped turns are summarised in blocks, so the summary only changes every few turns
+SUMMARY_RETRY = 60.0  # Seconds without summarising after the summarizer failed
+MAX_SUMMARIES = 256  # Summaries kept, one per block boundary of every conversation
+MAX_CACHED = 50_000  # Message token counts kept
+
+# tiktoken when installed (uv add tiktoken), ~4 characters per token otherwise
+if importlib.util.find_spec("tiktoken") is not None:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+    def _tokens(text):
+        return len(_encoding.encode(text, disallowed_special=()))
+else:
+
+    def _tokens(text):
+        return len(text) // 4 + 1
+
+
+# --- Token counts ---
+
+_counts = OrderedDict()
+_counts_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def count_tokens(message):
+    """Tokens of one chat message, cached by role and content"""
+    content = message.get("content")
+    if not isinstance(content, str):
+        content = str(content)  # Gradio file / component messages
+    key = (message.get("role"), content)
+    with _counts_lock:
+        n = _counts.get(key)
+        if n is not None:
+            _counts.move_to_end(key)
+            _stats["hits"] += 1
+            return n
+        _stats["misses"] += 1
+    n = _tokens(content) + MESSAGE_OVERHEAD
+    with _counts_lock:
+        _counts[key] = n
+        if len(_counts) > MAX_CACHED:
+            _counts.popitem(last=False)
+    return n
+
+
+def context_for(model):
+    """Context window of a model: known list first, then the catalogs on disk (no network)"""
+    if model in KNOWN_CONTEXT:
+        return KNOWN_CONTEXT[model]
+    for provider in CATALOGS:
+        catalog = cached_catalog(provider)
+        info = catalog.get(model) if catalog else None
+        if info and info.context_length:
+            KNOWN_CONTEXT[model] = info.context_length
+            return info.context_length
+    return DEFAULT_CONTEXT
+
+
+# --- History ---
+
+
+def llm_summarizer(client, model, max_words=150):
+    """summarizer for HistoryManager that asks the chat model itself"""
+
+    def summarize(messages):
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": f"Summarise this conversation in under {max_words} words. "
+                    "Keep names, facts, decisions and open questions.",
+                },
+                {"role": "user", "content": transcript},
+            ],
+            max_tokens=max_words * 2,
+        )
+        return response.choices[0].message.content
+
+    return summarize
+
+
+class HistoryManager:
+    """
+    Trim a chat history to the model's context window.
+
+    Parameters:
+    - model (str): Model id, its context window comes from context_for()
+    - context_length (int): Override the context window
+    - reserve (int): Tokens left free for the reply
+    - summarizer (callable): list[dict] -> str for dropped turns, None just drops them
+    - block (int): Messages summarised at a time
+    """
+
+    def __init__(self, model, context_length=None, reserve=RESERVE, summarizer=None, block=SUMMARY_BLOCK):
+        self.model = model
+        self.budget = (context_length or context_for(model)) - reserve
+        self.summarizer = summarizer
+        self.block = block
+        self.summary_budget = self.budget // 2  # Summarizer input cap, the same model has to take it
+        self.summaries = OrderedDict()  # hash of a summarised prefix -> its summary
+        self.retry_at = 0.0
+        self.last_error = None
+        self.last = {"messages": 0, "kept": 0, "tokens": 0, "summarised": 0}
+        # One manager serves every session and worker thread: guards summaries, retry state and last.
+        # Never held while the summarizer runs, two sessions may summarise the same prefix at worst
+        self.lock = threading.Lock()
+
+    def fit(self, messages):
+        """
+        Messages to send: leading system prompts, maybe a summary, then the newest turns within budget.
+
+        Only the system prompts and the kept turns are looked at, so the cost follows the
+        context window, not the length of the conversation.
+
+        Parameters:
+        - messages (list[dict]): Full history including the new user message
+
+        Returns:
+        - list[dict]: Plain {"role", "content"} messages, starting with a user turn after the system part
+        """
+        head = 0
+        while head < len(messages) and messages[head]["role"] == "system":
+            head += 1
+        used = sum(count_tokens(m) for m in messages[:head])
+
+        # Newest first until the budget runs out, the new user message always goes
+        end = len(messages)
+        start = end
+        for i in range(end - 1, head - 1, -1):
+            n = count_tokens(messages[i])
+            if used + n > self.budget and start < end:
+                break
+            used += n
+            start = i
+
+        summary = []
+        if start > head and self.summarizer is not None:
+            summary, start, used = self._summary(messages, head, start, used)
+        # Never open on an assistant turn, some chat templates reject it
+        while start < end - 1 and messages[start]["role"] != "user":
+            used -= count_tokens(messages[start])
+            start += 1
+
+        kept = _plain(messages[:head]) + summary + _plain(messages[start:])
+        with self.lock:
+            self.last = {"messages": end, "kept": len(kept), "tokens": used, "summarised": len(summary)}
+        return kept
+
+    def _summary(self, messages, head, start, used):
+        # Summarise whole blocks so the dropped prefix, and its cached summary, stays put for a while
+        cut = head + -(-(start - head) // self.block) * self.block
+        cut = min(cut, len(messages) - 1)
+        text = self._summarize(messages, head, cut)
+        if text is None:
+            # No summary (summarizer failed): the old turns are just dropped
+            return [], start, used
+        for m in messages[start:cut]:
+            used -= count_tokens(m)
+        message = {"role": "system", "content": f"Summary of the earlier conversation: {text}"}
+        n = count_tokens(message)
+        # Make room for the summary itself
+        while used + n > self.budget and cut < len(messages) - 1:
+            used -= count_tokens(messages[cut])
+            cut += 1
+        return [message], cut, used + n
+
+    def _key(self, messages, head, pos):
+        # History only ever grows at the end, so the length and the edges identify the prefix
+        first, last = messages[head], messages[pos - 1]
+        return hashlib.sha256(repr((pos - head, first["content"], last["content"])).encode()).hexdigest()
+
+    def _summarize(self, messages, head, cut):
+        """Summary of messages[head:cut]: the newest cached one, extended block by block"""
+        done, text = head, None
+        pos = cut
+        with self.lock:
+            while pos > head:
+                hit = self.summaries.get(self._key(messages, head, pos))
+                if hit is not None:
+                    done, text = pos, hit
+                    break
+                pos = head + (pos - head - 1) // self.block * self.block
+            if done < cut and time.monotonic() < self.retry_at:
+                return text
+        while done < cut:
+            end, chunk = self._chunk(messages, done, cut, text)
+            try:
+                text = self.summarizer(chunk)
+            except Exception as e:
+                # Context overflow, 413, rate limit ...: keep what we have, try again later
+                with self.lock:
+                    self.retry_at = time.monotonic() + SUMMARY_RETRY
+                    self.last_error = repr(e)
+                return text
+            done = end
+            with self.lock:
+                self.summaries[self._key(messages, head, done)] = text
+                if len(self.summaries) > MAX_SUMMARIES:
+                    self.summaries.popitem(last=False)
+        return text
+
+    def _chunk(self, messages, done, cut, text):
+        # The previous summary plus as many new blocks as fit in summary_budget, at least one
+        chunk = [{"role": "system", "content": f"Summary of the earlier conversation: {text}"}] if text else []
+        used = sum(count_tokens(m) for m in chunk)
+        end = done
+        while end < cut:
+            nxt = min(end + self.block, cut)
+            n = sum(count_tokens(m) for m in messages[end:nxt])
+            if used + n > self.summary_budget and end > done:
+                break
+            used += n
+            end = nxt
+        chunk += _plain(messages[done:end])
+        if used > self.summary_budget:
+            chunk = _capped(chunk, self.summary_budget)
+        return end, chunk
+
+
+def _capped(messages, budget):
+    # A single block over the budget: every message cut to its share, ~4 characters per token
+    chars = max(64, (budget // len(messages) - MESSAGE_OVERHEAD - 2) * 4)
+    capped = []
+    for m in messages:
+        content = m["content"] if isinstance(m["content"], str) else str(m["content"])
+        capped.append(m if len(content) <= chars else {"role": m["role"], "content": content[:chars] + " ..."})
+    return capped
+
+
+def _plain(messages):
+    # Gradio adds metadata / options keys some providers reject
+    return [{"role": m["role"], "content": m["content"]} for m in messages if m.get("content") is not None]
+
+
+def token_stats():
+    with _counts_lock:
+        hits, misses, cached = _stats["hits"], _stats["misses"], len(_counts)
+    return {"hits": hits, "misses": misses, "cached": cached}
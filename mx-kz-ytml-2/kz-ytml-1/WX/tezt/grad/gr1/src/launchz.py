@@ -0,0 +1,110 @@
+# /////////////////////////////////////////
+# launchz.py - Shared launch with a bounded queue and per provider concurrency
+# /////////////////////////////////////////
+
+# Every app used to call demo.launch() straight away: Gradio's default queue has no size
+# limit, so under load requests piled up and every waiting chat eventually hit the provider.
+# launch() turns the queue on with max_size (new requests are turned away at once with
+# "Queue is full" instead of waiting forever) and puts all chat events of an app that talk
+# to the same provider into one queue with that provider's concurrency limit, the /chat API
+# and the examples included. queue_stats() reads the live queue depth back out.
+
+# --- Imports Zone ---
+
+from rich import print as rpr
+
+# --- Vars ---
+
+# Chats running at once per provider, roughly what their free tiers take without 429s
+PROVIDER_LIMITS = {
+    "sambanova": 4,
+    "nebius": 8,
+    "groq": 8,
+    "hf-inference": 2,
+    "github": 2,
+}
+DEFAULT_LIMIT = 4  # Events without a limit of their own, echo demos and the like
+MAX_QUEUE = 64  # Waiting events before new ones are rejected
+
+
+def chat_limit(provider):
+    """concurrency_limit for the chat events (gr.ChatInterface, .click ...) that call provider"""
+    return PROVIDER_LIMITS.get(provider, DEFAULT_LIMIT)
+
+
+# --- Launch ---
+
+
+def launch(demo, provider=None, max_size=MAX_QUEUE, default_limit=DEFAULT_LIMIT, **launch_kwargs):
+    """
+    Queue and launch a Gradio app.
+
+    Parameters:
+    - demo (gr.Blocks | gr.ChatInterface): The app
+    - provider (str): Events that set their own concurrency_limit (chat_limit(provider)) share this provider's queue
+    - max_size (int): Waiting events before new ones get "Queue is full", None = unbounded
+    - default_limit (int): concurrency_limit of every other event
+    - launch_kwargs: Passed on to demo.launch()
+
+    Returns:
+    - Whatever demo.launch() returns
+    """
+    if provider:
+        for fn in demo.fns.values():
+            # Only the chat events carry an explicit limit, UI helpers keep their own queues
+            if isinstance(fn.concurrency_limit, int) and not isinstance(fn.concurrency_limit, bool):
+                fn.concurrency_id = f"provider:{provider}"
+    demo.queue(default_concurrency_limit=default_limit, max_size=max_size)
+    return demo.launch(**launch_kwargs)
+
+
+# --- Metrics ---
+
+
+def queue_stats(demo):
+    """
+    Live queue of a launched app.
+
+    Returns:
+    - dict: queued / max_size in total, and per queue: name, queued, running, limit
+    """
+    queue = getattr(demo, "_queue", None)
+    if queue is None:
+        return {"queued": 0, "max_size": None, "queues": []}
+    names = {}
+    for fn in demo.fns.values():
+        if fn.fn is not None:
+            names.setdefault(fn.concurrency_id, getattr(fn.fn, "__name__", "fn"))
+    queues = []
+    for concurrency_id, event_queue in list(queue.event_queue_per_concurrency_id.items()):
+        queues.append(
+            {
+                "name": concurrency_id if concurrency_id.startswith("provider:") else names.get(concurrency_id, concurrency_id),
+                "queued": len(event_queue.queue),
+                "running": event_queue.current_concurrency,
+                "limit": event_queue.concurrency_limit,
+            }
+        )
+    return {"queued": sum(q["queued"] for q in queues), "max_size": queue.max_size, "queues": queues}
+
+
+def queue_markdown(demo):
+    """Queue stats as Markdown, for a gr.Markdown refreshed by a gr.Timer"""
+    s = queue_stats(demo)
+    lines = [
+        f"**Queued {s['queued']} / {s['max_size'] if s['max_size'] is not None else 'unbounded'}**",
+        "",
+        "| Queue | Waiting | Running | Limit |",
+        "|---|---|---|---|",
+    ]
+    for q in s["queues"]:
+        limit = q["limit"] if q["limit"] is not None else "none"
+        lines.append(f"| {q['name']} | {q['queued']} | {q['running']} | {limit} |")
+    return "\n".join(lines)
+
+
+def brint_queue_stats(demo):
+    s = queue_stats(demo)
+    rpr(f"[cyan]Queue: {s['queued']} waiting, max size {s['max_size']}[/cyan]")
+    for q in s["queues"]:
+        rpr(f"[cyan]  {q['name']}: {q['queued']} waiting, {q['running']} running, limit {q['limit']}[/cyan]")
@@ -0,0 +1,148 @@
+# /////////////////////////////////////////
+# localai.py - Local stand-in for an OpenAI compatible chat endpoint
+# /////////////////////////////////////////
+
+# Just enough of POST /v1/chat/completions (streaming and not) to drive the chat code
+# against localhost, with injected latency: a normal first token delay plus a slow tail
+# hit on a fraction of requests, the way a busy provider behaves.
+
+# --- Imports Zone ---
+
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Vars ---
+
+REPLY = "Booty dancing is a rhythmic hip and lower body dance style popular in hip hop and dancehall clubs ."
+
+
+class LocalAI:
+    """
+    Stand-in server on a free localhost port, runs until stop().
+
+    Parameters:
+    - first_token (float): Seconds before the first chunk
+    - jitter (float): Random extra seconds added to first_token, up to this much
+    - tail_rate (float): Fraction of requests hit by the slow tail
+    - tail_delay (float): Extra seconds before the first chunk for those
+    - token_delay (float): Seconds between chunks
+    - error_rate (float): Fraction of requests answered with a 500
+    - seed (int): Seed of the latency draws, for repeatable runs
+    """
+
+    def __init__(
+        self,
+        first_token=0.05,
+        jitter=0.02,
+        tail_rate=0.0,
+        tail_delay=1.0,
+        token_delay=0.002,
+        error_rate=0.0,
+        reply=REPLY,
+        seed=None,
+    ):
+        self.first_token = first_token
+        self.jitter = jitter
+        self.tail_rate = tail_rate
+        self.tail_delay = tail_delay
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.words = reply.split()
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.requests = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def draw(self):
+        """(first token delay, fail) for the next request"""
+        with self.random_lock:
+            self.requests += 1
+            delay = self.first_token + self.random.random() * self.jitter
+            if self.random.random() < self.tail_rate:
+                delay += self.tail_delay
+            return delay, self.random.random() < self.error_rate
+
+    def _handler(self):
+        ai = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                delay, fail = ai.draw()
+                time.sleep(delay)
+                if fail:
+                    return self.send_json({"error": {"message": "stand-in failure", "type": "server_error"}}, 500)
+                if body.get("stream"):
+                    return self.send_stream(body.get("model", "local"))
+                return self.send_json(ai.completion(body.get("model", "local")))
+
+            def send_json(self, data, status=200):
+                raw = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def send_stream(self, model):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for chunk in ai.chunks(model):
+                        self.write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+                        time.sleep(ai.token_delay)
+                    self.write_chunk(b"data: [DONE]\n\n")
+                    self.write_chunk(b"")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client hung up, e.g. a cancelled hedge
+                self.close_connection = True
+
+            def write_chunk(self, data):
+                self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+    def completion(self, model):
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": " ".join(self.words)}, "finish_reason": "stop"}
+            ],
+            "usage": {"prompt_tokens": 10, "completion_tokens": len(self.words), "total_tokens": 10 + len(self.words)},
+        }
+
+    def chunks(self, model):
+        cid = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        base = {"id": cid, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+        for i, word in enumerate(self.words):
+            delta = {"content": word if i == 0 else " " + word}
+            if i == 0:
+                delta["role"] = "assistant"
+            yield {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+        yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
@@ -7,9 +7,14 @@ import os
 
 import gradio as gr
 from dotenv import load_dotenv
-from openai import OpenAI
 from rich import print
 
+from src.clientz import get_async_client, get_client
+from src.flightz import single_flight
+from src.hedgez import hedged_stream, make_routes
+from src.historyz import HistoryManager, llm_summarizer
+from src.launchz import chat_limit, launch, queue_markdown
+from src.streamz import agradio_stream, atext_deltas, coalesce, gradio_stream, stats_markdown, text_deltas
 from src.utz import header1
 
 # --- Global Vars ---
@@ -38,6 +43,7 @@ def sam_main():
     # ass_print()
     # sam_chat1()
     sam_chat2()
+    # sam_chat3()
 
 # --- Sub Functions ---
 
@@ -54,22 +60,21 @@ def ass_print():
 def sam_chat1():
     header1("Sam Chat Test 1")
 
-    client = OpenAI(
-        base_url="https://api.sambanova.ai/v1",
-        api_key=SA_T
-    )
+    # Pooled client, its requests wait on SambaNova's rate limit (ratez.py)
+    client = get_client("openai", "https://api.sambanova.ai/v1", SA_T)
+    # Only what fits the context window goes upstream, older turns get summarised
+    model = "Meta-Llama-3.2-1B-Instruct"
+    history_mgr = HistoryManager(model, summarizer=llm_summarizer(client, model))
 
     def predict(message, history):
         history.append({"role": "user", "content": message})
         stream = client.chat.completions.create(
-            model="Meta-Llama-3.2-1B-Instruct",
-            messages=history,
+            model=model,
+            messages=history_mgr.fit(history),
             stream=True
         )
-        chunks = []
-        for chunk in stream:
-            chunks.append(chunk.choices[0].delta.content or "")
-            yield "".join(chunks)
+        # Chunks batched every 50 ms / 256 characters, sent on once 2% of the answer is new (streamz.py)
+        yield from gradio_stream(coalesce(text_deltas(stream)))
 
     panty = gr.ChatInterface(
         predict,
@@ -99,23 +104,31 @@ def sam_chat2():
     def intr_tab():
         gr.Markdown(intro_txt)
 
+    def stats_tab():
+        # Update rate of the streaming chats (streamz.py) and the Gradio queue (launchz.py)
+        def stats_md():
+            return stats_markdown() + "\n\n" + queue_markdown(pty)
+
+        stats = gr.Markdown(stats_markdown())
+        gr.Timer(2.0).tick(stats_md, outputs=stats)
+
     def chat_func():
-        client = OpenAI(
-            base_url="https://api.sambanova.ai/v1",
-            api_key=SA_T
-        )
+        # Pooled client, its requests wait on SambaNova's rate limit (ratez.py)
+        client = get_client("openai", "https://api.sambanova.ai/v1", SA_T)
+
+        # True = Llama 3.1 8B on SambaNova, raced against Nebius / Groq / HF when it is slow to start (hedgez.py)
+        hedge = False
+        routes = make_routes() if hedge else []
 
         def predict(message, history):
             history.append({"role": "user", "content": message})
-            stream = client.chat.completions.create(
-                model="Meta-Llama-3.2-1B-Instruct",
-                messages=history,
-                stream=True
-            )
-            chunks = []
-            for chunk in stream:
-                chunks.append(chunk.choices[0].delta.content or "")
-                yield "".join(chunks)
+            if hedge:
+                yield from gradio_stream(coalesce(hedged_stream(history, routes=routes)))
+                return
+            # Same example clicked by several users at once = one upstream stream,
+            # its chunks batched every 50 ms / 256 characters, sent on once 2% of the answer is new
+            deltas = single_flight(client, model="Meta-Llama-3.2-1B-Instruct", messages=history)
+            yield from gradio_stream(coalesce(deltas))
 
         panty = gr.ChatInterface(
             predict,
@@ -131,6 +144,7 @@ def sam_chat2():
             description="Chat with Samova",
             type="messages",
             flagging_mode="manual",
+            concurrency_limit=chat_limit("sambanova"),
         )
 
     with gr.Blocks(
@@ -144,6 +158,41 @@ def sam_chat2():
         with gr.Tab("Chat"):
             chat_func()
 
-    pty.launch(
-        show_error=True
+        with gr.Tab("Stats"):
+            stats_tab()
+
+    # Bounded queue, at most chat_limit("sambanova") chats upstream at once
+    launch(pty, provider="sambanova", show_error=True)
+
+
+# sam_chat1 as an async handler: AsyncOpenAI streams on the event loop, no worker thread per chat
+
+def sam_chat3():
+    header1("Sam Chat Test 3 - Async")
+
+    model = "Meta-Llama-3.2-1B-Instruct"
+    # No summarizer: it would call the model synchronously and stall the loop, older turns are dropped
+    history_mgr = HistoryManager(model)
+
+    async def predict(message, history):
+        history.append({"role": "user", "content": message})
+        client = get_async_client("openai", "https://api.sambanova.ai/v1", SA_T)
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=history_mgr.fit(history),
+            stream=True
+        )
+        async for text in agradio_stream(atext_deltas(stream)):
+            yield text
+
+    panty = gr.ChatInterface(
+        predict,
+        title="Samova Chatbot",
+        description="Chat with Samova",
+        type="messages",
+        flagging_mode="manual",
+        # Async: waiting chats cost no worker thread, the provider's pace is kept by ratez.py
+        concurrency_limit=None,
     )
+
+    launch(panty, show_error=True)
@@ -7,10 +7,11 @@
 import os
 
 from dotenv import load_dotenv
-from groq import Groq
 from rich import inspect as rich_inspect
 from rich import print as rpr
 
+from .cachez import brint_cache_stats, cached_completion
+from .clientz import get_client
 from .outz import save_output_to_markdown
 from .utz import header1
 
@@ -26,6 +27,7 @@ gq_t = os.getenv("GQ")
 def gq1_main():
     # env_test()
     gq1_chat1()
+    brint_cache_stats()
 
 
 ### Sub Funtions ###
@@ -40,11 +42,10 @@ def env_test():
 def gq1_chat1():
     header1("Chat1 - Testing examples from docs")
 
-    client = Groq(
-        api_key=os.environ.get("GQ"),
-    )
+    client = get_client("groq", token=os.environ.get("GQ"))
 
-    chat_completion = client.chat.completions.create(
+    chat_completion = cached_completion(
+        client,
         messages=[
             {
                 "role": "user",
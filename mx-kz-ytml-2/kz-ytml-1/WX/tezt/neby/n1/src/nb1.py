@@ -7,11 +7,12 @@
 import os
 
 from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
-from openai import OpenAI
 from rich import print as rpr
 from rich.pretty import pprint as ppr
 
+from .cachez import brint_cache_stats, cached_completion
+from .catalogz import load_catalog, print_catalog
+from .clientz import get_client
 from .utz import header1
 from .wm import save_to_markdown
 
@@ -30,7 +31,9 @@ modelz = [
 def nb1_main():
     # brint_env()
     # nb_test1()
+    # nb_modelz()
     nb_hf_1()
+    brint_cache_stats()
 
 
 # --- Sub functions ---
@@ -40,6 +43,21 @@ def brint_env():
     header1("Ass Stuff")
     rpr(NB_T)
 
+# Model catalog, cached on disk and revalidated with ETag / If-Modified-Since
+
+
+def nb_modelz():
+    header1("Neby Model Catalog")
+
+    catalog = load_catalog("nebius", token=NB_T)
+    print_catalog(catalog)
+
+    # modelz is hand copied, flag picks the provider no longer serves
+    for m in modelz:
+        if m not in catalog:
+            rpr(f"[red]{m} is not in the Nebius catalog[/red]")
+    return catalog
+
 # API Tezta
 
 
@@ -49,12 +67,10 @@ def nb_test1():
     endpoint = "https://api.studio.nebius.com/v1"
     question = "Describe booty dancing"
 
-    client = OpenAI(
-        base_url=endpoint,
-        api_key=NB_T
-    )
+    client = get_client("openai", endpoint, NB_T)
 
-    completion = client.chat.completions.create(
+    completion = cached_completion(
+        client,
         model=modelz[1],
         messages=[
             {
@@ -93,10 +109,7 @@ def nb_hf_1():
     use_model = modelz[0]
     quez = "Describe booty dancing"
 
-    client = InferenceClient(
-        provider="nebius",
-        api_key=NB_T
-    )
+    client = get_client("nebius", token=NB_T)
 
     messages = [
         {
@@ -109,7 +122,8 @@ def nb_hf_1():
         }
     ]
 
-    comp = client.chat.completions.create(
+    comp = cached_completion(
+        client,
         model=use_model,
         messages=messages,
         max_tokens=1000
@@ -8,9 +8,13 @@ import os
 
 import gradio as gr
 from dotenv import load_dotenv
-from openai import OpenAI
 from rich import print as rpr
 
+from .clientz import get_client
+from .flightz import single_flight
+from .historyz import HistoryManager, llm_summarizer
+from .launchz import chat_limit, launch, queue_markdown
+from .streamz import coalesce, gradio_stream, stats_markdown
 from .utz import header1
 
 # --- Global Vars ---
@@ -68,23 +72,25 @@ def nb_hfgra_1():
     def intr_tab():
         gr.Markdown(intro_txt)
 
+    def stats_tab():
+        # Update rate of the streaming chats (streamz.py) and the Gradio queue (launchz.py)
+        def stats_md():
+            return stats_markdown() + "\n\n" + queue_markdown(pty)
+
+        stats = gr.Markdown(stats_markdown())
+        gr.Timer(2.0).tick(stats_md, outputs=stats)
+
     def chat_func():
-        client = OpenAI(
-            base_url="https://api.studio.nebius.com/v1",
-            api_key=NB_T
-        )
+        client = get_client("openai", "https://api.studio.nebius.com/v1", NB_T)
+        # Only what fits the context window goes upstream, older turns get summarised
+        history_mgr = HistoryManager(modelz[0], summarizer=llm_summarizer(client, modelz[0]))
 
         def predict(message, history):
             history.append({"role": "user", "content": message})
-            stream = client.chat.completions.create(
-                model=modelz[0],
-                messages=history,
-                stream=True
-            )
-            chunks = []
-            for chunk in stream:
-                chunks.append(chunk.choices[0].delta.content or "")
-                yield "".join(chunks)
+            # Same example clicked by several users at once = one upstream stream
+            # Its chunks batched every 50 ms / 256 characters, sent on once 2% of the answer is new (streamz.py)
+            deltas = single_flight(client, model=modelz[0], messages=history_mgr.fit(history))
+            yield from gradio_stream(coalesce(deltas))
 
         panty = gr.ChatInterface(
             predict,
@@ -100,6 +106,7 @@ def nb_hfgra_1():
             description="Chat with Samova",
             type="messages",
             flagging_mode="manual",
+            concurrency_limit=chat_limit("nebius"),
         )
 
     with gr.Blocks(
@@ -113,6 +120,8 @@ def nb_hfgra_1():
         with gr.Tab("Chat"):
             chat_func()
 
-    pty.launch(
-        show_error=True
-    )
+        with gr.Tab("Stats"):
+            stats_tab()
+
+    # Bounded queue, at most chat_limit("nebius") chats upstream at once
+    launch(pty, provider="nebius", show_error=True)
@@ -0,0 +1,275 @@
+# /////////////////////////////////////////
+# catalogz.py - Cached provider model catalogs
+# /////////////////////////////////////////
+
+# Each provider's model list is kept on disk (.cache/catalog/<provider>.json) with the
+# ETag / Last-Modified it came with. Within the TTL it is read straight from disk; after
+# that it is revalidated with If-None-Match / If-Modified-Since, so an unchanged list
+# costs a 304 instead of the whole catalog. startup_ids() never waits on the network:
+# it returns what is on disk (or the fallback list) and refreshes in the background.
+
+# --- Imports Zone ---
+
+import bisect
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+from rich.table import Table
+
+from .utz import console
+
+# --- Vars ---
+
+CATALOG_DIR = os.getenv("CATALOG_CACHE_DIR", ".cache/catalog")
+TTL = 24 * 3600  # Seconds a catalog is used without asking the provider
+
+# provider -> (url, extra headers)
+CATALOGS = {
+    "github": ("https://models.github.ai/catalog/models", {"Accept": "application/vnd.github+json"}),
+    "sambanova": ("https://api.sambanova.ai/v1/models", {}),
+    "nebius": ("https://api.studio.nebius.com/v1/models?verbose=true", {}),
+    "hf": ("https://router.huggingface.co/v1/models", {}),
+}
+
+
+# --- Index ---
+
+
+@dataclass(frozen=True)
+class ModelInfo:
+    id: str
+    provider: str
+    name: str = ""
+    publisher: str = ""
+    context_length: int = 0  # 0 = the provider does not say
+    max_output: int = 0
+    capabilities: frozenset = field(default_factory=frozenset)
+
+
+def _github_model(m):
+    caps = set(m.get("capabilities") or [])
+    if "embeddings" in (m.get("supported_output_modalities") or []):
+        caps.add("embeddings")
+    else:
+        caps.add("chat")
+    if "image" in (m.get("supported_input_modalities") or []):
+        caps.add("vision")
+    limits = m.get("limits") or {}
+    return ModelInfo(
+        id=m["id"],
+        provider="github",
+        name=m.get("name", ""),
+        publisher=m.get("publisher", ""),
+        context_length=limits.get("max_input_tokens") or 0,
+        max_output=limits.get("max_output_tokens") or 0,
+        capabilities=frozenset(caps),
+    )
+
+
+def _openai_model(provider, m):
+    # OpenAI style /v1/models, context fields only on the providers that add them.
+    # The HF router lists them per inference provider, the largest one counts
+    routed = [p.get("context_length") or 0 for p in m.get("providers") or []]
+    caps = {"embeddings"} if "embed" in m["id"].lower() else {"chat"}
+    if any(v in m["id"].lower() for v in ("vision", "-vl", "llava")):
+        caps.add("vision")
+    return ModelInfo(
+        id=m["id"],
+        provider=provider,
+        name=m["id"].split("/")[-1],
+        publisher=m.get("owned_by", ""),
+        context_length=m.get("context_length") or m.get("context_window") or max(routed, default=0),
+        max_output=m.get("max_completion_tokens") or 0,
+        capabilities=frozenset(caps),
+    )
+
+
+def parse_models(provider, data):
+    if provider == "github":
+        return [_github_model(m) for m in data]
+    return [_openai_model(provider, m) for m in data.get("data", [])]
+
+
+class Catalog:
+    """
+    In memory index of one provider's models.
+
+    Parameters:
+    - provider (str): Key of CATALOGS
+    - models (list[ModelInfo]): Catalog entries, provider order kept
+    - data (list | dict): The provider's JSON as downloaded
+    - source (str): Where it came from: "disk", "304", "200" or "stale"
+    - fetched (float): Time of the last download or revalidation
+    """
+
+    def __init__(self, provider, models, data=None, source="disk", fetched=0.0):
+        self.provider = provider
+        self.models = models
+        self.data = data
+        self.source = source
+        self.fetched = fetched
+        self.by_id = {m.id: m for m in models}
+        self.by_capability = defaultdict(list)
+        for m in models:
+            for cap in m.capabilities:
+                self.by_capability[cap].append(m)
+        self._by_context = sorted(models, key=lambda m: m.context_length)
+        self._context_keys = [m.context_length for m in self._by_context]
+
+    def __len__(self):
+        return len(self.models)
+
+    def __contains__(self, model_id):
+        return model_id in self.by_id
+
+    def get(self, model_id):
+        return self.by_id.get(model_id)
+
+    def ids(self, capability=None):
+        models = self.models if capability is None else self.by_capability.get(capability, [])
+        return [m.id for m in models]
+
+    def with_capability(self, capability):
+        return list(self.by_capability.get(capability, []))
+
+    def min_context(self, tokens):
+        """Models with a context window of at least tokens, smallest first"""
+        return self._by_context[bisect.bisect_left(self._context_keys, tokens):]
+
+
+# --- Disk cache ---
+
+
+def _path(provider):
+    return os.path.join(CATALOG_DIR, f"{provider}.json")
+
+
+def _read(provider):
+    try:
+        with open(_path(provider), encoding="utf8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(provider, entry):
+    os.makedirs(CATALOG_DIR, exist_ok=True)
+    tmp = _path(provider) + ".tmp"
+    with open(tmp, "w", encoding="utf8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp, _path(provider))  # Readers never see half a file
+
+
+def _catalog(provider, entry, source):
+    return Catalog(provider, parse_models(provider, entry["data"]), entry["data"], source, entry["fetched"])
+
+
+def cached_catalog(provider):
+    """The catalog on disk whatever its age, None if there is none. Never touches the network"""
+    entry = _read(provider)
+    return _catalog(provider, entry, "disk") if entry else None
+
+
+_fetch_lock = threading.Lock()
+
+
+def load_catalog(provider, token=None, ttl=TTL, refresh=False, timeout=30.0):
+    """
+    A provider's catalog, from disk while fresh, otherwise revalidated or downloaded.
+
+    Parameters:
+    - provider (str): Key of CATALOGS
+    - token (str): API key sent as a Bearer token
+    - ttl (float): Seconds the disk copy is trusted without asking
+    - refresh (bool): Revalidate even inside the TTL
+    - timeout (float): Seconds before the request gives up, the disk copy is used then
+
+    Returns:
+    - Catalog: With source "disk", "304", "200" or "stale" (network failed, old copy used)
+    """
+    with _fetch_lock:
+        entry = _read(provider)
+        if entry and not refresh and time.time() - entry["fetched"] < ttl:
+            return _catalog(provider, entry, "disk")
+
+        url, extra = CATALOGS[provider]
+        headers = dict(extra)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = httpx.get(url, headers=headers, timeout=timeout)
+        except httpx.HTTPError:
+            if entry:
+                return _catalog(provider, entry, "stale")
+            raise
+
+        if response.status_code == 304 and entry:
+            entry["fetched"] = time.time()
+            _write(provider, entry)
+            return _catalog(provider, entry, "304")
+        if response.status_code != 200:
+            if entry:
+                return _catalog(provider, entry, "stale")
+            response.raise_for_status()
+
+        entry = {
+            "url": url,
+            "fetched": time.time(),
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "data": response.json(),
+        }
+        _write(provider, entry)
+        return _catalog(provider, entry, "200")
+
+
+def startup_ids(provider, fallback, token=None, capability="chat", ttl=TTL):
+    """
+    Model ids for choices at import time, without waiting on the network.
+
+    The disk copy is used whatever its age (the fallback list when there is none yet),
+    and a stale or missing one is refreshed in the background for the next start.
+    """
+    entry = _read(provider)
+    if not entry or time.time() - entry["fetched"] >= ttl:
+        threading.Thread(
+            target=_refresh_quietly, args=(provider, token, ttl), name=f"catalog-{provider}", daemon=True
+        ).start()
+    if not entry:
+        return list(fallback)
+    return _catalog(provider, entry, "disk").ids(capability) or list(fallback)
+
+
+def _refresh_quietly(provider, token, ttl):
+    try:
+        load_catalog(provider, token=token, ttl=ttl)
+    except Exception:
+        pass  # Offline, the fallback list keeps working
+
+
+def print_catalog(catalog, title=None):
+    table = Table(title=title or f"{catalog.provider} models ({len(catalog)}, {catalog.source})", border_style="magenta")
+    table.add_column("Model", style="cyan")
+    table.add_column("Publisher")
+    table.add_column("Context", justify="right")
+    table.add_column("Max out", justify="right")
+    table.add_column("Capabilities")
+    for m in catalog.models:
+        table.add_row(
+            m.id,
+            m.publisher,
+            f"{m.context_length:,}" if m.context_length else "-",
+            f"{m.max_output:,}" if m.max_output else "-",
+            ", ".join(sorted(m.capabilities)),
+        )
+    console.print(table)
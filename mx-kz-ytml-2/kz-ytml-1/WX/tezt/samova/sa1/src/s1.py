@@ -6,12 +6,13 @@
 
 import os
 
-import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
 from rich import print as rpr
 from rich.pretty import pprint
 
+from .cachez import brint_cache_stats, cached_completion
+from .catalogz import load_catalog, print_catalog
+from .clientz import get_client
 from .utz import header1
 from .wm import save_to_markdown
 
@@ -26,6 +27,7 @@ def s1_file():
     # print_envz()
     # get_modelz()
     test_model_output()
+    brint_cache_stats()
 
 # === Sub Functions ===
 
@@ -42,25 +44,20 @@ def print_envz():
 def get_modelz():
     header1("Quickstart Code from Docs")
 
-    # Define the API endpoint
-    url = "https://api.sambanova.ai/v1/models"
+    # Cached on disk, revalidated with ETag / If-Modified-Since once the TTL is up
+    catalog = load_catalog("sambanova", token=SA_T)
+    print_catalog(catalog)
 
-    # Make a synchronous GET request
-    with httpx.Client() as client:
-        resp = client.get(url)
-
-        # Check if the request succeeded
-        if resp.status_code == 200:
-            model_names = [model["id"] for model in resp.json()["data"]]
-            pprint(model_names)  # Parse JSON resp
-            save_to_markdown(
-                model_names,
-                prefix="model_names",
-                directory="rez"
-            )
-        else:
-            rpr(f"Error: {resp.status_code}")
-            rpr(resp.text)  # Print raw response if error
+    # Only a changed list is worth a new file
+    if catalog.source == "200":
+        model_names = catalog.ids()
+        pprint(model_names)
+        save_to_markdown(
+            model_names,
+            prefix="model_names",
+            directory="rez"
+        )
+    return catalog
 
 
 # Testing model output , from smbanova the cheapest one is Meta-Llama-3.2-3B-Instruct
@@ -68,12 +65,10 @@ def get_modelz():
 def test_model_output():
     header1("Test Model Output - Cheapest one is Meta-Llama-3.2-3B-Instruct")
 
-    client = OpenAI(
-        base_url="https://api.sambanova.ai/v1",
-        api_key=SA_T,
-    )
+    client = get_client("openai", "https://api.sambanova.ai/v1", SA_T)
 
-    completion = client.chat.completions.create(
+    completion = cached_completion(
+        client,
         model="Meta-Llama-3.2-3B-Instruct",
         messages=[
             {"role": "system",
@@ -0,0 +1,151 @@
+# /////////////////////////////////////////
+# flightz.py - Single flight for identical streaming chat requests
+# /////////////////////////////////////////
+
+# When several users fire the same (endpoint, model, messages, params) request at the
+# same time, e.g. clicking the same Gradio example, only the first one goes upstream.
+# Everyone else subscribes to that stream: they get the text received so far replayed,
+# then the rest live. The upstream call stops early only when every subscriber has left.
+# Nothing is kept once the stream ends, this is not a cache (see cachez.py for that).
+
+# --- Imports Zone ---
+
+import hashlib
+import json
+import threading
+
+from rich import print as rpr
+
+# --- Vars ---
+
+_flights = {}
+_lock = threading.Lock()
+_stats = {"upstream": 0, "subscribers": 0}
+
+
+# --- Flights ---
+
+
+class Flight:
+    """One upstream stream and the text deltas it produced so far"""
+
+    def __init__(self, key):
+        self.key = key
+        self.deltas = []
+        self.finished = False
+        self.error = None
+        self.subscribers = 0
+        self.stream = None
+        self.cond = threading.Condition()
+
+    def close_stream(self):
+        stream, self.stream = self.stream, None
+        close = getattr(stream, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+
+def make_key(client, params):
+    # The provider the client talks to, never its token
+    endpoint = f"{type(client).__name__}:{getattr(client, 'base_url', None) or getattr(client, 'provider', None)}"
+    blob = json.dumps({"endpoint": endpoint, **params}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def _pump(flight, client, params):
+    # Runs in its own thread so the stream outlives whichever subscriber started it
+    try:
+        flight.stream = client.chat.completions.create(stream=True, **params)
+        for chunk in flight.stream:
+            if flight.subscribers == 0:
+                break  # Everyone left
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                with flight.cond:
+                    flight.deltas.append(text)
+                    flight.cond.notify_all()
+    except Exception as e:
+        flight.error = e
+    finally:
+        flight.close_stream()
+        with _lock:
+            if _flights.get(flight.key) is flight:
+                del _flights[flight.key]
+        with flight.cond:
+            flight.finished = True
+            flight.cond.notify_all()
+
+
+def single_flight(client, **params):
+    """
+    client.chat.completions.create(stream=True, **params), shared with identical requests in flight.
+
+    Parameters:
+    - client (OpenAI | InferenceClient): Any client with the OpenAI chat completions API
+    - **params: model, messages, temperature ... (stream is always on)
+
+    Returns:
+    - Iterator[str]: Text deltas of the reply, from the start for every subscriber
+    """
+    params.pop("stream", None)
+    key = make_key(client, params)
+    with _lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = Flight(key)
+            _stats["upstream"] += 1
+        flight.subscribers += 1
+        _stats["subscribers"] += 1
+    if leader:
+        threading.Thread(target=_pump, args=(flight, client, params), name="single-flight", daemon=True).start()
+
+    seen = 0
+    try:
+        while True:
+            with flight.cond:
+                while seen == len(flight.deltas) and not flight.finished:
+                    flight.cond.wait()
+                new = flight.deltas[seen:]
+                finished = flight.finished
+            seen += len(new)
+            # Yield outside the lock, a slow subscriber never holds up the others
+            yield from new
+            if finished and seen == len(flight.deltas):
+                if flight.error is not None:
+                    raise flight.error
+                return
+    finally:
+        with _lock:
+            flight.subscribers -= 1
+            abandoned = flight.subscribers == 0 and not flight.finished
+            # A flight nobody listens to any more must not pick up new subscribers
+            if abandoned and _flights.get(key) is flight:
+                del _flights[key]
+        if abandoned:
+            flight.close_stream()
+
+
+def flight_stats():
+    with _lock:
+        upstream, subscribers = _stats["upstream"], _stats["subscribers"]
+        in_flight = len(_flights)
+    return {
+        "upstream": upstream,
+        "subscribers": subscribers,
+        "coalesced": subscribers - upstream,
+        "in_flight": in_flight,
+    }
+
+
+def brint_flight_stats():
+    s = flight_stats()
+    rpr(
+        f"[cyan]Single flight: {s['subscribers']} requests, {s['upstream']} upstream calls, "
+        f"{s['coalesced']} coalesced, {s['in_flight']} in flight[/cyan]"
+    )
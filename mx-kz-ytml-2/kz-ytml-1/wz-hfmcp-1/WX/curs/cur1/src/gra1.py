@@ -4,13 +4,18 @@
 
 # --- Imports ---
 
+import asyncio
 import os
-import time
 
 import gradio as gr
 from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
 
+from src.clientz import get_async_client, get_client
+from src.flightz import single_flight
+from src.historyz import HistoryManager, llm_summarizer
+from src.launchz import chat_limit, launch
+from src.sessionz import Sessions
+from src.streamz import agradio_stream, atext_deltas, gradio_stream, text_deltas
 from src.utz import header1
 
 # -- Get the HF Token ---
@@ -27,6 +32,7 @@ def gra1_main():
     # gra1_chat3()
     # gra1_chat4()
     gra1_chat5()
+    # gra1_chat6()
 
 
 # -- Sub functions call ---
@@ -52,9 +58,10 @@ def gra1_chat2():
     header1("Chat Interface Two - Streaming Chatbot interface")
 
     # Main Function in the chat interface
-    def slow_echo(message, history):
+    # Async generator: every character waits on the event loop, not in a worker thread
+    async def slow_echo(message, history):
         for i in range(len(message)):
-            time.sleep(0.05)
+            await asyncio.sleep(0.05)
             yield "You Fucked " + message[: i + 1]
 
     demo = gr.ChatInterface(
@@ -65,9 +72,10 @@ def gra1_chat2():
         examples=["Smell Pussy", "Lick Ass", "Smell Fart"],
         flagging_options=["Like", "Spam", "Inappropriate", "Other"],
         save_history=True,
+        concurrency_limit=None,  # Async, so every session echoes at once instead of in line
     )
 
-    demo.launch()
+    launch(demo)
 
 
 # --- Getting the HF Api responses in gradio chat interface This method works ---
@@ -82,12 +90,10 @@ def gra1_chat3():
         "meta-llama/Llama-3.3-70B-Instruct"
     ]
 
-    def apichat(message, history):
-        client = InferenceClient(
-            provider="hf-inference",
-            api_key=hf_token,
-        )
+    # Shared pooled client, not rebuilt for every message
+    client = get_client("hf-inference", token=hf_token)
 
+    def apichat(message, history):
         completion = client.chat.completions.create(
             model=modelz[0],
             messages=[
@@ -113,6 +119,7 @@ def gra1_chat3():
 # --- hf Chat with streaming and best practices
 def gra1_chat4():
     model = "mistralai/Mistral-7B-Instruct-v0.3"
+    client = get_client("hf-inference", token=hf_token)
 
     def apichat(message, history):
         # Build messages in OpenAI format
@@ -122,11 +129,6 @@ def gra1_chat4():
             messages.append({"role": "assistant", "content": bot_reply})
         messages.append({"role": "user", "content": message})
 
-        client = InferenceClient(
-            provider="hf-inference",
-            api_key=hf_token,
-        )
-
         # Generate streamed response
         stream = client.chat.completions.create(
             model=model,
@@ -134,12 +136,7 @@ def gra1_chat4():
             stream=True
         )
 
-        partial_message = ""
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                token = chunk.choices[0].delta.content
-                partial_message += token
-                yield partial_message
+        yield from gradio_stream(text_deltas(stream))
 
     # Create chat interface with proper configuration
     demo = gr.ChatInterface(
@@ -160,44 +157,56 @@ def gra1_chat4():
 
 def gra1_chat5():
     model = "mistralai/Mistral-7B-Instruct-v0.3"
+    client = get_client("hf-inference", token=hf_token)
+    # Newest turns that fit the context window, older ones summarised by the model itself
+    history_mgr = HistoryManager(model, summarizer=llm_summarizer(client, model))
+    # Already alternation correct messages per browser session, see sessionz.py
+    sessions = Sessions()
 
-    def apichat(message, history):
-        # Start with the user's current message
-        messages = [{"role": "user", "content": message}]
-
-        # Iterate over history and add messages to the list in reverse order
-        for item in reversed(history):
-            if isinstance(item, dict) and 'role' in item and 'content' in item:
-                messages.insert(0, item)
-
-        # Ensure the messages alternate correctly
-        corrected_messages = []
-        for i, msg in enumerate(messages):
-            if i == 0:
-                corrected_messages.append(msg)
-            else:
-                # Ensure alternation between user and assistant
-                if corrected_messages[-1]["role"] != msg["role"]:
-                    corrected_messages.append(msg)
-
-        client = InferenceClient(
-            provider="hf-inference",
-            api_key=hf_token,
-        )
+    def apichat(message, history, request: gr.Request):
+        # Only the turns added since the last message get normalised, O(1) per turn
+        messages = sessions.get(request).turn(message, history)
+        corrected_messages = history_mgr.fit(messages)
 
-        # Generate streamed response
-        stream = client.chat.completions.create(
+        # Generate streamed response, shared with identical requests already running
+        yield from gradio_stream(single_flight(client, model=model, messages=corrected_messages))
+
+    demo = gr.ChatInterface(
+        apichat,
+        title=model,
+        description=f"Chat with {model}",
+        examples=["Tell me a joke",
+                  "How do I learn Python?", "Explain gravity"],
+        flagging_mode="manual",
+        flagging_options=["Helpful", "Spam", "Inappropriate", "Other"],
+        type="messages",
+        concurrency_limit=chat_limit("hf-inference"),
+    )
+
+    # Bounded queue, at most chat_limit("hf-inference") chats upstream at once
+    launch(demo, provider="hf-inference")
+
+
+# --- Same chat as gra1_chat5, async: AsyncInferenceClient on the event loop, no worker thread per chat
+
+
+def gra1_chat6():
+    model = "mistralai/Mistral-7B-Instruct-v0.3"
+    # No summarizer: it would call the model synchronously and stall the loop, older turns are dropped
+    history_mgr = HistoryManager(model)
+    sessions = Sessions()
+
+    async def apichat(message, history, request: gr.Request):
+        messages = sessions.get(request).turn(message, history)
+        client = get_async_client("hf-inference", token=hf_token)
+
+        stream = await client.chat.completions.create(
             model=model,
-            messages=corrected_messages,
+            messages=history_mgr.fit(messages),
             stream=True
         )
-
-        partial_message = ""
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                token = chunk.choices[0].delta.content
-                partial_message += token
-                yield partial_message
+        async for text in agradio_stream(atext_deltas(stream)):
+            yield text
 
     demo = gr.ChatInterface(
         apichat,
@@ -208,6 +217,8 @@ def gra1_chat5():
         flagging_mode="manual",
         flagging_options=["Helpful", "Spam", "Inappropriate", "Other"],
         type="messages",
+        # Async: waiting chats cost no worker thread, the provider's pace is kept by ratez.py
+        concurrency_limit=None,
     )
 
-    demo.launch()
+    launch(demo)
@@ -8,8 +8,11 @@ import os
 
 import gradio as gr
 from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
 
+from .clientz import get_client
+from .historyz import HistoryManager, llm_summarizer
+from .launchz import chat_limit, launch
+from .streamz import gradio_stream, text_deltas
 from .utz import header1
 
 # --- Getting th api keys ---
@@ -36,23 +39,22 @@ modelz = [
 def gra2_chat1():
     header1("Testing HF API and Models")
 
-    client = InferenceClient(
-        provider="hf-inference",
-        api_key=hf_token,
-    )
+    client = get_client("hf-inference", token=hf_token)
+    # Only what fits the context window goes upstream, older turns get summarised
+    history_mgr = HistoryManager(modelz[0], summarizer=llm_summarizer(client, modelz[0]))
 
     def predict(message, history):
         history.append({"role": "user", "content": message})
 
         stream = client.chat.completions.create(
-            messages=history, model=modelz[0], stream=True)
-        chunks = []
+            messages=history_mgr.fit(history), model=modelz[0], stream=True)
 
-        for chunk in stream:
-            chunks.append(chunk.choices[0].delta.content or "")
-            yield "".join(chunks)
+        # Deltas into a growable buffer, the full text only rebuilt when the UI gets an update
+        yield from gradio_stream(text_deltas(stream))
 
     demo = gr.ChatInterface(predict, type="messages", save_history=True,
-                            title="Chat with " + modelz[0])
+                            title="Chat with " + modelz[0],
+                            concurrency_limit=chat_limit("hf-inference"))
 
-    demo.launch()
+    # Bounded queue, at most chat_limit("hf-inference") chats upstream at once
+    launch(demo, provider="hf-inference")
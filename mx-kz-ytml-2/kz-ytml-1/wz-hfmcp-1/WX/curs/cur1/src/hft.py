@@ -5,9 +5,9 @@
 import os
 
 from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
 from rich import print as rprint  # For rprinting
 
+from src.clientz import get_client
 from src.utz import header1
 
 # -- Main entry Function ---
@@ -29,10 +29,7 @@ def hfa1_main():
 def hf1():
     header1("HuggingFace API")
 
-    client = InferenceClient(
-        provider="hf-inference",
-        api_key=hf_token,
-    )
+    client = get_client("hf-inference", token=hf_token)
 
     completion = client.chat.completions.create(
         model="meta-llama/Llama-3.1-8B-Instruct",
@@ -0,0 +1,99 @@
+# /////////////////////////////////////////
+# sessionbench.py - Message building cost per turn, rebuild vs incremental
+# /////////////////////////////////////////
+
+# Plays a 1k turn conversation through the old gra1_chat5 message building
+# (insert(0) in a reversed loop + alternation repair over everything) and through
+# sessionz.Conversation, and times a single turn at several history lengths.
+# Run: uv run python -m src.sessionbench
+
+# --- Imports ---
+
+import time
+
+from rich.table import Table
+
+from .sessionz import Conversation
+from .utz import console, header1
+
+TURNS = 1_000
+CHECKPOINTS = (10, 100, 500, 1_000)
+REPEAT = 20
+
+
+def old_messages(message, history):
+    # gra1_chat5.apichat before sessionz.py
+    messages = [{"role": "user", "content": message}]
+    for item in reversed(history):
+        if isinstance(item, dict) and "role" in item and "content" in item:
+            messages.insert(0, item)
+    corrected_messages = []
+    for i, msg in enumerate(messages):
+        if i == 0:
+            corrected_messages.append(msg)
+        else:
+            if corrected_messages[-1]["role"] != msg["role"]:
+                corrected_messages.append(msg)
+    return corrected_messages
+
+
+def gradio_history(turns):
+    # What Gradio hands over: fresh dicts with its extra keys
+    history = []
+    for t in range(turns):
+        history.append({"role": "user", "content": f"question {t} " * 8, "metadata": None, "options": None})
+        history.append({"role": "assistant", "content": f"answer {t} " * 40, "metadata": None, "options": None})
+    return history
+
+
+def time_old(history):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        old_messages("next question", history)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def time_new(history):
+    # A session that already followed the conversation up to here
+    best = float("inf")
+    for _ in range(REPEAT):
+        conv = Conversation()
+        conv.turn(history[-2]["content"], history[:-2])
+        start = time.perf_counter()
+        conv.turn("next question", history)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def session_bench():
+    header1(f"Conversation state - {TURNS:,} turns")
+    full = gradio_history(TURNS)
+
+    table = Table(title="Message building per turn", border_style="magenta")
+    table.add_column("History turns", justify="right", style="cyan")
+    table.add_column("Rebuild (old) us", justify="right")
+    table.add_column("Incremental us", justify="right")
+    table.add_column("Speedup", justify="right")
+    for turns in CHECKPOINTS:
+        history = full[: turns * 2]
+        old, new = time_old(history), time_new(history)
+        table.add_row(f"{turns:,}", f"{old * 1e6:,.1f}", f"{new * 1e6:,.1f}", f"{old / new:,.0f}x")
+    console.print(table)
+
+    # The whole conversation, one turn after another, the history growing as in the app
+    totals = {}
+    for name, build in (("rebuild", old_messages), ("incremental", Conversation().turn)):
+        history = []
+        start = time.perf_counter()
+        for t in range(TURNS):
+            build(full[t * 2]["content"], history)
+            history.extend(full[t * 2 : t * 2 + 2])
+        totals[name] = time.perf_counter() - start
+    console.print(
+        f"Full {TURNS:,} turn conversation: rebuild {totals['rebuild'] * 1000:,.0f} ms, "
+        f"incremental {totals['incremental'] * 1000:,.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    session_bench()
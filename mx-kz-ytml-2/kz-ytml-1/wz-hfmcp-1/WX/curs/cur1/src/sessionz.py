@@ -0,0 +1,105 @@
+# /////////////////////////////////////////
+# sessionz.py - Per session conversation state for Gradio chat handlers
+# /////////////////////////////////////////
+
+# Gradio sends the whole history with every message. Conversation remembers how much
+# of it was already normalised (dicts only, user / assistant alternating) and only
+# looks at what came after, so a turn costs the same at message 10 and message 10 000.
+# If the history stops matching (clear, retry, undo, edit) it is rebuilt once.
+
+# --- Imports Zone ---
+
+import threading
+from collections import OrderedDict
+
+# --- Vars ---
+
+MAX_SESSIONS = 1_000  # Least recently active sessions are forgotten first
+
+
+# --- State ---
+
+
+class Conversation:
+    """Normalised, alternation correct messages of one chat session"""
+
+    def __init__(self):
+        self.messages = []
+        self.seen = 0  # Gradio history items already consumed
+        self.last_seen = None  # The last consumed item, to notice a history that changed under us
+        self.pending = False  # messages[-1] is last turn's user message, not in the history yet
+
+    def reset(self):
+        self.messages.clear()
+        self.seen = 0
+        self.last_seen = None
+        self.pending = False
+
+    def _push(self, item):
+        # Same rule as before: a message with the same role as the previous one is dropped
+        if not self.messages or self.messages[-1]["role"] != item["role"]:
+            self.messages.append({"role": item["role"], "content": item["content"]})
+
+    def _matches(self, history):
+        if len(history) < self.seen:
+            return False
+        return self.seen == 0 or _same(history[self.seen - 1], self.last_seen)
+
+    def turn(self, message, history):
+        """
+        Messages for this turn: the earlier conversation plus the new user message.
+
+        Parameters:
+        - message (str): The new user message
+        - history (list[dict]): Gradio history, type="messages"
+
+        Returns:
+        - list[dict]: The session's own list, do not modify it
+        """
+        if not self._matches(history):
+            self.reset()
+
+        start = self.seen
+        if self.pending:
+            self.pending = False
+            if start < len(history) and _same(history[start], self.messages[-1]):
+                start += 1  # Last turn's user message, now part of the history
+            else:
+                self.messages.pop()  # It never made it into the history (error, retry)
+
+        for item in history[start:]:
+            if isinstance(item, dict) and "role" in item and "content" in item:
+                self._push(item)
+        if len(history) > self.seen:
+            self.seen = len(history)
+            self.last_seen = history[-1]
+
+        before = len(self.messages)
+        self._push({"role": "user", "content": message})
+        self.pending = len(self.messages) > before
+        return self.messages
+
+
+def _same(a, b):
+    return isinstance(a, dict) and isinstance(b, dict) and a.get("role") == b.get("role") and a.get("content") == b.get("content")
+
+
+class Sessions:
+    """Conversation per Gradio session hash, least recently used dropped past max_sessions"""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self.conversations = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, request):
+        key = getattr(request, "session_hash", None) or "default"
+        with self.lock:
+            conv = self.conversations.get(key)
+            if conv is None:
+                conv = self.conversations[key] = Conversation()
+                if len(self.conversations) > self.max_sessions:
+                    self.conversations.popitem(last=False)
+            else:
+                self.conversations.move_to_end(key)
+            return conv
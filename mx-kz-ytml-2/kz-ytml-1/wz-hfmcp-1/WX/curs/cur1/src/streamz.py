@@ -0,0 +1,309 @@
+# /////////////////////////////////////////
+# streamz.py - Token delta streaming for chat handlers
+# /////////////////////////////////////////
+
+# Handlers used to append a token and yield "".join(chunks) (or partial += token),
+# copying the whole answer on every token: O(n^2) for a long reply.
+# Here the text collects in a TextBuffer (O(1) append) and is only joined when it is
+# actually sent. gr.ChatInterface wants the full message on each yield (Gradio diffs it
+# into an append for the browser), so gradio_stream() sends a new snapshot once the
+# unsent tail is a fixed share of the text: the copies add up to O(n), constant per token.
+# coalesce() batches the tiny chunks fast providers push into one update every N ms or
+# M characters, whichever comes first, so many chats share the event loop and websocket.
+# Its batches still go through gradio_stream() with the default ratio: a batch is bounded
+# in size, so one full snapshot per batch would bring the quadratic copying back.
+
+# --- Imports Zone ---
+
+import queue
+import threading
+import time
+from collections import deque
+
+from rich import print as rpr
+
+# --- Vars ---
+
+RATIO = 0.02  # Unsent share of the text that triggers a UI update
+MIN_CHARS = 1  # Smallest update, 1 = every token while the answer is short
+INTERVAL = 0.05  # Seconds a chunk may wait for others, 20 updates a second at most
+MAX_CHARS = 256  # Characters that go out at once, without waiting for the interval
+RATE_WINDOW = 10.0  # Seconds the update rate is averaged over
+
+
+# --- Deltas ---
+
+
+def text_deltas(stream):
+    """
+    Text deltas of a streaming response.
+
+    Parameters:
+    - stream (Iterable): OpenAI / HF InferenceClient chunks, or plain strings
+
+    Returns:
+    - Iterator[str]: Non empty token texts
+    """
+    for chunk in stream:
+        text = _text_of(chunk)
+        if text:
+            yield text
+
+
+async def atext_deltas(stream):
+    """text_deltas() for async streams (AsyncOpenAI, AsyncInferenceClient)"""
+    async for chunk in stream:
+        text = _text_of(chunk)
+        if text:
+            yield text
+
+
+def _text_of(chunk):
+    if isinstance(chunk, str):
+        return chunk
+    choices = getattr(chunk, "choices", None)
+    return choices[0].delta.content if choices else None
+
+
+class TextBuffer:
+    """Growable text: O(1) append, joined only when read"""
+
+    def __init__(self):
+        self.parts = []
+        self.joined = ""
+        self.size = 0
+
+    def append(self, delta):
+        self.parts.append(delta)
+        self.size += len(delta)
+
+    @property
+    def pending(self):
+        """Characters appended since text was last read"""
+        return self.size - len(self.joined)
+
+    @property
+    def text(self):
+        if self.parts:
+            self.joined = "".join([self.joined, *self.parts])
+            self.parts.clear()
+        return self.joined
+
+
+def delta_stream(deltas, buffer=None):
+    """Deltas straight through, for consumers that append themselves; the full text collects in buffer"""
+    buffer = buffer if buffer is not None else TextBuffer()
+    for delta in deltas:
+        buffer.append(delta)
+        yield delta
+
+
+def gradio_stream(deltas, ratio=RATIO, min_chars=MIN_CHARS):
+    """
+    Full text snapshots for gr.ChatInterface, at constant amortised cost per token.
+
+    Parameters:
+    - deltas (Iterable[str]): Token texts, e.g. text_deltas(stream)
+    - ratio (float): Share of the text left unsent before the next update, keep it above 0
+      (after coalesce() too): 0 sends the whole text on every delta, O(n^2) copying again
+    - min_chars (int): Smallest update in characters
+
+    Returns:
+    - Iterator[str]: The answer so far; the last one is always the complete answer
+    """
+    buffer = TextBuffer()
+    for delta in deltas:
+        buffer.append(delta)
+        if buffer.pending >= max(min_chars, ratio * buffer.size):
+            yield buffer.text
+    if buffer.pending:
+        yield buffer.text
+
+
+async def agradio_stream(deltas, ratio=RATIO, min_chars=MIN_CHARS):
+    """gradio_stream() for async handlers, deltas is an async iterator"""
+    buffer = TextBuffer()
+    async for delta in deltas:
+        buffer.append(delta)
+        if buffer.pending >= max(min_chars, ratio * buffer.size):
+            yield buffer.text
+    if buffer.pending:
+        yield buffer.text
+
+
+# --- Coalescing ---
+
+
+class StreamStats:
+    """Chunks in, UI updates out, and what is waiting in between, over every coalesced stream"""
+
+    def __init__(self, window=RATE_WINDOW):
+        self.window = window
+        self.lock = threading.Lock()
+        self.live = set()  # Open streams, their queues are the queue depth
+        self.streams = 0
+        self.chunks = 0
+        self.updates = 0
+        self.max_depth = 0  # Most chunks left in a stream's queue when an update went out
+        self.recent = deque()  # Update times within the window
+
+    def opened(self, stream):
+        with self.lock:
+            self.live.add(stream)
+            self.streams += 1
+
+    def closed(self, stream):
+        with self.lock:
+            self.live.discard(stream)
+
+    def update(self, chunks, depth):
+        now = time.monotonic()
+        with self.lock:
+            self.chunks += chunks
+            self.updates += 1
+            self.max_depth = max(self.max_depth, depth)
+            self.recent.append(now)
+            while self.recent and self.recent[0] < now - self.window:
+                self.recent.popleft()
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and self.recent[0] < now - self.window:
+                self.recent.popleft()
+            return {
+                "active": len(self.live),
+                "streams": self.streams,
+                "chunks": self.chunks,
+                "updates": self.updates,
+                "chunks_per_update": self.chunks / self.updates if self.updates else 0.0,
+                "updates_per_s": len(self.recent) / self.window,
+                "queued": sum(stream.depth for stream in self.live),
+                "max_depth": self.max_depth,
+            }
+
+
+STREAM_STATS = StreamStats()
+_DONE = object()
+
+
+class _Failed:
+    def __init__(self, error):
+        self.error = error
+
+
+class _Stream:
+    # One coalesced stream: chunks from the pump thread, and the batch being collected
+    def __init__(self):
+        self.chunks = queue.Queue()
+        self.parts = []
+        self.stop = threading.Event()
+
+    @property
+    def depth(self):
+        # Received from upstream, not handed to Gradio yet
+        return self.chunks.qsize() + len(self.parts)
+
+
+def _pump(deltas, stream):
+    # Reads upstream at its own pace, so the interval is kept even when it stalls
+    try:
+        for delta in deltas:
+            if stream.stop.is_set():
+                break
+            stream.chunks.put(delta)
+    except Exception as e:
+        stream.chunks.put(_Failed(e))
+    finally:
+        close = getattr(deltas, "close", None)
+        if close is not None:
+            close()
+        stream.chunks.put(_DONE)
+
+
+def coalesce(deltas, interval=INTERVAL, max_chars=MAX_CHARS, stats=STREAM_STATS):
+    """
+    Batch text deltas into UI updates: one every interval seconds or max_chars characters.
+
+    The first chunk goes out at once so time to first token does not suffer.
+
+    Parameters:
+    - deltas (Iterable[str]): Token texts, read on a background thread
+    - interval (float): Longest a chunk waits for the next update
+    - max_chars (int): Pending characters that trigger an update right away
+    - stats (StreamStats): Where queue depth and update rate are counted
+
+    Returns:
+    - Iterator[str]: Batched deltas, upstream errors are raised after the text before them
+    """
+    stream = _Stream()
+    parts = stream.parts
+    stats.opened(stream)
+    threading.Thread(target=_pump, args=(iter(deltas), stream), daemon=True).start()
+
+    size = 0
+    deadline = None
+    first = True
+    failed = None
+    try:
+        while True:
+            try:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                item = stream.chunks.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # Interval is up
+            if item is _DONE:
+                break
+            if isinstance(item, _Failed):
+                failed = item.error
+                break
+            if item is not None:
+                parts.append(item)
+                size += len(item)
+                if deadline is None:
+                    deadline = time.monotonic() + interval
+                if not first and size < max_chars and time.monotonic() < deadline:
+                    continue
+            if parts:
+                stats.update(len(parts), stream.chunks.qsize())
+                batch = "".join(parts)
+                parts.clear()
+                size = 0
+                deadline = None
+                first = False
+                yield batch
+        if parts:
+            stats.update(len(parts), stream.chunks.qsize())
+            batch = "".join(parts)
+            parts.clear()
+            yield batch
+        if failed is not None:
+            raise failed
+    finally:
+        # Gradio closes the generator when the user hits stop, the pump then lets go of upstream
+        stream.stop.set()
+        stats.closed(stream)
+
+
+def stream_stats(stats=STREAM_STATS):
+    return stats.snapshot()
+
+
+def stats_markdown(stats=STREAM_STATS):
+    """Stream stats as Markdown, for a gr.Markdown refreshed by a gr.Timer"""
+    s = stats.snapshot()
+    return (
+        "| Active streams | Updates / s | Chunks / update | Queued chunks | Max queue depth | Streams | Updates |\n"
+        "|---|---|---|---|---|---|---|\n"
+        f"| {s['active']} | {s['updates_per_s']:.1f} | {s['chunks_per_update']:.1f} | {s['queued']} "
+        f"| {s['max_depth']} | {s['streams']} | {s['updates']} |"
+    )
+
+
+def brint_stream_stats(stats=STREAM_STATS):
+    s = stats.snapshot()
+    rpr(
+        f"[cyan]Streams: {s['active']} active / {s['streams']} total, {s['updates']} updates for "
+        f"{s['chunks']} chunks ({s['chunks_per_update']:.1f} per update), {s['updates_per_s']:.1f} updates/s, "
+        f"{s['queued']} queued, max queue depth {s['max_depth']}[/cyan]"
+    )
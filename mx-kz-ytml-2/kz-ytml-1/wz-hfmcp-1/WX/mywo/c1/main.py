@@ -1,6 +1,7 @@
 # Main entry point for testing chat interfaces
 
 from src.c4 import chat_c4
+from src.ssebench import sse_bench
 
 
 def main():
@@ -8,6 +9,7 @@ def main():
     # chat_2()
     # hf_stream_bot()
     chat_c4()
+    # sse_bench()  # Tokens/s of the SSE decoder, src/ssebench.py
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
+import asyncio
 import random
-import time
 
 import gradio as gr
 
@@ -20,14 +20,16 @@ def chat_1():
         msg = gr.Textbox()
         clear = gr.ClearButton([msg, chatbot])
 
-        def respond(message, chat_history):
+        # async: the 2 s wait no longer holds a worker thread, other sessions keep going
+        async def respond(message, chat_history):
             bot_message = random.choice(
                 ["How are you?", "Today is a great day", "I'm very hungry"])
             chat_history.append({"role": "user", "content": message})
             chat_history.append({"role": "assistant", "content": bot_message})
-            time.sleep(2)
+            await asyncio.sleep(2)
             return "", chat_history
 
-        msg.submit(respond, [msg, chatbot], [msg, chatbot])
+        # No concurrency limit: the sessions sleep on the event loop together instead of in line
+        msg.submit(respond, [msg, chatbot], [msg, chatbot], concurrency_limit=None)
 
     demo.launch()
@@ -7,9 +7,10 @@ import os
 
 import gradio as gr
 import requests
-import sseclient
 from dotenv import load_dotenv
 
+from .ssez import iter_tokens
+
 
 def header1(title):
     # Placeholder for your header function
@@ -57,15 +58,8 @@ def hf_stream_bot():
                 url, headers=headers, json=payload, stream=True, timeout=30)
             response.raise_for_status()
 
-            client = sseclient.SSEClient(response)
-            for event in client:
-                if event.data == "[DONE]":
-                    break
-                try:
-                    token = eval(event.data)["token"]["text"]
-                    yield token
-                except (KeyError, SyntaxError):
-                    continue
+            # Raw chunks as they arrive, decoded incrementally (ssez.py)
+            yield from iter_tokens(response.iter_content(chunk_size=None))
         except Exception as e:
             yield f"[Error] {str(e)}"
 
@@ -3,7 +3,7 @@
 #
 # ////////////////////////////////////////////////////////////////
 
-import time
+import asyncio
 
 import gradio as gr
 
@@ -19,9 +19,10 @@ def chat_c4():
 1. Testing making blocks and stream 
 """
 
-    def slow_echo(message, history):
+    # Async generator: every character waits on the event loop, not in a worker thread
+    async def slow_echo(message, history):
         for i in range(len(message)):
-            time.sleep(0.05)
+            await asyncio.sleep(0.05)
             yield "You typed: " + message[: i + 1]
 
     def chat_box():
@@ -29,6 +30,7 @@ def chat_c4():
             slow_echo,
             type="messages",
             save_history=True,
+            concurrency_limit=None,  # Async, so every session echoes at once instead of in line
         )
 
     # Defining the main block
@@ -0,0 +1,104 @@
+# /////////////////////////
+#  ssebench.py - Tokens/s of the SSE decoders
+# //////////////////////////
+
+# Replays a 10k token TGI stream, cut into network sized chunks, through the old
+# line by line str + eval() parsing of stream_response and through ssez.iter_tokens.
+# Run: uv run python -m src.ssebench
+
+import json
+import random
+import time
+
+from rich.table import Table
+
+from . import ssez
+from .utz import console, header1
+
+TOKENS = 10_000
+ROUNDS = 5
+WORDS = "the model streams one token per server sent event and the client has to keep up".split()
+
+
+def record_stream(tokens=TOKENS, seed=0):
+    """A TGI text-generation stream as the raw chunks the socket hands over"""
+    rng = random.Random(seed)
+    events = []
+    text = []
+    for i in range(tokens):
+        word = " " + rng.choice(WORDS)
+        text.append(word)
+        event = {"index": i, "token": {"id": rng.randrange(32000), "text": word, "logprob": -rng.random(), "special": False}}
+        event["generated_text"] = None
+        event["details"] = None
+        events.append(b"data:" + json.dumps(event).encode() + b"\n\n")
+    last = {"token": {"id": 2, "text": "</s>", "logprob": 0.0, "special": True}, "generated_text": "".join(text)}
+    events.append(b"data:" + json.dumps(last).encode() + b"\n\n")
+    body = b"".join(events)
+
+    chunks, pos = [], 0
+    while pos < len(body):
+        size = rng.randint(512, 8192)
+        chunks.append(body[pos : pos + size])
+        pos += size
+    return chunks
+
+
+def old_tokens(chunks):
+    # What stream_response did: str lines, eval() per event
+    pending = ""
+    for chunk in chunks:
+        pending += chunk.decode("utf8")
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                return
+            try:
+                # Bare eval() dies on JSON's null / false / true, patched so it gets a time at all
+                yield eval(data.replace("null", "None").replace("false", "False").replace("true", "True"))["token"]["text"]
+            except (KeyError, SyntaxError):
+                continue
+
+
+def run(fn, chunks):
+    best = float("inf")
+    count = 0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        count = sum(1 for _ in fn(chunks))
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+def sse_bench():
+    header1(f"SSE decoding - {TOKENS:,} token stream")
+    chunks = record_stream()
+    size = sum(len(c) for c in chunks)
+
+    rows = [("str lines + eval (old)",) + run(old_tokens, chunks)]
+
+    fast = ssez.loads, ssez.JSONError
+    ssez.loads, ssez.JSONError = json.loads, (json.JSONDecodeError, UnicodeDecodeError)
+    rows.append(("ssez + json",) + run(ssez.iter_tokens, chunks))
+    ssez.loads, ssez.JSONError = fast
+    if fast[0] is not json.loads:
+        rows.append(("ssez + orjson",) + run(ssez.iter_tokens, chunks))
+
+    table = Table(title=f"{len(chunks)} chunks, {size / 1024:.0f} KB, best of {ROUNDS}", border_style="magenta")
+    table.add_column("Decoder", style="cyan")
+    table.add_column("Tokens", justify="right")
+    table.add_column("ms", justify="right")
+    table.add_column("Tokens/s", justify="right")
+    table.add_column("Speedup", justify="right")
+    base = rows[0][2]
+    for name, count, seconds in rows:
+        table.add_row(name, f"{count:,}", f"{seconds * 1000:.1f}", f"{count / seconds:,.0f}", f"{base / seconds:.1f}x")
+    console.print(table)
+    return rows
+
+
+if __name__ == "__main__":
+    sse_bench()
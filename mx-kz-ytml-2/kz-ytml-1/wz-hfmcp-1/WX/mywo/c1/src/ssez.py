@@ -0,0 +1,122 @@
+# /////////////////////////
+#  ssez.py - Incremental server-sent events decoder
+# //////////////////////////
+
+# Reads the raw bytes of a streaming response as they arrive and yields the tokens.
+# Lines are found with bytes.find on one growing buffer, never decoded to str,
+# and each event's data is parsed with orjson when installed (uv add orjson),
+# plain json otherwise. Understands TGI ({"token": {"text": ...}}) and
+# OpenAI ({"choices": [{"delta": {"content": ...}}]}) payloads.
+
+import importlib.util
+import json
+
+from .utz import l_warning
+
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    loads = orjson.loads
+    JSONError = orjson.JSONDecodeError
+else:
+    loads = json.loads
+    JSONError = (json.JSONDecodeError, UnicodeDecodeError)  # bytes cut inside a UTF-8 sequence
+
+
+class StreamError(Exception):
+    """The server sent an error event in the middle of the stream"""
+
+
+class SSEDecoder:
+    """
+    Feed it byte chunks, get back the data of every event they complete.
+
+    Handles events split across chunks, \\n and \\r\\n line endings, comment lines
+    and multi line data, as in the SSE spec.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.data = []  # data lines of the event being read
+
+    def feed(self, chunk):
+        """bytes -> list[bytes], one entry per finished event that had data"""
+        buffer = self.buffer
+        buffer += chunk
+        events = []
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                break
+            stop = end - 1 if end > start and buffer[end - 1] == 13 else end  # drop \r
+            if stop == start:
+                # Blank line ends the event
+                if self.data:
+                    events.append(self.data[0] if len(self.data) == 1 else b"\n".join(self.data))
+                    self.data = []
+            elif buffer.startswith(b"data:", start):
+                value = start + 5
+                if value < stop and buffer[value] == 32:  # one optional space
+                    value += 1
+                self.data.append(bytes(buffer[value:stop]))
+            # event:, id:, retry: and :comments carry nothing we use
+            start = end + 1
+        if start:
+            del buffer[:start]  # one shift per chunk, not per line
+        return events
+
+    def flush(self):
+        """Data of a last event the server ended without a blank line (or a final newline)"""
+        events = self.feed(b"\n") if self.buffer else []
+        if self.data:
+            events.append(b"\n".join(self.data))
+        self.data = []
+        return events
+
+
+def token_of(payload):
+    """Token text of a parsed event, None when it has none"""
+    token = payload.get("token")
+    if token is not None:
+        return None if token.get("special") else token.get("text")
+    choices = payload.get("choices")
+    if choices:
+        return (choices[0].get("delta") or {}).get("content")
+    if "error" in payload:
+        raise StreamError(payload["error"])
+    return None
+
+
+def iter_tokens(chunks):
+    """
+    Tokens of a server-sent events stream.
+
+    Parameters:
+    - chunks (Iterable[bytes]): Raw body, e.g. response.iter_content(chunk_size=None)
+
+    Returns:
+    - Iterator[str]: Token texts in order, stops at data: [DONE]
+    """
+    malformed = 0
+    for data in _events(chunks):
+        if data == b"[DONE]":
+            return
+        try:
+            payload = loads(data)
+        except JSONError:
+            malformed += 1
+            # Reported, not hidden: a bad event means text is missing from the reply
+            l_warning(f"Skipped malformed event #{malformed}: {data[:80]!r}")
+            continue
+        text = token_of(payload)
+        if text:
+            yield text
+
+
+def _events(chunks):
+    # Every event's data, the one a truncated stream leaves unfinished included
+    decoder = SSEDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.flush()
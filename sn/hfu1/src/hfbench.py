@@ -0,0 +1,230 @@
+# Benchmarks for the hfu1 upload paths
+# Run from the project root: uv run python -m src.hfbench [walk|hub]
+# The hub benchmarks run against the local stand-in server (src/hflocal.py), nothing reaches the real Hub
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from huggingface_hub.utils import disable_progress_bars, filter_repo_objects
+from rich.table import Table
+
+from src.hfbulk import bulk_delete
+from src.hflocal import start_local_hub
+from src.hfpipe import hf_pipeline_upload
+from src.hfprov import provision
+from src.hfspace import IGNORE_PATTERNS
+from src.hfsync import DEFAULT_IGNORE, hf_sync_folder, list_files
+from src.utz import console, header1
+
+
+#  ██╗    ██╗  █████╗  ██╗      ██╗  ██╗
+#  ██║    ██║ ██╔══██╗ ██║      ██║ ██╔╝
+#  ██║ █╗ ██║ ███████║ ██║      █████╔╝
+#  ██║███╗██║ ██╔══██║ ██║      ██╔═██╗
+#  ╚███╔███╔╝ ██║  ██║ ███████╗ ██║  ██╗
+#   ╚══╝╚══╝  ╚═╝  ╚═╝ ╚══════╝ ╚═╝  ╚═╝
+
+def make_tree(root, n_files=200_000):
+    """
+    Synthetic Space folder: a small app plus a huge .venv and node_modules,
+    roughly what ../WX/mywo/vg1/UL/ looks like after a local install.
+    """
+    app = max(1, n_files // 100)
+    venv = n_files * 6 // 10
+    node = n_files - app - venv
+    layout = [("", app, ".py"), (".venv/lib/python3.13/site-packages", venv, ".py"), ("node_modules", node, ".js")]
+    for base, count, ext in layout:
+        for i in range(count):
+            d = os.path.join(root, base, f"pkg{i // 100}")
+            if i % 100 == 0:
+                os.makedirs(d, exist_ok=True)
+            with open(os.path.join(d, f"f{i}{ext}"), "w") as f:
+                f.write("x")
+
+
+def filter_after_enumeration(folder, ignore_patterns):
+    # What upload_folder does today: list everything, then filter
+    folder = Path(folder)
+    relpaths = [p.relative_to(folder).as_posix() for p in sorted(folder.glob("**/*")) if p.is_file()]
+    return sorted(filter_repo_objects(relpaths, ignore_patterns=list(ignore_patterns) + DEFAULT_IGNORE))
+
+
+def bench_walk(n_files=200_000, repeat=3):
+    header1(f"Walk benchmark - {n_files} files")
+    root = tempfile.mkdtemp(prefix="hfbench-")
+    try:
+        start = time.perf_counter()
+        make_tree(root, n_files)
+        console.print(f"Built tree in {time.perf_counter() - start:.1f}s")
+
+        runs = {
+            "glob + filter (upload_folder)": lambda: filter_after_enumeration(root, IGNORE_PATTERNS),
+            "scandir + pruning (hfwalk)": lambda: list_files(root, ignore_patterns=IGNORE_PATTERNS),
+        }
+        results, timings = {}, {}
+        for name, fn in runs.items():
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                results[name] = fn()
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+
+        if len({tuple(r) for r in results.values()}) != 1:
+            raise AssertionError("Walkers disagree on the file list")
+
+        table = Table(title="Folder walk", border_style="magenta")
+        table.add_column("Method")
+        table.add_column("Files kept", justify="right")
+        table.add_column("Best of %d (s)" % repeat, justify="right")
+        table.add_column("Speedup", justify="right")
+        baseline = timings["glob + filter (upload_folder)"]
+        for name, secs in timings.items():
+            table.add_row(name, str(len(results[name])), f"{secs:.3f}", f"{baseline / secs:.1f}x")
+        console.print(table)
+        return timings
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+#  ██╗  ██╗ ██╗   ██╗ ██████╗
+#  ██║  ██║ ██║   ██║ ██╔══██╗
+#  ███████║ ██║   ██║ ██████╔╝
+#  ██╔══██║ ██║   ██║ ██╔══██╗
+#  ██║  ██║ ╚██████╔╝ ██████╔╝
+#  ╚═╝  ╚═╝  ╚═════╝  ╚═════╝
+
+def percentile(values, q):
+    """Nearest rank percentile, q in 0..100"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def make_upload_tree(root, n_small=200, small_size=4096, n_large=2, large_size=4 * 1024 * 1024):
+    """Space-like folder: many small text files plus a few binary blobs that go through LFS"""
+    for i in range(n_small):
+        d = os.path.join(root, f"assets{i // 50}")
+        os.makedirs(d, exist_ok=True)
+        with open(os.path.join(d, f"a{i}.txt"), "w") as f:
+            f.write(f"{i:08d}" * (small_size // 8))
+    for i in range(n_large):
+        with open(os.path.join(root, f"blob{i}.bin"), "wb") as f:
+            f.write(os.urandom(large_size))
+    return sum(os.path.getsize(os.path.join(root, p)) for p in list_files(root))
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_hub(n_repos=50, n_uploads=3, latency=0.02, bandwidth=50e6, max_workers=8):
+    """
+    ops/s, MB/s and p50 / p99 latency of the hfu1 create, upload and delete paths.
+
+    Parameters:
+    - n_repos (int): Repos created and deleted
+    - n_uploads (int): Full folder uploads per upload mode
+    - latency (float): Seconds the stand-in adds to every request
+    - bandwidth (float): Bytes per second the stand-in allows per request body
+    - max_workers (int): Worker pool of the create and delete engines
+    """
+    header1(f"Hub benchmark - {latency * 1000:.0f}ms latency, {bandwidth / 1e6:.0f}MB/s")
+    hub = start_local_hub(latency=latency, bandwidth=bandwidth)
+    root = tempfile.mkdtemp(prefix="hfbench-")
+    folder = os.path.join(root, "UL")
+    os.makedirs(folder)
+    folder_bytes = make_upload_tree(folder)
+
+    # The engines log every request, keep the benchmark output to the table
+    disable_progress_bars()
+    logging.disable(logging.WARNING)
+    console.quiet = True
+    rows = []
+    try:
+        # --- create: provisioning engine, no folders ---
+        repo_ids = [f"bench/r{i}" for i in range(n_repos)]
+        start = time.perf_counter()
+        results = provision([{"repo_id": r, "repo_type": "model"} for r in repo_ids], token="x",
+                            endpoint=hub.endpoint, max_workers=max_workers, rate=1000.0)
+        rows.append(("create", results, time.perf_counter() - start, 0))
+
+        # --- upload: each mode sends the whole folder to a fresh repo ---
+        modes = {
+            "upload (sync)": hf_sync_folder,
+            "upload (pipeline)": hf_pipeline_upload,
+            "upload (packed)": lambda *a, **kw: hf_sync_folder(*a, pack=True, **kw),
+        }
+        for name, sync in modes.items():
+            timings = []
+            for i in range(n_uploads):
+                repo_id = repo_ids[i]
+                hub.repos[("model", repo_id)].files.clear()
+                timings.append(_timed(lambda: sync(folder, repo_id, token="x", endpoint=hub.endpoint)))
+                os.remove(folder + ".hfmanifest.json")  # next run uploads everything again
+            rows.append((name, timings, sum(timings), folder_bytes * n_uploads))
+
+        # --- delete: bulk engine ---
+        start = time.perf_counter()
+        results = bulk_delete(repo_ids, token="x", endpoint=hub.endpoint, max_workers=max_workers, rate=1000.0)
+        rows.append(("delete", results, time.perf_counter() - start, 0))
+    finally:
+        console.quiet = False
+        logging.disable(logging.NOTSET)
+        hub.stop()
+        shutil.rmtree(root, ignore_errors=True)
+
+    table = Table(title="hfu1 operations (local stand-in hub)", border_style="magenta")
+    for col in ("Operation", "Ops", "Seconds", "ops/s", "MB/s", "p50 ms", "p99 ms"):
+        table.add_column(col, justify="left" if col == "Operation" else "right")
+    report = {}
+    for name, items, total, nbytes in rows:
+        timings = [r if isinstance(r, float) else r.seconds for r in items]
+        failed = sum(1 for r in items if not isinstance(r, float) and not r.ok)
+        if failed:
+            raise AssertionError(f"{failed} {name} operations failed")
+        report[name] = {
+            "ops_per_s": len(timings) / total,
+            "mb_per_s": nbytes / 1e6 / total,
+            "p50": percentile(timings, 50),
+            "p99": percentile(timings, 99),
+        }
+        r = report[name]
+        table.add_row(
+            name,
+            str(len(timings)),
+            f"{total:.2f}",
+            f"{r['ops_per_s']:.1f}",
+            f"{r['mb_per_s']:.1f}" if nbytes else "-",
+            f"{r['p50'] * 1000:.0f}",
+            f"{r['p99'] * 1000:.0f}",
+        )
+    console.print(table)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="hfu1 benchmarks")
+    parser.add_argument("suite", nargs="?", choices=["walk", "hub"], default="walk")
+    parser.add_argument("--files", type=int, default=200_000, help="walk: files in the synthetic tree")
+    parser.add_argument("--repos", type=int, default=50, help="hub: repos created and deleted")
+    parser.add_argument("--latency", type=float, default=0.02, help="hub: seconds per request")
+    parser.add_argument("--bandwidth", type=float, default=50e6, help="hub: bytes per second")
+    args = parser.parse_args()
+
+    if args.suite == "walk":
+        bench_walk(args.files)
+    else:
+        bench_hub(n_repos=args.repos, latency=args.latency, bandwidth=args.bandwidth)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# Bulk operations engine for Hugging Face repos and spaces
+# Bounded thread pool + per host rate limiter + retry with backoff on 429/5xx
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+from huggingface_hub import HfApi
+from huggingface_hub.utils import HfHubHTTPError, RepositoryNotFoundError
+from requests.exceptions import ConnectionError, Timeout
+from rich.table import Table
+
+from src.utz import console, header1, l_warning
+
+# Status codes worth retrying, everything else fails straight away
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+#  ██████╗   █████╗  ████████╗ ███████╗
+#  ██╔══██╗ ██╔══██╗ ╚══██╔══╝ ██╔════╝
+#  ██████╔╝ ███████║    ██║    █████╗
+#  ██╔══██╗ ██╔══██║    ██║    ██╔══╝
+#  ██║  ██║ ██║  ██║    ██║    ███████╗
+#  ╚═╝  ╚═╝ ╚═╝  ╚═╝    ╚═╝    ╚══════╝
+
+class RateLimiter:
+    """
+    Token bucket shared by every worker talking to the same host.
+
+    Parameters:
+    - rate (float): Requests per second allowed on average
+    - burst (int): Requests allowed back to back before throttling kicks in
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.tokens = float(self.burst)
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# One limiter per host so every engine hitting the Hub shares the same budget
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(endpoint, rate=10.0):
+    host = urlparse(endpoint).netloc or endpoint
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = RateLimiter(rate)
+        return _limiters[host]
+
+
+# --- Retry helper ---
+
+
+def retry_after(error):
+    """Seconds the server asked us to wait, None if it did not say"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def with_retry(fn, limiter=None, max_retries=5, backoff=0.5, max_backoff=30.0, on_retry=None):
+    """
+    Call fn() under the rate limiter, retrying 429/5xx and dropped connections.
+
+    Parameters:
+    - fn (callable): Zero argument function doing one Hub request
+    - limiter (RateLimiter): Limiter acquired before every attempt
+    - max_retries (int): Retries after the first attempt
+    - backoff (float): Base delay in seconds, doubled on each retry with jitter
+    - max_backoff (float): Cap for a single delay
+    - on_retry (callable): Called with (attempt, error, delay) before sleeping
+
+    Returns:
+    - Whatever fn() returns
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return fn()
+        except HfHubHTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status not in RETRY_STATUS or attempt >= max_retries:
+                raise
+            error, delay = e, retry_after(e)
+        except (ConnectionError, Timeout) as e:
+            if attempt >= max_retries:
+                raise
+            error, delay = e, None
+
+        if delay is None:
+            delay = min(max_backoff, backoff * 2**attempt) * (0.5 + random.random())
+        attempt += 1
+        if on_retry is not None:
+            on_retry(attempt, error, delay)
+        time.sleep(delay)
+
+
+#  ██████╗  ███████╗ ██╗
+#  ██╔══██╗ ██╔════╝ ██║
+#  ██║  ██║ █████╗   ██║
+#  ██║  ██║ ██╔══╝   ██║
+#  ██████╔╝ ███████╗ ███████╗
+#  ╚═════╝  ╚══════╝ ╚══════╝
+
+@dataclass
+class BulkResult:
+    repo_id: str
+    status: str  # "deleted", "missing" or "failed"
+    attempts: int
+    seconds: float
+    error: str = ""
+
+    @property
+    def ok(self):
+        return self.status != "failed"
+
+
+def bulk_delete(
+    repo_ids,
+    repo_type="model",
+    token=None,
+    endpoint=None,
+    max_workers=8,
+    rate=10.0,
+    max_retries=5,
+    missing_ok=True,
+):
+    """
+    Delete many repos concurrently.
+
+    Parameters:
+    - repo_ids (list[str]): Repos in "namespace/repo" format
+    - repo_type (str): "model", "dataset" or "space"
+    - token (str): Hugging Face token
+    - endpoint (str): Hub url, point it at a local stand-in server for testing
+    - max_workers (int): Size of the thread pool
+    - rate (float): Requests per second allowed against the host
+    - max_retries (int): Retries per repo on 429/5xx
+    - missing_ok (bool): Count repos that are already gone as a success
+
+    Returns:
+    - list[BulkResult]: One entry per repo, in the order given
+    """
+    api = HfApi(endpoint=endpoint, token=token)
+    limiter = get_limiter(api.endpoint, rate)
+
+    def delete_one(repo_id):
+        attempts = 1
+        start = time.perf_counter()
+
+        def count(attempt, error, delay):
+            nonlocal attempts
+            attempts += 1
+            l_warning(f"Retry {attempt} for {repo_id} in {delay:.1f}s: {error}")
+
+        try:
+            with_retry(
+                lambda: api.delete_repo(repo_id=repo_id, repo_type=repo_type),
+                limiter=limiter,
+                max_retries=max_retries,
+                on_retry=count,
+            )
+            status, error = "deleted", ""
+        except RepositoryNotFoundError as e:
+            status = "missing" if missing_ok else "failed"
+            error = "" if missing_ok else str(e)
+        except Exception as e:
+            status, error = "failed", str(e)
+        return BulkResult(repo_id, status, attempts, time.perf_counter() - start, error)
+
+    results = [None] * len(repo_ids)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(delete_one, repo_id): i for i, repo_id in enumerate(repo_ids)}
+        for future in as_completed(futures):
+            result = results[futures[future]] = future.result()
+            mark = "✅" if result.ok else "❌"
+            console.print(f"{mark} {result.status}: {result.repo_id}")
+
+    return results
+
+
+# --- Report ---
+
+
+def print_report(results, title="Bulk Delete Report"):
+    header1(title)
+
+    table = Table(title=title, border_style="magenta")
+    table.add_column("Repo", style="cyan")
+    table.add_column("Status")
+    table.add_column("Attempts", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Error", style="red")
+
+    for r in results:
+        colour = "green" if r.ok else "red"
+        table.add_row(
+            r.repo_id,
+            f"[{colour}]{r.status}[/{colour}]",
+            str(r.attempts),
+            f"{r.seconds:.2f}",
+            r.error[:80],
+        )
+
+    console.print(table)
+    failed = sum(not r.ok for r in results)
+    console.print(f"{len(results) - failed}/{len(results)} ok, {failed} failed")
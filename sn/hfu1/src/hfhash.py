@@ -0,0 +1,177 @@
+# Hashing stage for uploads
+# Large files are memory mapped and hashed across a process pool, results are kept
+# in a persistent cache keyed on (path, device, inode, size, mtime) so unchanged files are never re-read
+
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from huggingface_hub import CommitOperationAdd
+from huggingface_hub.lfs import UploadInfo
+
+from src.utz import l_info
+
+# Where hfu1 keeps its local caches (hash cache, remote trees, ...)
+CACHE_DIR = os.getenv("HFU_CACHE", ".hfcache")
+
+# Files at least this big are memory mapped instead of read through buffers
+MMAP_THRESHOLD = 4 * 1024 * 1024
+
+# Below this much work the process pool costs more than it saves
+POOL_THRESHOLD = 64 * 1024 * 1024
+
+# Small files are shipped to workers in batches of roughly this many bytes
+BATCH_BYTES = 32 * 1024 * 1024
+
+
+#  ██╗  ██╗  █████╗  ███████╗ ██╗  ██╗
+#  ██║  ██║ ██╔══██╗ ██╔════╝ ██║  ██║
+#  ███████║ ███████║ ███████╗ ███████║
+#  ██╔══██║ ██╔══██║ ╚════██║ ██╔══██║
+#  ██║  ██║ ██║  ██║ ███████║ ██║  ██║
+#  ╚═╝  ╚═╝ ╚═╝  ╚═╝ ╚══════╝ ╚═╝  ╚═╝
+
+def sha256_path(path):
+    """SHA-256 of one file, memory mapped when it is large"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            # hashlib releases the GIL and reads straight from the page cache
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        elif size:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _hash_batch(paths):
+    # Runs inside a worker process
+    return [sha256_path(p) for p in paths]
+
+
+def _batches(items):
+    """Group (path, size) pairs so each task is about BATCH_BYTES of work"""
+    batch, total = [], 0
+    for path, size in items:
+        batch.append(path)
+        total += size
+        if total >= BATCH_BYTES:
+            yield batch
+            batch, total = [], 0
+    if batch:
+        yield batch
+
+
+# --- Persistent cache ---
+
+
+class HashCache:
+    """
+    SQLite table of path -> (dev, ino, size, mtime_ns, sha256), safe to share between threads.
+
+    The path is the key, (dev, ino) only guards against a file swapped in by a rename.
+    os.scandir() stats carry no inode on Windows (st_ino == 0), those get one from os.stat()
+    so a walker's stat and a plain os.stat() of the same file hit the same row.
+    """
+
+    def __init__(self, path=None):
+        path = path or os.path.join(CACHE_DIR, "hashes.sqlite")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS file_hashes ("
+            "path TEXT PRIMARY KEY, dev INTEGER, ino INTEGER, size INTEGER, mtime INTEGER, sha256 TEXT)"
+        )
+
+    @staticmethod
+    def _row(path, st):
+        path = os.path.abspath(path)
+        if not st.st_ino:
+            try:
+                st = os.stat(path)
+            except OSError:
+                pass
+        return path, st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+    def get(self, path, st):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT sha256 FROM file_hashes WHERE path=? AND dev=? AND ino=? AND size=? AND mtime=?",
+                self._row(path, st),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, rows):
+        rows = [(*self._row(path, st), sha) for path, st, sha in rows]
+        with self.lock, self.db:
+            self.db.executemany("INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def close(self):
+        self.db.close()
+
+
+def hash_files(paths, workers=None, use_cache=True):
+    """
+    Hash many files, in parallel when there is enough work to be worth it.
+
+    Parameters:
+    - paths (list[str]): Files on disk
+    - workers (int): Process pool size, defaults to the CPU count
+    - use_cache (bool): Read and update the persistent hash cache
+
+    Returns:
+    - dict[str, str]: path -> sha256 hex digest
+    """
+    stats = {p: os.stat(p) for p in paths}
+    cache = HashCache() if use_cache else None
+
+    result, todo = {}, []
+    for p, st in stats.items():
+        sha = cache.get(p, st) if cache else None
+        if sha:
+            result[p] = sha
+        else:
+            todo.append((p, st.st_size))
+
+    total = sum(size for _, size in todo)
+    if todo:
+        l_info(f"Hashing {len(todo)} files ({total / 1e6:.1f} MB), {len(result)} cached")
+
+    if len(todo) > 1 and total >= POOL_THRESHOLD:
+        # Biggest first so one huge file does not end up alone at the tail
+        todo.sort(key=lambda item: item[1], reverse=True)
+        batches = list(_batches(todo))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for batch, digests in zip(batches, pool.map(_hash_batch, batches)):
+                result.update(zip(batch, digests))
+    else:
+        for p, _ in todo:
+            result[p] = sha256_path(p)
+
+    if cache:
+        cache.put_many((p, stats[p], result[p]) for p, _ in todo)
+        cache.close()
+    return result
+
+
+# --- Commit operations without hashing twice ---
+
+
+def add_operation(path, path_in_repo, sha256):
+    """
+    CommitOperationAdd for a file whose hash is already known.
+
+    CommitOperationAdd hashes the whole file again when it is built from a path,
+    so build it from empty bytes and fill in the real upload info ourselves.
+    """
+    with open(path, "rb") as f:
+        sample = f.read(512)
+    op = CommitOperationAdd(path_in_repo=path_in_repo, path_or_fileobj=b"")
+    op.path_or_fileobj = path
+    op.upload_info = UploadInfo(sha256=bytes.fromhex(sha256), size=os.path.getsize(path), sample=sample)
+    return op
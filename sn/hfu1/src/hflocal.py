@@ -0,0 +1,343 @@
+# Local stand-in for the Hugging Face Hub
+# Implements just the endpoints create_repo, upload_folder / create_commit, list_repo_tree
+# and delete_repo talk to, with configurable latency, bandwidth and error injection.
+# Point any HfApi at it with HfApi(endpoint=hub.endpoint)
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+# api path segment -> url prefix used in repo / LFS urls
+REPO_KINDS = {"models": "model", "datasets": "dataset", "spaces": "space"}
+URL_PREFIXES = {"model": "", "dataset": "datasets/", "space": "spaces/"}
+
+# Files at least this big (or binary) are sent through LFS, like the real Hub
+LFS_THRESHOLD = 10 * 1024 * 1024
+
+
+def git_blob_sha1(data):
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def lfs_pointer(sha256, size):
+    return f"version https://git-lfs.github.com/spec/v1\noid sha256:{sha256}\nsize {size}\n".encode()
+
+
+#  ██████╗  ███████╗ ██████╗   ██████╗
+#  ██╔══██╗ ██╔════╝ ██╔══██╗ ██╔═══██╗
+#  ██████╔╝ █████╗   ██████╔╝ ██║   ██║
+#  ██╔══██╗ ██╔══╝   ██╔═══╝  ██║   ██║
+#  ██║  ██║ ███████╗ ██║      ╚██████╔╝
+#  ╚═╝  ╚═╝ ╚══════╝ ╚═╝       ╚═════╝
+
+class Repo:
+    def __init__(self, repo_id, repo_type, settings):
+        self.repo_id = repo_id
+        self.repo_type = repo_type
+        self.settings = settings
+        self.files = {}  # path -> {"size", "oid", "lfs"}
+        self.lock = threading.Lock()
+        self.sha = hashlib.sha1(f"init {repo_type} {repo_id} {time.time()}".encode()).hexdigest()
+        self.commits = [self.sha]
+
+    def info(self):
+        return {
+            "id": self.repo_id,
+            "sha": self.sha,
+            "private": bool(self.settings.get("private")),
+            "siblings": [{"rfilename": p} for p in sorted(self.files)],
+            "xetEnabled": False,
+            **({"sdk": self.settings.get("sdk")} if self.repo_type == "space" else {}),
+        }
+
+    def tree(self, path="", recursive=False):
+        prefix = f"{path.strip('/')}/" if path.strip("/") else ""
+        entries, folders = [], set()
+        for p, meta in sorted(self.files.items()):
+            if not p.startswith(prefix):
+                continue
+            rest = p[len(prefix):]
+            if "/" in rest and not recursive:
+                folders.add(prefix + rest.split("/")[0])
+                continue
+            if recursive:
+                parts = rest.split("/")[:-1]
+                folders.update(prefix + "/".join(parts[: i + 1]) for i in range(len(parts)))
+            entry = {"type": "file", "path": p, "size": meta["size"], "oid": meta["oid"]}
+            if meta["lfs"]:
+                entry["lfs"] = {"oid": meta["lfs"], "size": meta["size"], "pointerSize": meta["pointer_size"]}
+            entries.append(entry)
+        dirs = [{"type": "directory", "path": d, "oid": hashlib.sha1(d.encode()).hexdigest()} for d in sorted(folders)]
+        return dirs + entries
+
+
+class LocalHub(ThreadingHTTPServer):
+    """
+    In memory Hub.
+
+    Parameters:
+    - latency (float): Seconds added to every request
+    - bandwidth (float): Bytes per second for request and response bodies, None for unlimited
+    - error_rate (float): Fraction of requests answered with a 503 (exercises retries)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, bandwidth=None, error_rate=0.0):
+        super().__init__((host, port), HubHandler)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.repos = {}  # (repo_type, repo_id) -> Repo
+        self.lfs = {}  # sha256 -> size
+        self.lock = threading.Lock()
+        self.stats = Counter()  # endpoint name -> requests
+        self.thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, name="local-hub", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def get_repo(self, repo_type, repo_id):
+        with self.lock:
+            return self.repos.get((repo_type, repo_id))
+
+
+def start_local_hub(**kwargs):
+    """Start a LocalHub on a free port in a background thread"""
+    return LocalHub(**kwargs).start()
+
+
+#  ██╗  ██╗ ████████╗ ████████╗ ██████╗
+#  ██║  ██║ ╚══██╔══╝ ╚══██╔══╝ ██╔══██╗
+#  ███████║    ██║       ██║    ██████╔╝
+#  ██╔══██║    ██║       ██║    ██╔═══╝
+#  ██║  ██║    ██║       ██║    ██║
+#  ╚═╝  ╚═╝    ╚═╝       ╚═╝    ╚═╝
+
+class HubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: LocalHub
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- plumbing ---
+
+    def _throttle(self, nbytes):
+        if self.server.bandwidth:
+            time.sleep(nbytes / self.server.bandwidth)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length) if length else b""
+        self._throttle(len(data))
+        return data
+
+    def _send(self, status, payload=None, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self._throttle(len(body))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message, code=None):
+        headers = {"X-Error-Message": message}
+        if code:
+            headers["X-Error-Code"] = code
+        self._send(status, {"error": message}, headers)
+
+    def _route(self, method):
+        url = urlparse(self.path)
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        body = self._body() if method in ("POST", "PUT", "DELETE") else b""
+
+        time.sleep(self.server.latency)
+        if self.server.error_rate and random.random() < self.server.error_rate:
+            self.server.stats["injected_503"] += 1
+            return self._error(503, "Injected failure")
+
+        try:
+            if method == "POST" and parts[:3] == ["api", "repos", "create"]:
+                return self.create_repo(json.loads(body))
+            if method == "DELETE" and parts[:3] == ["api", "repos", "delete"]:
+                return self.delete_repo(json.loads(body))
+            if method == "POST" and parts[:2] == ["api", "validate-yaml"]:
+                return self._send(200, {"errors": [], "warnings": []})
+            if method == "PUT" and parts[0] == "lfs-upload":
+                return self.lfs_upload(parts[1], body)
+            if method == "POST" and parts[-4:] == ["info", "lfs", "objects", "batch"]:
+                return self.lfs_batch(json.loads(body))
+            if parts[0] == "api" and parts[1] in REPO_KINDS and len(parts) >= 4:
+                repo_type = REPO_KINDS[parts[1]]
+                repo_id = f"{parts[2]}/{parts[3]}"
+                action, rest = (parts[4], parts[5:]) if len(parts) > 4 else ("info", [])
+                return self.repo_action(method, repo_type, repo_id, action, rest, query, body)
+        except (json.JSONDecodeError, KeyError) as e:
+            return self._error(400, f"Bad request: {e}")
+        self._error(404, f"No route for {method} {url.path}")
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PUT(self):
+        self._route("PUT")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+    # --- repos ---
+
+    def create_repo(self, payload):
+        self.server.stats["create"] += 1
+        repo_type = payload.get("type") or "model"
+        repo_id = f"{payload.get('organization') or 'local'}/{payload['name']}"
+        url = f"{self.server.endpoint}/{URL_PREFIXES[repo_type]}{repo_id}"
+        with self.server.lock:
+            if (repo_type, repo_id) in self.server.repos:
+                return self._send(409, {"error": "You already created this repo", "url": url})
+            self.server.repos[(repo_type, repo_id)] = Repo(repo_id, repo_type, payload)
+        self._send(200, {"url": url, "name": repo_id})
+
+    def delete_repo(self, payload):
+        self.server.stats["delete"] += 1
+        repo_type = payload.get("type") or "model"
+        repo_id = f"{payload.get('organization') or 'local'}/{payload['name']}"
+        with self.server.lock:
+            if self.server.repos.pop((repo_type, repo_id), None) is None:
+                return self._error(404, "Repository not found", "RepoNotFound")
+        self._send(200)
+
+    def repo_action(self, method, repo_type, repo_id, action, rest, query, body):
+        repo = self.server.get_repo(repo_type, repo_id)
+        if repo is None:
+            return self._error(404, "Repository not found", "RepoNotFound")
+
+        if method == "GET" and action in ("info", "revision"):
+            self.server.stats["info"] += 1
+            return self._send(200, repo.info())
+        if method == "GET" and action == "tree":
+            self.server.stats["tree"] += 1
+            path = "/".join(rest[1:])
+            return self._send(200, repo.tree(path, recursive=query.get("recursive", "").lower() == "true"))
+        if method == "POST" and action == "preupload":
+            self.server.stats["preupload"] += 1
+            return self.preupload(json.loads(body))
+        if method == "POST" and action == "commit":
+            self.server.stats["commit"] += 1
+            return self.commit(repo, body)
+        self._error(404, f"Unknown action {action}")
+
+    # --- uploads ---
+
+    def preupload(self, payload):
+        files = []
+        for f in payload["files"]:
+            sample = base64.b64decode(f["sample"])
+            lfs = f["size"] >= LFS_THRESHOLD or b"\0" in sample
+            files.append({"path": f["path"], "uploadMode": "lfs" if lfs else "regular", "shouldIgnore": False})
+        self._send(200, {"files": files})
+
+    def lfs_batch(self, payload):
+        self.server.stats["lfs_batch"] += 1
+        objects = []
+        for obj in payload["objects"]:
+            entry = {"oid": obj["oid"], "size": obj["size"]}
+            if obj["oid"] not in self.server.lfs:
+                entry["actions"] = {"upload": {"href": f"{self.server.endpoint}/lfs-upload/{obj['oid']}"}}
+            objects.append(entry)
+        self._send(200, {"transfer": "basic", "objects": objects})
+
+    def lfs_upload(self, oid, body):
+        self.server.stats["lfs_upload"] += 1
+        if hashlib.sha256(body).hexdigest() != oid:
+            return self._error(400, "Checksum mismatch")
+        self.server.lfs[oid] = len(body)
+        self._send(200)
+
+    def commit(self, repo, body):
+        lines = [json.loads(line) for line in body.splitlines() if line.strip()]
+        header = next((line["value"] for line in lines if line["key"] == "header"), {})
+
+        with repo.lock:
+            parent = header.get("parentCommit")
+            if parent and parent != repo.sha:
+                return self._error(412, f"Parent commit {parent} is not the head {repo.sha}")
+
+            files = dict(repo.files)
+            for line in lines:
+                key, value = line["key"], line["value"]
+                if key == "file":
+                    data = base64.b64decode(value["content"])
+                    files[value["path"]] = {"size": len(data), "oid": git_blob_sha1(data), "lfs": None}
+                elif key == "lfsFile":
+                    size = self.server.lfs.get(value["oid"])
+                    if size is None:
+                        return self._error(400, f"LFS object {value['oid']} was never uploaded")
+                    pointer = lfs_pointer(value["oid"], size)
+                    files[value["path"]] = {
+                        "size": size,
+                        "oid": git_blob_sha1(pointer),
+                        "lfs": value["oid"],
+                        "pointer_size": len(pointer),
+                    }
+                elif key == "deletedFile":
+                    if files.pop(value["path"], None) is None:
+                        return self._error(404, f"File {value['path']} does not exist", "EntryNotFound")
+                elif key == "deletedFolder":
+                    prefix = value["path"].rstrip("/") + "/"
+                    files = {p: m for p, m in files.items() if not p.startswith(prefix)}
+
+            repo.files = files
+            repo.sha = hashlib.sha1((repo.sha + body.decode("utf8", "replace")).encode()).hexdigest()
+            repo.commits.append(repo.sha)
+            sha = repo.sha
+
+        # CommitInfo parses this url against the default endpoint, so keep the public host
+        url = f"https://huggingface.co/{URL_PREFIXES[repo.repo_type]}{repo.repo_id}/commit/{sha}"
+        self._send(200, {"commitUrl": url, "commitOid": sha, "pullRequestUrl": None})
+
+
+# --- Run it on its own ---
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in Hugging Face Hub")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--bandwidth", type=float, default=None, help="bytes per second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503s")
+    args = parser.parse_args()
+
+    hub = LocalHub(port=args.port, latency=args.latency, bandwidth=args.bandwidth, error_rate=args.error_rate)
+    print(f"Local hub on {hub.endpoint} (HF_ENDPOINT={hub.endpoint})")
+    hub.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# Small-file packing for Space uploads
+# Thousands of tiny assets (icons, json, fonts) are grouped into size-bounded chunks,
+# the chunks are pre-uploaded concurrently (upload mode lookup + LFS transfers) and
+# everything then goes in a single commit on the expected parent, like the plain path
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from huggingface_hub import CommitOperationAdd
+from rich.table import Table
+
+from src.hfbulk import get_limiter, with_retry
+from src.utz import console, l_info, l_warning
+
+# Files at or above this size are treated as large and skip packing
+SMALL_FILE_SIZE = 1024 * 1024
+
+# Bounds of one pre-upload call. Regular files still go base64 encoded inside the one
+# commit payload, chunks only split the upload mode lookups. 256 matches the Hub's batch
+CHUNK_BYTES = 16 * 1024 * 1024
+CHUNK_FILES = 256
+
+
+#  ██████╗   █████╗   ██████╗ ██╗  ██╗
+#  ██╔══██╗ ██╔══██╗ ██╔════╝ ██║ ██╔╝
+#  ██████╔╝ ███████║ ██║      █████╔╝
+#  ██╔═══╝  ██╔══██║ ██║      ██╔═██╗
+#  ██║      ██║  ██║ ╚██████╗ ██║  ██╗
+#  ╚═╝      ╚═╝  ╚═╝  ╚═════╝ ╚═╝  ╚═╝
+
+def pack_chunks(operations, chunk_bytes=CHUNK_BYTES, chunk_files=CHUNK_FILES):
+    """
+    Split operations into consecutive chunks bounded by total size and file count.
+
+    Operations are kept in path order so a chunk tends to hold one directory.
+    A single file bigger than chunk_bytes gets a chunk of its own.
+    """
+    chunks, current, current_bytes = [], [], 0
+    for op in sorted(operations, key=lambda op: op.path_in_repo):
+        size = op.upload_info.size if isinstance(op, CommitOperationAdd) else 0
+        if current and (current_bytes + size > chunk_bytes or len(current) >= chunk_files):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(op)
+        current_bytes += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+@dataclass
+class PackReport:
+    files: int = 0
+    lfs_files: int = 0
+    large_files: int = 0
+    deletes: int = 0
+    chunks: int = 0
+    preuploads: int = 0
+    commits: int = 0
+    preupload_seconds: float = 0.0
+    commit_seconds: float = 0.0
+
+    @property
+    def calls(self):
+        """Pre-upload and commit calls actually made"""
+        return self.preuploads + self.commits
+
+    @property
+    def per_file_calls(self):
+        """Calls for the same work one file at a time (upload_file / delete_file each)"""
+        return self.files + self.deletes
+
+    @property
+    def saved(self):
+        return self.per_file_calls - self.calls
+
+
+def print_report(report, title="Packed Upload"):
+    table = Table(title=title, border_style="magenta")
+    for col in ("Files", "LFS", "Deletes", "Chunks", "Calls", "Per file", "Saved", "Seconds"):
+        table.add_column(col, justify="right")
+    table.add_row(
+        str(report.files),
+        str(report.lfs_files),
+        str(report.deletes),
+        str(report.chunks),
+        f"{report.preuploads} + {report.commits}",
+        str(report.per_file_calls),
+        str(report.saved),
+        f"{report.preupload_seconds:.2f} + {report.commit_seconds:.2f}",
+    )
+    console.print(table)
+
+
+#   ██████╗  ██████╗  ███╗   ███╗ ███╗   ███╗ ██╗ ████████╗
+#  ██╔════╝ ██╔═══██╗ ████╗ ████║ ████╗ ████║ ██║ ╚══██╔══╝
+#  ██║      ██║   ██║ ██╔████╔██║ ██╔████╔██║ ██║    ██║
+#  ██║      ██║   ██║ ██║╚██╔╝██║ ██║╚██╔╝██║ ██║    ██║
+#  ╚██████╗ ╚██████╔╝ ██║ ╚═╝ ██║ ██║ ╚═╝ ██║ ██║    ██║
+#   ╚═════╝  ╚═════╝  ╚═╝     ╚═╝ ╚═╝     ╚═╝ ╚═╝    ╚═╝
+
+def commit_packed(
+    api,
+    repo_id,
+    operations,
+    repo_type="model",
+    revision="main",
+    commit_message="Sync folder",
+    commit_description=None,
+    parent_commit=None,
+    small_file_size=SMALL_FILE_SIZE,
+    chunk_bytes=CHUNK_BYTES,
+    chunk_files=CHUNK_FILES,
+    workers=8,
+    rate=10.0,
+):
+    """
+    Pre-upload many operations in concurrent chunks, then commit them all at once.
+
+    1. Small files are packed into chunks, every chunk and the large files are
+       pre-uploaded at the same time (upload mode lookup + LFS for small binaries)
+    2. One create_commit with everything on parent_commit, exactly like the plain path
+
+    The commit is not retried: when only its response got lost a replay would fail on
+    the stale parent anyway. The caller's manifest is not moved, so the next sync plans
+    against the remote tree and only sends what is still missing.
+
+    Parameters:
+    - api (HfApi): Client to use
+    - repo_id (str): Repo to commit to
+    - operations (list): CommitOperationAdd / CommitOperationDelete
+    - parent_commit (str): Expected head of the branch
+    - small_file_size (int): Files below this size are packed
+    - chunk_bytes (int): Max bytes of small files per chunk
+    - chunk_files (int): Max files per chunk
+    - workers (int): Concurrent pre-upload requests
+    - rate (float): Requests per second allowed against the host
+
+    Returns:
+    - (CommitInfo, PackReport)
+    """
+    limiter = get_limiter(api.endpoint, rate)
+    adds = [op for op in operations if isinstance(op, CommitOperationAdd)]
+    deletes = [op for op in operations if not isinstance(op, CommitOperationAdd)]
+    large = [op for op in adds if op.upload_info.size >= small_file_size]
+    small = [op for op in adds if op.upload_info.size < small_file_size]
+
+    chunks = pack_chunks(small, chunk_bytes, chunk_files)
+    report = PackReport(files=len(adds), large_files=len(large), deletes=len(deletes), chunks=len(chunks))
+    l_info(f"Packing {len(small)} small files into {len(chunks)} chunks, {len(large)} large files via LFS")
+
+    def preupload(batch, num_threads=5):
+        # Idempotent (already uploaded LFS files are skipped), so safe to retry
+        with_retry(
+            lambda: api.preupload_lfs_files(
+                repo_id, additions=batch, repo_type=repo_type, revision=revision, num_threads=num_threads
+            ),
+            limiter=limiter,
+        )
+
+    # --- Pre-upload every chunk at the same time ---
+    start = time.perf_counter()
+    batches = ([(large, workers)] if large else []) + [(chunk, 5) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(preupload, batch, threads) for batch, threads in batches]:
+            future.result()
+    report.preuploads = len(batches)
+    # preupload_lfs_files returns nothing, the upload mode it fetched is only kept on the
+    # operation. create_commit skips additions marked uploaded and would look every regular
+    # file up again: mark them done too. Private attributes, checked against the pinned
+    # huggingface_hub 0.31.4 (uv.lock); without them the commit just fetches the modes again
+    for op in adds:
+        if getattr(op, "_upload_mode", None) == "regular" and hasattr(op, "_is_uploaded"):
+            op._is_uploaded = True
+    report.lfs_files = sum(1 for op in adds if getattr(op, "_upload_mode", None) == "lfs")
+    report.preupload_seconds = time.perf_counter() - start
+
+    # --- One commit with everything ---
+    start = time.perf_counter()
+    limiter.acquire()
+    try:
+        upload_result = api.create_commit(
+            repo_id=repo_id,
+            repo_type=repo_type,
+            operations=adds + deletes,
+            revision=revision,
+            commit_message=commit_message,
+            commit_description=commit_description,
+            parent_commit=parent_commit,
+        )
+    except Exception:
+        l_warning("Packed commit failed, LFS files already uploaded are reused by the next sync")
+        raise
+    report.commits = 1
+    report.commit_seconds = time.perf_counter() - start
+
+    print_report(report)
+    return upload_result, report
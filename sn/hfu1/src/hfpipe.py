@@ -0,0 +1,325 @@
+# Pipelined folder upload
+# walker -> hashing pool -> bounded upload queue (N transfers) -> one final commit
+# Every stage runs at the same time so the link is busy while the disk is still being read
+
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+
+from huggingface_hub import CommitOperationDelete, HfApi
+from rich.table import Table
+
+from src.hfhash import HashCache, add_operation, sha256_path
+from src.hfplan import (
+    SyncPlan,
+    deletable,
+    fetch_remote_tree,
+    load_tree,
+    remote_deletes,
+    same_as_remote,
+    save_tree,
+    tree_after_commit,
+)
+from src.hfsync import diff_manifest, iter_entries, load_manifest, save_manifest
+from src.utz import console, header1, l_info, l_warning
+
+# Marks the end of a queue
+_DONE = object()
+
+
+#  ███████╗ ████████╗  █████╗  ████████╗ ███████╗
+#  ██╔════╝ ╚══██╔══╝ ██╔══██╗ ╚══██╔══╝ ██╔════╝
+#  ███████╗    ██║    ███████║    ██║    ███████╗
+#  ╚════██║    ██║    ██╔══██║    ██║    ╚════██║
+#  ███████║    ██║    ██║  ██║    ██║    ███████║
+#  ╚══════╝    ╚═╝    ╚═╝  ╚═╝    ╚═╝    ╚══════╝
+
+@dataclass
+class StageStats:
+    name: str
+    files: int = 0
+    nbytes: int = 0
+    start: float = field(default_factory=time.perf_counter)
+    end: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, nbytes, files=1):
+        with self.lock:
+            self.files += files
+            self.nbytes += nbytes
+
+    def finish(self):
+        self.end = time.perf_counter()
+
+    @property
+    def seconds(self):
+        return (self.end or time.perf_counter()) - self.start
+
+
+def print_stats(stages, title="Pipeline Throughput"):
+    table = Table(title=title, border_style="magenta")
+    for col in ("Stage", "Files", "MB", "Seconds", "files/s", "MB/s"):
+        table.add_column(col, justify="left" if col == "Stage" else "right")
+    for s in stages:
+        secs = max(s.seconds, 1e-9)
+        table.add_row(
+            s.name,
+            str(s.files),
+            f"{s.nbytes / 1e6:.1f}",
+            f"{s.seconds:.2f}",
+            f"{s.files / secs:.1f}",
+            f"{s.nbytes / 1e6 / secs:.1f}",
+        )
+    console.print(table)
+
+
+def _put(q, item, stop):
+    # Blocking put that gives up when another stage has failed
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(q, stop):
+    # Blocking get that returns _DONE when another stage has failed
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+#  ██████╗  ██╗ ██████╗  ███████╗
+#  ██╔══██╗ ██║ ██╔══██╗ ██╔════╝
+#  ██████╔╝ ██║ ██████╔╝ █████╗
+#  ██╔═══╝  ██║ ██╔═══╝  ██╔══╝
+#  ██║      ██║ ██║      ███████╗
+#  ╚═╝      ╚═╝ ╚═╝      ╚══════╝
+
+def hf_pipeline_upload(
+    folder_path,
+    repo_id,
+    repo_type="model",
+    path_in_repo="",
+    token=None,
+    ignore_patterns=None,
+    commit_message="Sync folder",
+    commit_description=None,
+    revision="main",
+    endpoint=None,
+    hash_workers=4,
+    upload_workers=4,
+    queue_size=64,
+    batch_size=16,
+    delete_patterns=None,
+):
+    """
+    Streaming version of hf_sync_folder.
+
+    Parameters:
+    - hash_workers (int): Threads hashing files (hashlib drops the GIL on big buffers)
+    - upload_workers (int): Concurrent LFS transfers
+    - queue_size (int): Bound of each queue, a full queue pauses the stage feeding it
+    - batch_size (int): Files handed to one preupload call
+    - delete_patterns (list[str]): Also delete remote files matching these that are gone locally
+    - everything else: same as hf_sync_folder
+
+    Returns:
+    - CommitInfo, or None when there was nothing to upload
+    """
+    header1(f"Pipeline sync {folder_path} -> {repo_id}")
+    api = HfApi(endpoint=endpoint, token=token)
+
+    saved = load_manifest(folder_path)
+    head = api.repo_info(repo_id, repo_type=repo_type, revision=revision).sha
+    target = {"repo_id": repo_id, "repo_type": repo_type, "path_in_repo": path_in_repo}
+    same_target = all(saved.get(k) == v for k, v in target.items())
+    fresh = saved.get("commit") == head and same_target
+    # Local hashes stay good either way, only what the remote has is in doubt
+    old_files = saved["files"]
+    prefix = f"{path_in_repo.strip('/')}/" if path_in_repo else ""
+
+    # Same fallback as hf_sync_folder: diff against the remote tree (cached per commit)
+    tree = None
+    if not fresh or delete_patterns:
+        if not fresh:
+            l_warning("No manifest for the current remote commit, planning against the remote tree")
+        tree = fetch_remote_tree(api, repo_id, repo_type, head)
+
+    def unchanged(relpath, meta):
+        if fresh:
+            return old_files.get(relpath, {}).get("sha256") == meta["sha256"]
+        return same_as_remote(folder_path, relpath, meta, tree.get(prefix + relpath))
+
+    hash_q = queue.Queue(maxsize=queue_size)
+    upload_q = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+    files, operations = {}, []
+    state_lock = threading.Lock()
+    cache = HashCache()
+    new_hashes = []
+
+    walk_stats = StageStats("walk")
+    hash_stats = StageStats("hash")
+    upload_stats = StageStats("upload")
+
+    # --- Stage 1: walk the folder, skip files the manifest already vouches for ---
+
+    def walker():
+        try:
+            for relpath, entry in iter_entries(folder_path, ignore_patterns=ignore_patterns):
+                st = entry.stat()
+                walk_stats.add(st.st_size)
+                old = old_files.get(relpath)
+                if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime_ns:
+                    with state_lock:
+                        files[relpath] = old
+                    if not unchanged(relpath, old):
+                        # Hash already known, straight to the transfers
+                        abspath = os.path.join(folder_path, relpath)
+                        _put(upload_q, add_operation(abspath, prefix + relpath, old["sha256"]), stop)
+                    continue
+                _put(hash_q, (relpath, st), stop)
+                if stop.is_set():
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            walk_stats.finish()
+            for _ in range(hash_workers):
+                _put(hash_q, _DONE, stop)
+
+    # --- Stage 2: hash, then queue anything that really changed ---
+
+    def hasher():
+        try:
+            while True:
+                item = _get(hash_q, stop)
+                if item is _DONE:
+                    return
+                relpath, st = item
+                abspath = os.path.join(folder_path, relpath)
+                sha = cache.get(abspath, st)
+                if sha is None:
+                    sha = sha256_path(abspath)
+                    with state_lock:
+                        new_hashes.append((abspath, st, sha))
+                hash_stats.add(st.st_size)
+                meta = {"size": st.st_size, "mtime": st.st_mtime_ns, "sha256": sha}
+                with state_lock:
+                    files[relpath] = meta
+                if unchanged(relpath, meta):
+                    continue  # touched but not modified
+                _put(upload_q, add_operation(abspath, prefix + relpath, sha), stop)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
+    # --- Stage 3: N concurrent transfers, LFS files go up before the commit ---
+
+    def uploader():
+        while True:
+            op = _get(upload_q, stop)
+            if op is _DONE:
+                return
+            batch = [op]
+            done = False
+            # Grab whatever else is already waiting, up to batch_size
+            while len(batch) < batch_size:
+                try:
+                    op = upload_q.get_nowait()
+                except queue.Empty:
+                    break
+                if op is _DONE:
+                    done = True
+                    break
+                batch.append(op)
+            try:
+                api.preupload_lfs_files(repo_id, additions=batch, repo_type=repo_type, revision=revision)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+                return
+            upload_stats.add(sum(op.upload_info.size for op in batch), files=len(batch))
+            with state_lock:
+                operations.extend(batch)
+            if done:
+                return
+
+    walker_thread = threading.Thread(target=walker, name="hf-walk", daemon=True)
+    hash_threads = [threading.Thread(target=hasher, name=f"hf-hash-{i}", daemon=True) for i in range(hash_workers)]
+    upload_threads = [
+        threading.Thread(target=uploader, name=f"hf-upload-{i}", daemon=True) for i in range(upload_workers)
+    ]
+    for t in [walker_thread, *hash_threads, *upload_threads]:
+        t.start()
+
+    walker_thread.join()
+    for t in hash_threads:
+        t.join()
+    hash_stats.finish()
+    for _ in range(upload_workers):
+        _put(upload_q, _DONE, stop)
+    for t in upload_threads:
+        t.join()
+    upload_stats.finish()
+
+    cache.put_many(new_hashes)
+    cache.close()
+    if errors:
+        raise errors[0]
+
+    # --- Stage 4: one commit with everything ---
+
+    if fresh:
+        _, removed = diff_manifest(old_files, files)
+        removed = deletable(removed, ignore_patterns)
+    else:
+        removed = []
+    if tree is not None:
+        # Only what our last sync of this target uploaded, or what delete_patterns asks for
+        known = old_files if same_target else {}
+        extra = remote_deletes(files, tree, path_in_repo, ignore_patterns, known=known, delete_patterns=delete_patterns)
+        removed = sorted(set(removed) | set(extra))
+    operations.sort(key=lambda op: op.path_in_repo)
+    print_stats([walk_stats, hash_stats, upload_stats])
+
+    if not operations and not removed:
+        l_info(f"Nothing changed since {head[:8]}, skipping commit")
+        save_manifest(folder_path, {**target, "commit": head, "files": files})
+        return None
+
+    l_info(f"Committing {len(operations)} changed, {len(removed)} removed")
+    upload_result = api.create_commit(
+        repo_id=repo_id,
+        repo_type=repo_type,
+        operations=operations + [CommitOperationDelete(path_in_repo=prefix + p) for p in removed],
+        revision=revision,
+        commit_message=commit_message,
+        commit_description=commit_description,
+        parent_commit=head,
+    )
+
+    # Only a successful commit moves the manifest (and the cached tree) forward
+    save_manifest(folder_path, {**target, "commit": upload_result.oid, "files": files})
+    if tree is None:
+        tree = load_tree(repo_id, repo_type, head)
+    if tree is not None:
+        changed = [op.path_in_repo[len(prefix):] for op in operations]
+        plan = SyncPlan(
+            head=head,
+            adds=[p for p in changed if prefix + p not in tree],
+            updates=[p for p in changed if prefix + p in tree],
+            deletes=removed,
+        )
+        save_tree(repo_id, repo_type, upload_result.oid, tree_after_commit(tree, plan, files, path_in_repo))
+    console.print(f"✅ Synced {folder_path} at {upload_result.oid[:8]}")
+    return upload_result
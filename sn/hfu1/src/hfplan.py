@@ -0,0 +1,239 @@
+# Remote tree cache and minimal-diff commit planner
+# The remote file listing is fetched once per commit SHA and kept in .hfcache/trees,
+# then compared with the local folder to get the smallest add / update / delete set.
+# Only files a previous sync uploaded (or ones matching delete_patterns) are ever deleted
+
+import glob
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+
+from rich.table import Table
+
+from src.hfhash import CACHE_DIR
+from src.hfwalk import PatternMatcher
+from src.utz import console, l_info
+
+# Remote files a sync never deletes, even if the local folder does not have them
+KEEP_PATTERNS = [".gitattributes", "README.md"]
+
+# Cached trees kept per repo, older ones are removed
+TREES_KEPT = 5
+
+
+#  ████████╗ ██████╗  ███████╗ ███████╗
+#  ╚══██╔══╝ ██╔══██╗ ██╔════╝ ██╔════╝
+#     ██║    ██████╔╝ █████╗   █████╗
+#     ██║    ██╔══██╗ ██╔══╝   ██╔══╝
+#     ██║    ██║  ██║ ███████╗ ███████╗
+#     ╚═╝    ╚═╝  ╚═╝ ╚══════╝ ╚══════╝
+
+def _tree_dir(repo_id, repo_type):
+    return os.path.join(CACHE_DIR, "trees", repo_type, repo_id.replace("/", "--"))
+
+
+def load_tree(repo_id, repo_type, sha):
+    try:
+        with open(os.path.join(_tree_dir(repo_id, repo_type), f"{sha}.json"), encoding="utf8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_tree(repo_id, repo_type, sha, tree):
+    folder = _tree_dir(repo_id, repo_type)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{sha}.json")
+    with open(path + ".tmp", "w", encoding="utf8") as f:
+        json.dump(tree, f)
+    os.replace(path + ".tmp", path)
+
+    # Only the last few commits are ever looked up again
+    old = sorted(glob.glob(os.path.join(folder, "*.json")), key=os.path.getmtime)[:-TREES_KEPT]
+    for p in old:
+        os.remove(p)
+
+
+def fetch_remote_tree(api, repo_id, repo_type, sha):
+    """
+    Remote files at a commit: path -> {"size", "sha256", "blob_id"}.
+
+    sha256 is only known for LFS files (and files we committed ourselves),
+    blob_id is the git object id the Hub reports for regular files.
+    """
+    tree = load_tree(repo_id, repo_type, sha)
+    if tree is not None:
+        l_info(f"Remote tree for {sha[:8]} from cache ({len(tree)} files)")
+        return tree
+
+    tree = {}
+    for item in api.list_repo_tree(repo_id, repo_type=repo_type, revision=sha, recursive=True):
+        if not hasattr(item, "blob_id"):
+            continue  # folders
+        tree[item.path] = {
+            "size": item.size,
+            "sha256": item.lfs.sha256 if item.lfs else None,
+            "blob_id": None if item.lfs else item.blob_id,
+        }
+    l_info(f"Listed remote tree for {sha[:8]} ({len(tree)} files)")
+    save_tree(repo_id, repo_type, sha, tree)
+    return tree
+
+
+def git_blob_sha1(path):
+    """The git object id of a local file, what the Hub reports for non-LFS files"""
+    with open(path, "rb") as f:
+        data = f.read()
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+#  ██████╗  ██╗       █████╗  ███╗   ██╗
+#  ██╔══██╗ ██║      ██╔══██╗ ████╗  ██║
+#  ██████╔╝ ██║      ███████║ ██╔██╗ ██║
+#  ██╔═══╝  ██║      ██╔══██║ ██║╚██╗██║
+#  ██║      ███████╗ ██║  ██║ ██║ ╚████║
+#  ╚═╝      ╚══════╝ ╚═╝  ╚═╝ ╚═╝  ╚═══╝
+
+@dataclass
+class SyncPlan:
+    head: str
+    adds: list = field(default_factory=list)
+    updates: list = field(default_factory=list)
+    deletes: list = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def changed(self):
+        return sorted(self.adds + self.updates)
+
+    @property
+    def empty(self):
+        return not (self.adds or self.updates or self.deletes)
+
+
+def same_as_remote(folder, relpath, meta, remote):
+    """True when the remote file already has the local content"""
+    if remote is None or remote["size"] != meta["size"]:
+        return False
+    if remote["sha256"] is not None:
+        return remote["sha256"] == meta["sha256"]
+    return remote["blob_id"] == git_blob_sha1(os.path.join(folder, relpath))
+
+
+def _leave_alone(ignore_patterns=None, keep_patterns=KEEP_PATTERNS):
+    # match_file() is False for paths a sync must never delete: ignored or kept files
+    return PatternMatcher(ignore_patterns=list(ignore_patterns or []) + list(keep_patterns))
+
+
+def deletable(removed, ignore_patterns=None, keep_patterns=KEEP_PATTERNS):
+    """
+    Manifest removals that may really be deleted remotely.
+
+    A file that only dropped out of the manifest because it is ignored now (or kept, like
+    README.md) stays on the remote, the same as when planning against the remote tree.
+    """
+    leave_alone = _leave_alone(ignore_patterns, keep_patterns)
+    return [relpath for relpath in removed if leave_alone.match_file(relpath)]
+
+
+def remote_deletes(
+    files,
+    tree,
+    path_in_repo="",
+    ignore_patterns=None,
+    keep_patterns=KEEP_PATTERNS,
+    known=None,
+    delete_patterns=None,
+):
+    """
+    Remote files under the prefix that are gone locally and may go.
+
+    Like upload_folder, nothing is deleted unless we know it is ours: a path the previous
+    manifest recorded (uploaded by this tool), or one matching delete_patterns.
+    Files someone else pushed are left alone.
+
+    Returns:
+    - list[str]: Paths relative to path_in_repo
+    """
+    prefix = f"{path_in_repo.strip('/')}/" if path_in_repo else ""
+    known = known or {}
+    prune = PatternMatcher(allow_patterns=list(delete_patterns)) if delete_patterns else None
+    leave_alone = _leave_alone(ignore_patterns, keep_patterns)
+    deletes = []
+    for path in sorted(tree):
+        relpath = path[len(prefix):]
+        if not path.startswith(prefix) or relpath in files or not leave_alone.match_file(relpath):
+            continue
+        if relpath in known or (prune is not None and prune.match_file(relpath)):
+            deletes.append(relpath)
+    return deletes
+
+
+def plan_against_tree(
+    folder,
+    files,
+    tree,
+    path_in_repo="",
+    ignore_patterns=None,
+    keep_patterns=KEEP_PATTERNS,
+    known=None,
+    delete_patterns=None,
+):
+    """
+    Smallest set of operations turning the remote tree into the local folder.
+
+    Parameters:
+    - folder (str): Local folder
+    - files (dict): Local manifest, path -> {"size", "mtime", "sha256"}
+    - tree (dict): Remote tree from fetch_remote_tree
+    - path_in_repo (str): Remote folder the local one maps to
+    - ignore_patterns (list[str]): Remote files matching these are left alone
+    - keep_patterns (list[str]): Remote files never deleted
+    - known (dict): Files of the previous manifest for this target, the only ones deleted by default
+    - delete_patterns (list[str]): Also delete remote files matching these when they are gone locally
+
+    Returns:
+    - SyncPlan (head is left empty)
+    """
+    prefix = f"{path_in_repo.strip('/')}/" if path_in_repo else ""
+    plan = SyncPlan(head="")
+
+    for relpath, meta in sorted(files.items()):
+        remote = tree.get(prefix + relpath)
+        if remote is None:
+            plan.adds.append(relpath)
+        elif not same_as_remote(folder, relpath, meta, remote):
+            plan.updates.append(relpath)
+    plan.unchanged = len(files) - len(plan.adds) - len(plan.updates)
+    plan.deletes = remote_deletes(files, tree, path_in_repo, ignore_patterns, keep_patterns, known, delete_patterns)
+    return plan
+
+
+def tree_after_commit(tree, plan, files, path_in_repo=""):
+    """Remote tree once the plan is committed, so the next sync does not list it again"""
+    prefix = f"{path_in_repo.strip('/')}/" if path_in_repo else ""
+    tree = dict(tree)
+    for relpath in plan.deletes:
+        tree.pop(prefix + relpath, None)
+    for relpath in plan.changed:
+        tree[prefix + relpath] = {"size": files[relpath]["size"], "sha256": files[relpath]["sha256"], "blob_id": None}
+    return tree
+
+
+def print_plan(plan, title="Sync Plan", max_rows=50):
+    table = Table(title=title, border_style="magenta")
+    table.add_column("Op")
+    table.add_column("Path", style="cyan")
+    rows = [("add", p, "green") for p in plan.adds]
+    rows += [("update", p, "yellow") for p in plan.updates]
+    rows += [("delete", p, "red") for p in plan.deletes]
+    for op, p, colour in rows[:max_rows]:
+        table.add_row(f"[{colour}]{op}[/{colour}]", p)
+    if len(rows) > max_rows:
+        table.add_row("...", f"{len(rows) - max_rows} more")
+    console.print(table)
+    console.print(
+        f"{len(plan.adds)} add, {len(plan.updates)} update, {len(plan.deletes)} delete, "
+        f"{plan.unchanged} unchanged against {plan.head[:8]}"
+    )
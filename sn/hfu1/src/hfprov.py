@@ -0,0 +1,188 @@
+# Manifest driven provisioning of repos and spaces
+# One YAML / JSON file lists every repo with its settings and local folder,
+# repos are created concurrently under the shared rate limiter and their folders
+# synced in the same run. Re-running it only does what is missing
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from huggingface_hub import HfApi
+from rich.table import Table
+
+from src.hfbulk import get_limiter, with_retry
+from src.hfsync import hf_sync_folder
+from src.utz import console, header1, l_error
+
+# Keys a repo entry (or the defaults block) may use
+CREATE_KEYS = {"repo_type", "private", "space_sdk", "space_hardware", "space_storage", "space_sleep_time"}
+UPLOAD_KEYS = {"folder", "path_in_repo", "ignore_patterns", "delete_patterns", "commit_message"}
+REPO_KEYS = {"repo_id", "secrets", "variables"} | CREATE_KEYS | UPLOAD_KEYS
+
+
+#  ███╗   ███╗  █████╗  ███╗   ██╗ ██╗ ███████╗ ███████╗ ███████╗ ████████╗
+#  ████╗ ████║ ██╔══██╗ ████╗  ██║ ██║ ██╔════╝ ██╔════╝ ██╔════╝ ╚══██╔══╝
+#  ██╔████╔██║ ███████║ ██╔██╗ ██║ ██║ █████╗   █████╗   ███████╗    ██║
+#  ██║╚██╔╝██║ ██╔══██║ ██║╚██╗██║ ██║ ██╔══╝   ██╔══╝   ╚════██║    ██║
+#  ██║ ╚═╝ ██║ ██║  ██║ ██║ ╚████║ ██║ ██║      ███████╗ ███████║    ██║
+#  ╚═╝     ╚═╝ ╚═╝  ╚═╝ ╚═╝  ╚═══╝ ╚═╝ ╚═╝      ╚══════╝ ╚══════╝    ╚═╝
+
+def load_provision(path):
+    """
+    Read a provisioning manifest, see provision.yaml for the format.
+
+    Every entry is merged over the `defaults` block and relative folders are
+    resolved against the manifest's own directory.
+
+    Returns:
+    - list[dict]: One spec per repo
+    """
+    with open(path, encoding="utf8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # comes with huggingface_hub
+
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    defaults = data.get("defaults") or {}
+    base = os.path.dirname(os.path.abspath(path))
+    specs, seen = [], set()
+    for i, entry in enumerate(data.get("repos") or []):
+        spec = {"repo_type": "model", **defaults, **entry}
+        unknown = set(spec) - REPO_KEYS
+        if unknown:
+            raise ValueError(f"Repo entry {i} has unknown keys: {', '.join(sorted(unknown))}")
+        if "repo_id" not in spec:
+            raise ValueError(f"Repo entry {i} has no repo_id")
+        key = (spec["repo_type"], spec["repo_id"])
+        if key in seen:
+            raise ValueError(f"{spec['repo_type']} {spec['repo_id']} is listed twice")
+        seen.add(key)
+        if spec.get("folder"):
+            spec["folder"] = os.path.join(base, spec["folder"])
+        specs.append(spec)
+    return specs
+
+
+def _create_kwargs(spec):
+    kwargs = {k: spec[k] for k in CREATE_KEYS if k in spec}
+    if spec["repo_type"] != "space":
+        kwargs = {k: v for k, v in kwargs.items() if not k.startswith("space_")}
+    else:
+        # Secrets are listed by env var name so the manifest can be committed
+        secrets = [{"key": name, "value": os.environ[name]} for name in spec.get("secrets", []) if name in os.environ]
+        if secrets:
+            kwargs["space_secrets"] = secrets
+        if spec.get("variables"):
+            kwargs["space_variables"] = [{"key": k, "value": str(v)} for k, v in spec["variables"].items()]
+    return kwargs
+
+
+#  ██████╗  ██████╗   ██████╗  ██╗   ██╗
+#  ██╔══██╗ ██╔══██╗ ██╔═══██╗ ██║   ██║
+#  ██████╔╝ ██████╔╝ ██║   ██║ ██║   ██║
+#  ██╔═══╝  ██╔══██╗ ██║   ██║ ╚██╗ ██╔╝
+#  ██║      ██║  ██║ ╚██████╔╝  ╚████╔╝
+#  ╚═╝      ╚═╝  ╚═╝  ╚═════╝    ╚═══╝
+
+@dataclass
+class ProvisionResult:
+    repo_id: str
+    repo_type: str
+    status: str  # "created", "exists" or "failed"
+    upload: str = ""  # commit id, "up to date" or "" when there is no folder
+    seconds: float = 0.0
+    error: str = ""
+
+    @property
+    def ok(self):
+        return self.status != "failed" and self.upload != "failed"
+
+
+def provision(specs, token=None, endpoint=None, max_workers=8, rate=10.0, upload=True):
+    """
+    Create every repo in the specs and sync its folder, concurrently.
+
+    Existing repos are left as they are (create_repo with exist_ok) and their
+    folders go through the incremental sync, so a second run is cheap.
+
+    Parameters:
+    - specs (list[dict] | str): Output of load_provision, or the manifest path
+    - token (str): Hugging Face token
+    - endpoint (str): Hub url, point it at a local stand-in server for testing
+    - max_workers (int): Repos handled at the same time
+    - rate (float): Create requests per second allowed against the host
+    - upload (bool): Also sync each repo's folder
+
+    Returns:
+    - list[ProvisionResult]: One entry per repo, in manifest order
+    """
+    if isinstance(specs, str):
+        specs = load_provision(specs)
+    header1(f"Provisioning {len(specs)} repos")
+    api = HfApi(endpoint=endpoint, token=token)
+    limiter = get_limiter(api.endpoint, rate)
+
+    def provision_one(spec):
+        repo_id, repo_type = spec["repo_id"], spec["repo_type"]
+        start = time.perf_counter()
+        result = ProvisionResult(repo_id, repo_type, "failed")
+        try:
+            exists = with_retry(lambda: api.repo_exists(repo_id, repo_type=repo_type), limiter=limiter)
+            if not exists:
+                with_retry(
+                    lambda: api.create_repo(repo_id, exist_ok=True, **_create_kwargs(spec)),
+                    limiter=limiter,
+                )
+            result.status = "exists" if exists else "created"
+
+            if upload and spec.get("folder"):
+                upload_result = hf_sync_folder(
+                    spec["folder"],
+                    repo_id,
+                    repo_type=repo_type,
+                    path_in_repo=spec.get("path_in_repo", ""),
+                    token=token,
+                    ignore_patterns=spec.get("ignore_patterns"),
+                    delete_patterns=spec.get("delete_patterns"),
+                    commit_message=spec.get("commit_message", "Provision folder"),
+                    endpoint=endpoint,
+                )
+                result.upload = upload_result.oid[:8] if upload_result is not None else "up to date"
+        except Exception as e:
+            # A failed upload keeps the create status, the next run retries the folder only
+            if result.status != "failed":
+                result.upload = "failed"
+            result.error = str(e)
+            l_error(f"{repo_id}: {e}")
+        result.seconds = time.perf_counter() - start
+        return result
+
+    results = [None] * len(specs)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(provision_one, spec): i for i, spec in enumerate(specs)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def print_provision(results, title="Provisioning Report"):
+    table = Table(title=title, border_style="magenta")
+    table.add_column("Repo", style="cyan")
+    table.add_column("Type")
+    table.add_column("Status")
+    table.add_column("Upload")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Error", style="red")
+    colours = {"created": "green", "exists": "blue", "failed": "red"}
+    for r in results:
+        colour = colours[r.status]
+        table.add_row(
+            r.repo_id, r.repo_type, f"[{colour}]{r.status}[/{colour}]", r.upload, f"{r.seconds:.2f}", r.error[:60]
+        )
+    console.print(table)
+    failed = sum(1 for r in results if not r.ok)
+    console.print(f"{len(results) - failed} ok, {failed} failed")
@@ -1,14 +1,17 @@
 # This python file is for creating and uploading files to huggingface
 
+from src.hfbulk import bulk_delete, print_report
+from src.hfpipe import hf_pipeline_upload
+from src.hfprov import print_provision, provision
+from src.hfsync import hf_sync_folder
 from src.utz import header1, header2
 import os
+from functools import partial
 from dotenv import load_dotenv
 from huggingface_hub import (
     create_repo,
     SpaceHardware,
     SpaceStorage,
-    upload_folder,
-    delete_repo,
 )
 
 # Loading the env file
@@ -23,6 +26,7 @@ def hf_repo_ops():
     """
     # hf_create_repo()
     # hf_upload_dirz()
+    # hf_provision_repos()
     hf_delete_repos()
 
 # --- Function for creating a repo ---
@@ -59,38 +63,47 @@ def hf_create_repo():
 
 
 def hf_upload_dirz():
-    header1("Uploading a Folder to Hugging Face Repository")
     """
-    Upload a folder to a Hugging Face repository.
-
-    Parameters Reference for upload_folder:
-    ---------------------------------------
-    - repo_id (str): The repository to upload to (e.g., "username/my-model")
-    - folder_path (str | Path): Path to the local folder you want to upload
-    - path_in_repo (str, optional): Target directory in the repo (default: root)
-    - token (str | bool | None): Hugging Face token (None uses default local auth)
-    - repo_type (str, optional): "model", "dataset", or "space" (default: "model")
-    - revision (str, optional): Git branch or commit SHA (default: "main")
-    - commit_message (str, optional): Short commit summary/title
-    - commit_description (str, optional): Longer commit body/description
-    - create_pr (bool, optional): If True, opens a pull request instead of committing directly
-    - parent_commit (str, optional): Expected parent commit SHA (to prevent race conditions)
-    - allow_patterns (list[str] or str, optional): Only upload files matching these glob patterns
-    - ignore_patterns (list[str] or str, optional): Skip files matching these glob patterns
-    - delete_patterns (list[str] or str, optional): Remove remote files matching these patterns
-    - run_as_future (bool, optional): If True, runs in background and returns Future
+    Upload the changes in a local folder to a Hugging Face repository.
+
+    Only files added or changed since the last sync are sent (src/hfsync.py), against a
+    manifest kept beside the folder. Set at most one of the mode toggles in the body,
+    with none set it is a plain sync in one commit:
+    - pipeline: src/hfpipe.py walks, hashes and uploads at the same time (big folders, many files)
+    - dry_run: src/hfplan.py only prints and returns the add / update / delete plan
+
+    The call passes folder_path, path_in_repo, repo_id, token, repo_type, commit_message
+    and commit_description, see hf_sync_folder for the rest.
 
     Returns:
-        CommitInfo or Future: The result of the upload.
+        CommitInfo or None: The commit, None if nothing changed (SyncPlan with dry_run).
+
+    Raises:
+        ValueError: More than one mode toggle is set.
     """
+    header1("Uploading a Folder to Hugging Face Repository")
 
     # Folder to upload
     local_folder_path = "TEMP/"  # Path to your local folder
     repo_id = "Liqo/MakefromPy2"  # Your Hugging Face repo
     path_in_repo = ""  # Upload to repo root (change to subdir like "folder/" if needed)
 
-    # Upload the folder
-    upload_result = upload_folder(
+    # Upload mode, set at most one of these True
+    # pipeline: walk, hash and upload at the same time (big folders, many files)
+    # dry_run: only print the add / update / delete plan, nothing is committed
+    pipeline = False
+    dry_run = False
+    if pipeline and dry_run:
+        raise ValueError("pipeline and dry_run are separate upload modes, set only one")
+    if pipeline:
+        sync = hf_pipeline_upload
+    elif dry_run:
+        sync = partial(hf_sync_folder, dry_run=True)
+    else:
+        sync = hf_sync_folder
+
+    # Upload only what changed since the last sync (manifest kept in TEMP.hfmanifest.json)
+    upload_result = sync(
         folder_path=local_folder_path,
         path_in_repo=path_in_repo,
         repo_id=repo_id,
@@ -98,13 +111,43 @@ def hf_upload_dirz():
         repo_type="model",  # Change to "dataset" or "space" if needed
         commit_message="Smell Panty",
         commit_description="bootySmelling Now",
-        create_pr=False,  # Set to True if you want to create a PR instead
     )
 
-    print(f"✅ Uploaded folder to: {upload_result.commit_url}")
+    if upload_result is not None and not dry_run:
+        print(f"✅ Uploaded folder to: {upload_result.commit_url}")
     return upload_result
 
 
+# --- Provisioning many repos from a manifest ---
+
+
+def hf_provision_repos():
+    header1("Provisioning Hugging Face Repositories from a Manifest")
+    """
+    Create every repo and space listed in a YAML / JSON manifest and upload their folders.
+
+    Parameters:
+    - manifest_path (str): Manifest file, see provision.yaml for the format
+    - token (str): Hugging Face token
+    - max_workers (int): Repos handled in parallel
+    - rate (float): Create requests per second
+
+    Returns:
+    - list[ProvisionResult]: Per repo result report
+    """
+
+    # Config
+    manifest_path = "provision.yaml"
+    token = hf_token
+    max_workers = 8
+    rate = 10.0
+
+    # Existing repos are skipped, folders only send what changed since the last run
+    results = provision(manifest_path, token=token, max_workers=max_workers, rate=rate)
+    print_provision(results)
+    return results
+
+
 # --- Deleteing Spaces ---
 
 
@@ -119,9 +162,10 @@ def hf_delete_repos():
     - token (str): Hugging Face token
     - repo_type (str): "model", "dataset", or "space"
     - missing_ok (bool): Skip error if repo is missing
+    - max_workers (int): Number of repos deleted in parallel
 
     Returns:
-    - None
+    - list[BulkResult]: Per repo result report
     """
 
     # Config
@@ -129,12 +173,15 @@ def hf_delete_repos():
     repo_type = "model"
     token = hf_token
     missing_ok = True
-
-    for repo_id in repo_ids:
-        try:
-            delete_repo(
-                repo_id=repo_id, token=token, repo_type=repo_type, missing_ok=missing_ok
-            )
-            print(f"✅ Deleted: {repo_id}")
-        except Exception as e:
-            print(f"❌ Failed to delete {repo_id}: {e}")
+    max_workers = 8
+
+    # Delete them all at once through the bulk engine
+    results = bulk_delete(
+        repo_ids,
+        repo_type=repo_type,
+        token=token,
+        max_workers=max_workers,
+        missing_ok=missing_ok,
+    )
+    print_report(results)
+    return results
@@ -1,13 +1,16 @@
 # These python functions are for making a space and uploading to a space
 
 import os
+from functools import partial
 
 from dotenv import load_dotenv
 from huggingface_hub import (
     create_repo,
-    delete_repo,
-    upload_folder,
 )
+from src.hfbulk import bulk_delete, print_report
+from src.hfpipe import hf_pipeline_upload
+from src.hfsync import hf_sync_folder
+from src.hfwatch import hf_watch_sync
 from src.utz import header1, header2
 
 # Loading the env file
@@ -17,6 +20,23 @@ hf_token = os.getenv("HF")
 # Main Repo ID here
 REPO_ID = "Wornu/privid"
 
+# Files that never go up to the space
+IGNORE_PATTERNS = [
+    ".venv",
+    ".venv/*",
+    "__pycache__",
+    "*.pyc",
+    ".env",
+    ".env/*",
+    "node_modules/",
+    ".gitignore",
+    "eslint*",
+    ".vercel/",
+    "*.toml",
+    "uv.lock",
+    ".python-version",
+]
+
 
 #  ███████╗ ██╗   ██╗ ███╗   ██╗  ██████╗
 #  ██╔════╝ ██║   ██║ ████╗  ██║ ██╔════╝
@@ -33,6 +53,7 @@ def hf_space_ops():
     # hf_delete_spaces()
     hf_create_space()
     hf_upload_dirz()
+    # hf_watch_space()  # Keep the space in sync while editing, Ctrl+C to stop
 
 
 # --- Function for creating a repo ---
@@ -85,67 +106,90 @@ def hf_create_space():
 #   ╚═════╝  ╚══════╝
 
 def hf_upload_dirz():
-    header1("Uploading a Folder to Hugging Face Repository")
     """
-    Upload a folder to a Hugging Face repository.
-
-    Parameters Reference for upload_folder:
-    ---------------------------------------
-    - repo_id (str): The repository to upload to (e.g., "username/my-model")
-    - folder_path (str | Path): Path to the local folder you want to upload
-    - path_in_repo (str, optional): Target directory in the repo (default: root)
-    - token (str | bool | None): Hugging Face token (None uses default local auth)
-    - repo_type (str, optional): "model", "dataset", or "space" (default: "model")
-    - revision (str, optional): Git branch or commit SHA (default: "main")
-    - commit_message (str, optional): Short commit summary/title
-    - commit_description (str, optional): Longer commit body/description
-    - create_pr (bool, optional): If True, opens a pull request instead of committing directly
-    - parent_commit (str, optional): Expected parent commit SHA (to prevent race conditions)
-    - allow_patterns (list[str] or str, optional): Only upload files matching these glob patterns
-    - ignore_patterns (list[str] or str, optional): Skip files matching these glob patterns
-    - delete_patterns (list[str] or str, optional): Remove remote files matching these patterns
-    - run_as_future (bool, optional): If True, runs in background and returns Future
+    Upload the changes in a local folder to a Hugging Face repository.
+
+    Only files added or changed since the last sync are sent (src/hfsync.py), against a
+    manifest kept beside the folder. Set at most one of the mode toggles in the body,
+    with none set it is a plain sync in one commit:
+    - pipeline: src/hfpipe.py walks, hashes and uploads at the same time (big folders, many files)
+    - pack: src/hfpack.py pre-uploads small files in concurrent chunks, then makes one commit
+      (Spaces with thousands of tiny assets)
+    - dry_run: src/hfplan.py only prints and returns the add / update / delete plan
+
+    The call passes folder_path, path_in_repo, repo_id, token, ignore_patterns, repo_type,
+    commit_message and commit_description, see hf_sync_folder for the rest.
 
     Returns:
-        CommitInfo or Future: The result of the upload.
+        CommitInfo or None: The commit, None if nothing changed (SyncPlan with dry_run).
+
+    Raises:
+        ValueError: More than one mode toggle is set.
     """
+    header1("Uploading a Folder to Hugging Face Repository")
 
     # Folder to upload
     local_folder_path = "../WX/mywo/vg1/UL/"  # Path to your local folder
     # Upload to repo root (change to subdir like "folder/" if needed)
     path_in_repo = ""
 
-    # Upload the folder
-    upload_result = upload_folder(
+    # Upload mode, set at most one of these True
+    # pipeline: walk, hash and upload at the same time (big folders, many files)
+    # pack: Spaces with thousands of small assets, concurrent pre-upload then one commit
+    # dry_run: only print the add / update / delete plan, nothing is committed
+    pipeline = False
+    pack = False
+    dry_run = False
+    if pipeline + pack + dry_run > 1:
+        raise ValueError("pipeline, pack and dry_run are separate upload modes, set only one")
+    if pipeline:
+        sync = hf_pipeline_upload
+    elif pack:
+        sync = partial(hf_sync_folder, pack=True)
+    elif dry_run:
+        sync = partial(hf_sync_folder, dry_run=True)
+    else:
+        sync = hf_sync_folder
+
+    # Upload only what changed since the last sync (manifest kept in UL.hfmanifest.json)
+    upload_result = sync(
         folder_path=local_folder_path,
         path_in_repo=path_in_repo,
         repo_id=REPO_ID,
         token=hf_token,
-        ignore_patterns=[
-            ".venv",
-            ".venv/*",
-            "__pycache__",
-            "*.pyc",
-            ".env",
-            ".env/*",
-            "node_modules/",
-            ".gitignore",
-            "eslint*",
-            ".vercel/",
-            "*.toml",
-            "uv.lock",
-            ".python-version",
-        ],  # Ignore these patterns
+        ignore_patterns=IGNORE_PATTERNS,  # Ignore these patterns
         repo_type="space",  # Change to "dataset" or "space" if needed
         commit_message="SmellPantySpace",
         commit_description="SpaceUploadPantyAddiuct",
-        create_pr=False,  # Set to True if you want to create a PR instead
     )
 
-    print(f"✅ Uploaded folder to: {upload_result.commit_url}")
+    if upload_result is not None and not dry_run:
+        print(f"✅ Uploaded folder to: {upload_result.commit_url}")
     return upload_result
 
 
+# --- Watching the folder while developing ---
+
+def hf_watch_space():
+    header1("Watching a Folder for a Hugging Face Space")
+    """
+    Keep the space in sync with the local folder until Ctrl+C.
+
+    Every burst of edits becomes one incremental commit a couple of seconds
+    later, see src/hfwatch.py. The space is not re-created.
+    """
+    hf_watch_sync(
+        folder_path="../WX/mywo/vg1/UL/",
+        repo_id=REPO_ID,
+        repo_type="space",
+        token=hf_token,
+        ignore_patterns=IGNORE_PATTERNS,
+        debounce=2.0,  # Quiet seconds that end a burst of edits
+        max_delay=10.0,  # Commit a busy folder at least this often
+        commit_message="SmellPantySpace (watch)",
+    )
+
+
 # --- Deleteing Spaces ---
 
 #  ██████╗  ███████╗ ██╗
@@ -167,9 +211,10 @@ def hf_delete_spaces():
     - token (str): Hugging Face token
     - repo_type (str): "model", "dataset", or "space"
     - missing_ok (bool): Skip error if repo is missing
+    - max_workers (int): Number of repos deleted in parallel
 
     Returns:
-    - None
+    - list[BulkResult]: Per repo result report
     """
 
     # Config
@@ -179,12 +224,15 @@ def hf_delete_spaces():
     repo_type = "space"
     token = hf_token
     missing_ok = True
-
-    for repo_id in repo_ids:
-        try:
-            delete_repo(
-                repo_id=repo_id, token=token, repo_type=repo_type, missing_ok=missing_ok
-            )
-            print(f"✅ Deleted: {repo_id}")
-        except Exception as e:
-            print(f"❌ Failed to delete {repo_id}: {e}")
+    max_workers = 8
+
+    # Delete them all at once through the bulk engine
+    results = bulk_delete(
+        repo_ids,
+        repo_type=repo_type,
+        token=token,
+        max_workers=max_workers,
+        missing_ok=missing_ok,
+    )
+    print_report(results)
+    return results
@@ -0,0 +1,237 @@
+# Incremental folder uploads for repos and spaces
+# A manifest (path -> size, mtime, sha256) is kept next to the uploaded folder
+# and compared against the last successful commit so only changed files are sent
+
+import json
+import os
+
+from huggingface_hub import CommitOperationDelete, HfApi
+
+from src.hfhash import add_operation, hash_files
+from src.hfpack import commit_packed
+from src.hfplan import (
+    SyncPlan,
+    deletable,
+    fetch_remote_tree,
+    load_tree,
+    plan_against_tree,
+    print_plan,
+    remote_deletes,
+    save_tree,
+    tree_after_commit,
+)
+from src.hfwalk import PatternMatcher, scan_files
+from src.utz import console, header1, l_info, l_warning
+
+# The manifest lives beside the folder, e.g. TEMP/ -> TEMP.hfmanifest.json
+MANIFEST_SUFFIX = ".hfmanifest.json"
+
+# Same folders upload_folder always skips
+DEFAULT_IGNORE = [".git", ".git/*", "*/.git", "**/.git/**", ".cache/huggingface", ".cache/huggingface/*"]
+
+
+#  ███╗   ███╗  █████╗  ███╗   ██╗
+#  ████╗ ████║ ██╔══██╗ ████╗  ██║
+#  ██╔████╔██║ ███████║ ██╔██╗ ██║
+#  ██║╚██╔╝██║ ██╔══██║ ██║╚██╗██║
+#  ██║ ╚═╝ ██║ ██║  ██║ ██║ ╚████║
+#  ╚═╝     ╚═╝ ╚═╝  ╚═╝ ╚═╝  ╚═══╝
+
+def manifest_path(folder):
+    return os.path.normpath(folder) + MANIFEST_SUFFIX
+
+
+def load_manifest(folder):
+    """Last saved manifest for this folder, or an empty one"""
+    try:
+        with open(manifest_path(folder), encoding="utf8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"files": {}}
+
+
+def save_manifest(folder, manifest):
+    # Write to a temp file first so a crash never leaves half a manifest
+    path = manifest_path(folder)
+    with open(path + ".tmp", "w", encoding="utf8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def iter_entries(folder, allow_patterns=None, ignore_patterns=None):
+    """Yield (relpath, os.DirEntry) for every file upload_folder would pick up, as they are found"""
+    matcher = PatternMatcher(allow_patterns, list(ignore_patterns or []) + DEFAULT_IGNORE)
+    yield from scan_files(folder, matcher)
+
+
+def iter_files(folder, allow_patterns=None, ignore_patterns=None):
+    for relpath, _ in iter_entries(folder, allow_patterns, ignore_patterns):
+        yield relpath
+
+
+def list_files(folder, allow_patterns=None, ignore_patterns=None):
+    return sorted(iter_files(folder, allow_patterns, ignore_patterns))
+
+
+def build_manifest(folder, ignore_patterns=None, previous=None):
+    """
+    Scan the folder and describe every file.
+
+    Files whose size and mtime match the previous manifest keep their old hash,
+    the rest go through the parallel hashing stage in src/hfhash.py.
+
+    Returns:
+    - dict[str, dict]: path -> {"size", "mtime", "sha256"}
+    """
+    previous = previous or {}
+    files, todo = {}, []
+    for relpath, entry in iter_entries(folder, ignore_patterns=ignore_patterns):
+        st = entry.stat()
+        old = previous.get(relpath)
+        sha = old["sha256"] if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime_ns else None
+        files[relpath] = {"size": st.st_size, "mtime": st.st_mtime_ns, "sha256": sha}
+        if sha is None:
+            todo.append(relpath)
+
+    if todo:
+        digests = hash_files([os.path.join(folder, p) for p in todo])
+        for relpath in todo:
+            files[relpath]["sha256"] = digests[os.path.join(folder, relpath)]
+    return files
+
+
+def diff_manifest(old, new):
+    """
+    Compare two manifests.
+
+    Returns:
+    - changed (list[str]): Paths added or modified since the old manifest
+    - removed (list[str]): Paths that are gone locally
+    """
+    changed = [p for p, meta in new.items() if old.get(p, {}).get("sha256") != meta["sha256"]]
+    removed = [p for p in old if p not in new]
+    return sorted(changed), sorted(removed)
+
+
+#  ███████╗ ██╗   ██╗ ███╗   ██╗  ██████╗
+#  ██╔════╝ ╚██╗ ██╔╝ ████╗  ██║ ██╔════╝
+#  ███████╗  ╚████╔╝  ██╔██╗ ██║ ██║
+#  ╚════██║   ╚██╔╝   ██║╚██╗██║ ██║
+#  ███████║    ██║    ██║ ╚████║ ╚██████╗
+#  ╚══════╝    ╚═╝    ╚═╝  ╚═══╝  ╚═════╝
+
+def hf_sync_folder(
+    folder_path,
+    repo_id,
+    repo_type="model",
+    path_in_repo="",
+    token=None,
+    ignore_patterns=None,
+    commit_message="Sync folder",
+    commit_description=None,
+    revision="main",
+    endpoint=None,
+    dry_run=False,
+    pack=False,
+    delete_patterns=None,
+):
+    """
+    Upload only what changed in a folder since the last successful sync.
+
+    The manifest records the commit it was saved against. If the remote branch
+    still points at that commit the diff is trusted and only changed files are
+    uploaded and removed files are deleted. Otherwise (first run, someone else
+    pushed, different repo) the local folder is diffed against the remote tree,
+    which is listed once per commit SHA and cached (see src/hfplan.py).
+
+    Parameters:
+    - dry_run (bool): Only print the add / update / delete plan, commit nothing
+    - pack (bool): Pre-upload small files in concurrent chunks, then make the one commit
+      (src/hfpack.py), for Spaces with thousands of tiny assets
+    - delete_patterns (list[str]): Also delete remote files matching these that are gone locally.
+      Without it only files a previous sync uploaded are deleted, never someone else's
+
+    Returns:
+    - CommitInfo, or None when there was nothing to upload
+    - SyncPlan when dry_run is set
+    """
+    header1(f"Syncing {folder_path} -> {repo_id}")
+    api = HfApi(endpoint=endpoint, token=token)
+
+    saved = load_manifest(folder_path)
+    head = api.repo_info(repo_id, repo_type=repo_type, revision=revision).sha
+    target = {"repo_id": repo_id, "repo_type": repo_type, "path_in_repo": path_in_repo}
+    same_target = all(saved.get(k) == v for k, v in target.items())
+    fresh = saved.get("commit") == head and same_target
+
+    files = build_manifest(folder_path, ignore_patterns, previous=saved["files"])
+
+    tree = None
+    if fresh:
+        changed, removed = diff_manifest(saved["files"], files)
+        plan = SyncPlan(
+            head=head,
+            adds=[p for p in changed if p not in saved["files"]],
+            updates=[p for p in changed if p in saved["files"]],
+            deletes=deletable(removed, ignore_patterns),
+            unchanged=len(files) - len(changed),
+        )
+        if delete_patterns:
+            # Remote files the manifest never knew about only go when asked for (cached per commit)
+            tree = fetch_remote_tree(api, repo_id, repo_type, head)
+            extra = remote_deletes(files, tree, path_in_repo, ignore_patterns, delete_patterns=delete_patterns)
+            plan.deletes = sorted(set(plan.deletes) | set(extra))
+    else:
+        l_warning("No manifest for the current remote commit, planning against the remote tree")
+        tree = fetch_remote_tree(api, repo_id, repo_type, head)
+        # Deletes only what our last sync of this target uploaded, or what delete_patterns asks for
+        known = saved["files"] if same_target else {}
+        plan = plan_against_tree(
+            folder_path, files, tree, path_in_repo, ignore_patterns, known=known, delete_patterns=delete_patterns
+        )
+        plan.head = head
+
+    print_plan(plan)
+    if dry_run:
+        return plan
+    if plan.empty:
+        l_info(f"Nothing changed since {head[:8]}, skipping upload")
+        save_manifest(folder_path, {**target, "commit": head, "files": files})
+        return None
+
+    # Hashes are already known, so the operations are built without re-reading the files
+    prefix = f"{path_in_repo.strip('/')}/" if path_in_repo else ""
+    operations = [
+        add_operation(os.path.join(folder_path, p), prefix + p, files[p]["sha256"]) for p in plan.changed
+    ] + [CommitOperationDelete(path_in_repo=prefix + p) for p in plan.deletes]
+
+    if pack:
+        upload_result, _ = commit_packed(
+            api,
+            repo_id,
+            operations,
+            repo_type=repo_type,
+            revision=revision,
+            commit_message=commit_message,
+            commit_description=commit_description,
+            parent_commit=head,
+        )
+    else:
+        upload_result = api.create_commit(
+            repo_id=repo_id,
+            repo_type=repo_type,
+            operations=operations,
+            revision=revision,
+            commit_message=commit_message,
+            commit_description=commit_description,
+            parent_commit=head,
+        )
+
+    # Only a successful commit moves the manifest (and the cached tree) forward
+    save_manifest(folder_path, {**target, "commit": upload_result.oid, "files": files})
+    if tree is None:
+        tree = load_tree(repo_id, repo_type, head)
+    if tree is not None:
+        save_tree(repo_id, repo_type, upload_result.oid, tree_after_commit(tree, plan, files, path_in_repo))
+    console.print(f"✅ Synced {folder_path} at {upload_result.oid[:8]}")
+    return upload_result
@@ -0,0 +1,92 @@
+# Streaming directory walker for uploads
+# Ignore patterns are compiled once into a single regex and ignored directories
+# are pruned while walking, so .venv/ and node_modules/ are never even listed
+
+import fnmatch
+import os
+import re
+
+
+#  ███╗   ███╗  █████╗  ████████╗  ██████╗ ██╗  ██╗
+#  ████╗ ████║ ██╔══██╗ ╚══██╔══╝ ██╔════╝ ██║  ██║
+#  ██╔████╔██║ ███████║    ██║    ██║      ███████║
+#  ██║╚██╔╝██║ ██╔══██║    ██║    ██║      ██╔══██║
+#  ██║ ╚═╝ ██║ ██║  ██║    ██║    ╚██████╗ ██║  ██║
+#  ╚═╝     ╚═╝ ╚═╝  ╚═╝    ╚═╝     ╚═════╝ ╚═╝  ╚═╝
+
+def _compile(patterns):
+    """One regex matching any of the fnmatch patterns, None when there are none"""
+    if not patterns:
+        return None
+    # fnmatch is case insensitive on Windows, keep the same behaviour
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns), flags)
+
+
+class PatternMatcher:
+    """
+    Same rules as huggingface_hub's filter_repo_objects, compiled once.
+
+    Patterns are matched against posix paths relative to the folder, "*" also
+    matches "/" and a trailing "/" means "everything under this directory".
+
+    Parameters:
+    - allow_patterns (list[str]): Only keep files matching one of these
+    - ignore_patterns (list[str]): Drop files matching any of these
+    """
+
+    def __init__(self, allow_patterns=None, ignore_patterns=None):
+        if isinstance(allow_patterns, str):
+            allow_patterns = [allow_patterns]
+        if isinstance(ignore_patterns, str):
+            ignore_patterns = [ignore_patterns]
+        allow_patterns = [p + "*" if p.endswith("/") else p for p in allow_patterns or []]
+        ignore_patterns = [p + "*" if p.endswith("/") else p for p in ignore_patterns or []]
+
+        self.allow = _compile(allow_patterns) if allow_patterns else None
+        self.ignore = _compile(ignore_patterns)
+        # A pattern ending in "*" that matches "dir/" matches every path below it too,
+        # so such directories can be skipped without looking inside
+        self.prune = _compile([p for p in ignore_patterns if p.endswith("*")])
+
+    def match_file(self, relpath):
+        if self.allow is not None and not self.allow.match(relpath):
+            return False
+        return self.ignore is None or not self.ignore.match(relpath)
+
+    def prune_dir(self, reldir):
+        return self.prune is not None and self.prune.match(reldir + "/") is not None
+
+
+#  ██╗    ██╗  █████╗  ██╗      ██╗  ██╗
+#  ██║    ██║ ██╔══██╗ ██║      ██║ ██╔╝
+#  ██║ █╗ ██║ ███████║ ██║      █████╔╝
+#  ██║███╗██║ ██╔══██║ ██║      ██╔═██╗
+#  ╚███╔███╔╝ ██║  ██║ ███████╗ ██║  ██╗
+#   ╚══╝╚══╝  ╚═╝  ╚═╝ ╚══════╝ ╚═╝  ╚═╝
+
+def scan_files(folder, matcher):
+    """
+    Lazily yield (relpath, os.DirEntry) for every file the matcher keeps.
+
+    Built on os.scandir, so file type checks come from the directory listing
+    and pruned directories cost a single regex match.
+    """
+    stack = [("", folder)]
+    while stack:
+        rel, path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue  # vanished or unreadable while walking
+        with it:
+            subdirs = []
+            for entry in it:
+                relpath = rel + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not matcher.prune_dir(relpath):
+                        subdirs.append((relpath + "/", entry.path))
+                elif entry.is_file() and matcher.match_file(relpath):
+                    yield relpath, entry
+        # Reversed so directories come off the stack in listing order
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,252 @@
+# Watch mode: keep a Space in sync with a local folder while developing
+# inotify (Linux) reports changes as they happen, bursts are debounced into one
+# incremental sync (src/hfsync.py) so only the edited files go up
+# Other platforms fall back to polling file sizes and mtimes
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from src.hfsync import DEFAULT_IGNORE, hf_sync_folder, iter_entries
+from src.hfwalk import PatternMatcher
+from src.utz import console, header1, l_error, l_info, l_warning
+
+# inotify flags, see <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+# Returned instead of paths when the kernel queue overflowed, the next sync rescans anyway
+OVERFLOW = "*"
+
+
+#  ██╗ ███╗   ██╗  ██████╗  ████████╗ ██╗ ███████╗ ██╗   ██╗
+#  ██║ ████╗  ██║ ██╔═══██╗ ╚══██╔══╝ ██║ ██╔════╝ ╚██╗ ██╔╝
+#  ██║ ██╔██╗ ██║ ██║   ██║    ██║    ██║ █████╗    ╚████╔╝
+#  ██║ ██║╚██╗██║ ██║   ██║    ██║    ██║ ██╔══╝     ╚██╔╝
+#  ██║ ██║ ╚████║ ╚██████╔╝    ██║    ██║ ██║         ██║
+#  ╚═╝ ╚═╝  ╚═══╝  ╚═════╝     ╚═╝    ╚═╝ ╚═╝         ╚═╝
+
+class InotifyWatcher:
+    """
+    Recursive inotify watch on a folder, ignored directories are never watched.
+
+    wait(timeout) returns the set of changed relative paths, empty on timeout.
+    """
+
+    def __init__(self, folder, matcher):
+        self.folder = os.path.abspath(folder)
+        self.matcher = matcher
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}  # wd -> relative dir ("" or "sub/")
+        self.add_tree("")
+
+    def add_tree(self, rel):
+        """Watch rel and every directory below it, returns the files already inside"""
+        found = set()
+        stack = [rel]
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(self.folder, rel)
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                continue  # vanished before we got to it
+            self.dirs[wd] = rel
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        relpath = rel + entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.matcher.prune_dir(relpath):
+                                stack.append(relpath + "/")
+                        elif self.matcher.match_file(relpath):
+                            found.add(relpath)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+        return found
+
+    def wait(self, timeout=None):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size : offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.add(OVERFLOW)
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)  # watched directory is gone
+                continue
+            rel = self.dirs.get(wd)
+            if rel is None or not name:
+                continue
+            relpath = rel + os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if self.matcher.prune_dir(relpath):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # A new directory may already hold files (mv, git checkout, unzip)
+                    changed |= self.add_tree(relpath + "/")
+                changed.add(relpath + "/")
+            elif self.matcher.match_file(relpath):
+                changed.add(relpath)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+#  ██████╗   ██████╗  ██╗      ██╗
+#  ██╔══██╗ ██╔═══██╗ ██║      ██║
+#  ██████╔╝ ██║   ██║ ██║      ██║
+#  ██╔═══╝  ██║   ██║ ██║      ██║
+#  ██║      ╚██████╔╝ ███████╗ ███████╗
+#  ╚═╝       ╚═════╝  ╚══════╝ ╚══════╝
+
+class PollWatcher:
+    """Fallback for platforms without inotify: compare (size, mtime) snapshots"""
+
+    def __init__(self, folder, ignore_patterns=None, interval=1.0):
+        self.folder = folder
+        self.ignore_patterns = ignore_patterns
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for relpath, entry in iter_entries(self.folder, ignore_patterns=self.ignore_patterns):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[relpath] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if deadline is None else max(0, min(self.interval, deadline - time.monotonic())))
+            snapshot = self.scan()
+            changed = {p for p in snapshot.keys() | self.snapshot.keys() if snapshot.get(p) != self.snapshot.get(p)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(folder, ignore_patterns=None, poll_interval=1.0):
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(folder, PatternMatcher(ignore_patterns=list(ignore_patterns or []) + DEFAULT_IGNORE))
+        except (OSError, AttributeError) as e:
+            l_warning(f"inotify not available ({e}), polling every {poll_interval}s")
+    return PollWatcher(folder, ignore_patterns, poll_interval)
+
+
+#  ██╗    ██╗  █████╗  ████████╗  ██████╗ ██╗  ██╗
+#  ██║    ██║ ██╔══██╗ ╚══██╔══╝ ██╔════╝ ██║  ██║
+#  ██║ █╗ ██║ ███████║    ██║    ██║      ███████║
+#  ██║███╗██║ ██╔══██║    ██║    ██║      ██╔══██║
+#  ╚███╔███╔╝ ██║  ██║    ██║    ╚██████╗ ██║  ██║
+#   ╚══╝╚══╝  ╚═╝  ╚═╝    ╚═╝     ╚═════╝ ╚═╝  ╚═╝
+
+def hf_watch_sync(
+    folder_path,
+    repo_id,
+    repo_type="space",
+    ignore_patterns=None,
+    debounce=2.0,
+    max_delay=10.0,
+    poll_interval=1.0,
+    **sync_kwargs,
+):
+    """
+    Sync the folder once, then again after every burst of changes until Ctrl+C.
+
+    A burst ends when nothing changed for `debounce` seconds, or `max_delay`
+    seconds after its first change so a constantly busy folder still goes up.
+    A failed sync is retried after `debounce` seconds.
+
+    Parameters:
+    - folder_path (str): Local folder, e.g. "../WX/mywo/vg1/UL/"
+    - repo_id (str): Repo or Space to keep in sync
+    - debounce (float): Quiet seconds that end a burst
+    - max_delay (float): Longest wait between the first change and its commit
+    - poll_interval (float): Scan interval when inotify is not available
+    - sync_kwargs: Passed on to hf_sync_folder (token, path_in_repo, commit_message, ...)
+    """
+    header1(f"Watching {folder_path} -> {repo_id}")
+
+    def sync():
+        return hf_sync_folder(folder_path, repo_id, repo_type=repo_type, ignore_patterns=ignore_patterns, **sync_kwargs)
+
+    # Watch before the first sync: edits made while it uploads are queued for the loop below
+    watcher = make_watcher(folder_path, ignore_patterns, poll_interval)
+    l_info(f"Watching with {type(watcher).__name__}, Ctrl+C to stop")
+
+    pending = False
+    try:
+        sync()
+        while True:
+            changed = watcher.wait(debounce if pending else None)
+            if not changed and not pending:
+                continue
+
+            # --- Debounce: collect the rest of the burst ---
+            first = time.monotonic()
+            while True:
+                remaining = min(debounce, first + max_delay - time.monotonic())
+                if remaining <= 0:
+                    break
+                more = watcher.wait(remaining)
+                if not more:
+                    break
+                changed |= more
+
+            l_info(f"{len(changed)} paths changed, syncing")
+            try:
+                upload_result = sync()
+            except Exception as e:
+                l_error(f"Sync failed, retrying in {debounce}s: {e}")
+                pending = True
+                continue
+            pending = False
+            if upload_result is not None:
+                console.print(f"⚡ Live {time.monotonic() - first:.1f}s after the first change: {upload_result.commit_url}")
+    except KeyboardInterrupt:
+        l_info("Stopped watching")
+    finally:
+        watcher.close()